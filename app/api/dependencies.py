@@ -1,4 +1,5 @@
 import uuid
+from datetime import datetime, timedelta
 from fastapi import Cookie, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 import structlog
@@ -8,8 +9,12 @@ from app.senders.registry import SENDERS
 from app.services.user_service import UserService
 
 from ..db.db import async_session_maker
-from app.services.event_service import EventService
+from app.db.settings import settings
+from app.services.event_service import EventResult, EventService, SystemEvent
+from app.services.idempotency_service import IdempotencyService
 from app.services.notification_service import NotificationService
+from app.repositories.campaign_repository import CampaignRepository
+from app.repositories.event_key_repository import EventKeyRepository
 from app.repositories.notification_repository import NotificationRepository
 
 log = structlog.get_logger(__name__)
@@ -35,18 +40,63 @@ async def get_notification_service(
     return NotificationService(
         notification_repo=NotificationRepository(session=session),
         user_service=user_service,
-        senders=SENDERS
+        senders=SENDERS,
+        campaign_repo=CampaignRepository(session=session)
     )
 
 async def get_event_service(
+    session: AsyncSession = Depends(get_async_session),
     user_service: UserService = Depends(get_user_service),
     notification_service: NotificationService = Depends(get_notification_service)                  
 ):
     return EventService(
         user_service=user_service,
-        notification_service=notification_service
+        notification_service=notification_service,
+        idempotency=IdempotencyService(
+            event_key_repo=EventKeyRepository(session=session)
+        )
     )
 
+def build_event_service(session: AsyncSession) -> EventService:
+    user_service = UserService(user_repo=UserRepository(session=session))
+
+    return EventService(
+        user_service=user_service,
+        notification_service=NotificationService(
+            notification_repo=NotificationRepository(session=session),
+            user_service=user_service,
+            senders=SENDERS,
+            campaign_repo=CampaignRepository(session=session)
+        ),
+        idempotency=IdempotencyService(
+            event_key_repo=EventKeyRepository(session=session)
+        )
+    )
+
+async def flush_events(events: list[SystemEvent]) -> list[EventResult]:
+    """Commits one group of buffered events in a single transaction."""
+    async with async_session_maker() as session:
+        async with session.begin():
+            return await build_event_service(session).handle_system_events(events)
+
+async def write_activity(seen: dict[uuid.UUID, datetime]) -> int:
+    """Writes one activity flush in a single transaction, chunked to stay
+    under the driver's bind-parameter limit."""
+    items = list(seen.items())
+    updated = 0
+
+    async with async_session_maker() as session:
+        async with session.begin():
+            repo = UserRepository(session=session)
+
+            for i in range(0, len(items), settings.LAST_ACTIVE_FLUSH_BATCH_SIZE):
+                updated += await repo.bulk_update_last_active(
+                    seen=dict(items[i:i + settings.LAST_ACTIVE_FLUSH_BATCH_SIZE]),
+                    threshold=timedelta(seconds=settings.LAST_ACTIVE_THRESHOLD)
+                )
+
+    return updated
+
 async def get_user_id(
     user_id: uuid.UUID | None = Cookie(defult=None)
 ) -> uuid.UUID:
@@ -1,10 +1,20 @@
 import uuid
 import structlog
-from fastapi import APIRouter, Depends, Request
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 
 from app.api.dependencies import get_event_service
-from app.api.schemas.event import CustomEventIn, SystemEventIn
-from app.services.event_service import EventService
+from app.api.schemas.event import (
+    CustomEventIn,
+    SystemEventBatchIn,
+    SystemEventBatchOut,
+    SystemEventIn,
+    SystemEventResultOut,
+)
+from app.db.settings import settings
+from app.errors.event_error import DuplicateEventError, EventBufferFullError
+from app.errors.template_error import TemplateError
+from app.services.event_buffer import EVENT_BUFFER
+from app.services.event_service import EventService, SystemEvent
 
 log = structlog.get_logger(__name__)
 
@@ -14,15 +24,38 @@ router = APIRouter(prefix="/api/events", tags=["events"])
 async def handle_system_event(
     event: SystemEventIn,
     request: Request,
+    response: Response,
     service: EventService = Depends(get_event_service)
 ):
     user_id = uuid.UUID(request.cookies["user_id"])
 
-    await service.handle_system_event(
-        event_type=event.type,
-        user_id=user_id, 
-        payload=event.payload
-    )
+    if settings.EVENT_INGEST_MODE == "buffered":
+        response.status_code = status.HTTP_202_ACCEPTED
+        return await buffer_system_event(
+            SystemEvent(
+                type=event.type,
+                user_id=user_id,
+                payload=event.payload,
+                idempotency_key=event.idempotency_key,
+                locale=event.locale
+            )
+        )
+
+    try:
+        await service.handle_system_event(
+            event_type=event.type,
+            user_id=user_id, 
+            payload=event.payload,
+            idempotency_key=event.idempotency_key,
+            locale=event.locale
+        )
+
+    except DuplicateEventError:
+        return {"status": "duplicate"}
+
+    except TemplateError as e:
+        raise HTTPException(status.HTTP_422_UNPROCESSABLE_ENTITY, str(e))
+
     log.info(
         "http_system_event_handle",
         event_type=event.type,
@@ -30,6 +63,63 @@ async def handle_system_event(
     )
     return {"status": "ok"}
 
+async def buffer_system_event(event: SystemEvent) -> dict:
+    try:
+        result = await EVENT_BUFFER.submit(event)
+
+    except EventBufferFullError:
+        raise HTTPException(
+            status.HTTP_503_SERVICE_UNAVAILABLE,
+            "Event buffer is full",
+            headers={"Retry-After": "1"}
+        )
+
+    log.info(
+        "http_system_event_buffered",
+        event_type=event.type,
+        user_id=event.user_id
+    )
+
+    if result is None:
+        return {"status": "accepted"}
+
+    if result.duplicate:
+        return {"status": "duplicate"}
+
+    if result.error is not None:
+        raise HTTPException(status.HTTP_422_UNPROCESSABLE_ENTITY, result.error)
+
+    return {"status": "ok", "notification_id": str(result.notification_id)}
+
+@router.post("/system/batch", response_model=SystemEventBatchOut)
+async def handle_system_events(
+    batch: SystemEventBatchIn,
+    service: EventService = Depends(get_event_service)
+):
+    results = await service.handle_system_events([
+        SystemEvent(
+            type=event.type,
+            user_id=event.user_id,
+            payload=event.payload,
+            idempotency_key=event.idempotency_key,
+            locale=event.locale
+        )
+        for event in batch.events
+    ])
+    log.info(
+        "http_system_events_batch_handle",
+        batch_size=len(batch.events),
+        failed=sum(r.error is not None for r in results)
+    )
+    return SystemEventBatchOut(results=[
+        SystemEventResultOut(
+            status="duplicate" if r.duplicate else "failed" if r.error else "created",
+            notification_id=r.notification_id,
+            error=r.error
+        )
+        for r in results
+    ])
+
 @router.post("/custom")
 async def handle_custom_event(
     event: CustomEventIn,
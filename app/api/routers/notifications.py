@@ -6,6 +6,8 @@ from fastapi import APIRouter, Depends, Request
 
 from app.api.dependencies import get_notification_service, get_user_id
 from app.api.schemas.notification import NotificationOut
+from app.db.models.notification import Notification
+from app.services.inapp_hub import INAPP_HUB
 from app.services.notification_service import NotificationService
 
 log = structlog.get_logger(__name__)
@@ -18,7 +20,19 @@ async def stream(
     user_id: uuid.UUID = Depends(get_user_id),
     service: NotificationService = Depends(get_notification_service)
 ):
+    def event(n: Notification) -> str:
+        payload = {
+            "id": str(n.id),
+            "title": n.title,
+            "message": n.message,
+            "created_at": n.created_at.isoformat(),
+        }
+        return service.sse_data(data=payload)
+
     async def gen():
+        # Pushes from the IN_APP fast path arrive on the queue right after
+        # commit; the poll still covers worker deliveries and other processes.
+        pushed = INAPP_HUB.subscribe(user_id)
         try:
             while True:
                 if await request.is_disconnected():
@@ -27,20 +41,24 @@ async def stream(
                 notifications = await service.get_sent(user_id=user_id)
 
                 for n in notifications:
-                    payload = {
-                        "id": str(n.id),
-                        "title": n.title,
-                        "message": n.message,
-                        "created_at": n.created_at.isoformat(),
-                    }
+                    yield event(n)
+
+                try:
+                    n = await asyncio.wait_for(pushed.get(), timeout=1)
+                    yield event(n)
 
-                    yield service.sse_data(data=payload)
+                    while not pushed.empty():
+                        yield event(pushed.get_nowait())
 
-                await asyncio.sleep(1)
+                except TimeoutError:
+                    pass
 
         except asyncio.CancelledError:
             pass
 
+        finally:
+            INAPP_HUB.unsubscribe(user_id, pushed)
+
     return StreamingResponse(
         gen(),
         media_type="text/event-stream",
@@ -71,6 +89,19 @@ async def mark_read(
     )
     return {"status": "ok"}
 
+@router.get("/{notification_id}/items", response_model=list[NotificationOut])
+async def digest_items(
+    notification_id: uuid.UUID,
+    user_id: uuid.UUID = Depends(get_user_id),
+    service: NotificationService = Depends(get_notification_service)
+):
+    log.info(
+        "http_notification_digest_items",
+        notification_id=notification_id,
+        user_id=user_id
+    )
+    return await service.digest_items(digest_id=notification_id, user_id=user_id)
+
 @router.get("/{notification_id}", response_model=NotificationOut)
 async def get_by_id(
     notification_id: uuid.UUID,
@@ -1,10 +1,14 @@
-from pydantic import BaseModel, ConfigDict
+import uuid
+from pydantic import BaseModel, ConfigDict, Field
 
 from app.db.models.enums import EventCategory, EventType
+from app.db.settings import settings
 
 class SystemEventIn(BaseModel):
     type: EventType
     payload: dict
+    idempotency_key: str | None = Field(default=None, min_length=1, max_length=200)
+    locale: str | None = Field(default=None, min_length=2, max_length=10)
 
     model_config=ConfigDict(from_attributes=True)
 
@@ -13,4 +17,18 @@ class CustomEventIn(BaseModel):
     message: str
     category: EventCategory
 
-    model_config=ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config=ConfigDict(from_attributes=True)
+
+class SystemEventBatchItemIn(SystemEventIn):
+    user_id: uuid.UUID
+
+class SystemEventBatchIn(BaseModel):
+    events: list[SystemEventBatchItemIn] = Field(min_length=1, max_length=settings.EVENT_BATCH_MAX_SIZE)
+
+class SystemEventResultOut(BaseModel):
+    status: str
+    notification_id: uuid.UUID | None = None
+    error: str | None = None
+
+class SystemEventBatchOut(BaseModel):
+    results: list[SystemEventResultOut]
@@ -11,6 +11,7 @@ class NotificationOut(BaseModel):
     message: str    
     status: NotificationStatus
     created_at: datetime
+    digest_size: int | None = None
 
     model_config=ConfigDict(from_attributes=True)
     
\ No newline at end of file
@@ -0,0 +1,33 @@
+from collections.abc import Callable
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, SessionTransaction
+
+_AFTER_COMMIT = "after_commit_callbacks"
+
+def after_commit(session: AsyncSession, callback: Callable[[], None]):
+    """Runs ``callback`` once the session's current transaction commits.
+    It is discarded if that transaction rolls back instead."""
+    sync_session = session.sync_session
+    callbacks = sync_session.info.get(_AFTER_COMMIT)
+
+    if callbacks is None:
+        callbacks = sync_session.info[_AFTER_COMMIT] = []
+        event.listen(sync_session, "after_commit", _run_callbacks)
+        event.listen(sync_session, "after_soft_rollback", _discard_callbacks)
+
+    callbacks.append(callback)
+
+def _run_callbacks(session: Session):
+    callbacks = session.info[_AFTER_COMMIT]
+    pending = list(callbacks)
+    callbacks.clear()
+
+    for callback in pending:
+        callback()
+
+def _discard_callbacks(session: Session, previous_transaction: SessionTransaction):
+    # A rolled-back savepoint leaves the outer transaction, and what it
+    # registered, in place.
+    if not previous_transaction.nested:
+        session.info[_AFTER_COMMIT].clear()
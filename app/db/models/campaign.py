@@ -0,0 +1,36 @@
+from datetime import datetime
+import uuid
+from sqlalchemy import DateTime, ForeignKey, String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+
+from app.db.models.base import Base
+from app.db.models.enums import EventCategory, NotificationChannel
+
+class Campaign(Base):
+    """One broadcast shown to every user matching its audience: users that
+    existed when it was created and have been active since
+    ``active_since``."""
+    __tablename__ = "Campaigns"
+    title: Mapped[str | None] = mapped_column(String(), default=None)
+    message: Mapped[str] = mapped_column(String())
+    channel: Mapped[NotificationChannel] = mapped_column(String(50))
+    category: Mapped[EventCategory] = mapped_column(String(50))
+    active_since: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+
+class CampaignRead(Base):
+    __tablename__ = "CampaignReads"
+    __table_args__ = (
+        UniqueConstraint("campaign_id", "user_id"),
+    )
+    campaign_id: Mapped[uuid.UUID] = mapped_column(
+        PG_UUID(as_uuid=True),
+        ForeignKey("Campaigns.id", ondelete="CASCADE"),
+        nullable=False
+    )
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        PG_UUID(as_uuid=True),
+        ForeignKey("Users.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True
+    )
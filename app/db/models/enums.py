@@ -13,9 +13,14 @@ class EventType(str, Enum):
 class EventCategory(str, Enum):
     GENERAL = "general"
 
+class NotificationPriority(str, Enum):
+    HIGH = "high"
+    LOW = "low"
+
 class NotificationStatus(str, Enum):
     PENDING = "pending"
     PROCESSING = "processing"
     SENT = "sent"
     FAILED = "failed"
     READ = "read"
+    DIGESTED = "digested"
@@ -0,0 +1,10 @@
+from sqlalchemy import String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.models.base import Base
+
+class EventKey(Base):
+    """Idempotency keys of ingested events. Kept apart from the partitioned
+    Notifications table, which cannot enforce a unique key on its own."""
+    __tablename__ = "EventKeys"
+    key: Mapped[str] = mapped_column(String(200), unique=True)
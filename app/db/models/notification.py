@@ -1,22 +1,73 @@
 from datetime import datetime, timezone
 import uuid
-from sqlalchemy import ForeignKey, String, Integer, DateTime
+from sqlalchemy import DDL, ForeignKey, Index, PrimaryKeyConstraint, String, Integer, DateTime, event, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 
 from app.db.models.base import Base
 #from app.db.models.user import User
-from app.db.models.enums import NotificationChannel, NotificationStatus
+from app.db.models.enums import NotificationChannel, NotificationPriority, NotificationStatus
 
 class Notification(Base):
     __tablename__ = "Notifications"
+    __table_args__ = (
+        # Postgres requires the partition key in every unique constraint.
+        PrimaryKeyConstraint("id", "created_at"),
+        Index(
+            "ix_Notifications_pending_channel_priority_next_attempt_at",
+            "channel",
+            "priority",
+            "next_attempt_at",
+            postgresql_where=text("status = 'pending'")
+        ),
+        Index(
+            "ix_Notifications_processing_lease_expires_at",
+            "lease_expires_at",
+            postgresql_where=text("status = 'processing'")
+        ),
+        Index(
+            "ix_Notifications_digest_id",
+            "digest_id",
+            postgresql_where=text("digest_id IS NOT NULL")
+        ),
+        Index(
+            "ix_Notifications_processing_lease_owner",
+            "lease_owner",
+            postgresql_where=text("status = 'processing'")
+        ),
+        # Retention scans; keep the predicate in step with
+        # app/maintenance/retention.py TERMINAL_STATUSES.
+        Index(
+            "ix_Notifications_terminal_created_at",
+            "created_at",
+            postgresql_where=text("status IN ('read', 'failed', 'digested')")
+        ),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        primary_key=True,
+        default=lambda: datetime.now(timezone.utc)
+    )
     title: Mapped[str | None] = mapped_column(String(), default=None)
     message: Mapped[str] = mapped_column(String())
     status: Mapped[NotificationStatus] = mapped_column(String(20), default=NotificationStatus.PENDING)
     channel: Mapped[NotificationChannel] = mapped_column(String(50))
+    priority: Mapped[NotificationPriority] = mapped_column(
+        String(10),
+        default=NotificationPriority.HIGH,
+        server_default=NotificationPriority.HIGH.value
+    )
     attempts: Mapped[int] = mapped_column(Integer, default=0)
-    next_attempt_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.now(timezone.utc))
-    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.now(timezone.utc))
+    next_attempt_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+    lease_owner: Mapped[uuid.UUID | None] = mapped_column(PG_UUID(as_uuid=True), default=None)
+    lease_expires_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), default=None)
+    # A digest carries the number of notifications merged into it; each of
+    # those is DIGESTED and points back at it. No FK: the partitioned
+    # table's key also includes created_at.
+    digest_size: Mapped[int | None] = mapped_column(Integer, default=None)
+    digest_id: Mapped[uuid.UUID | None] = mapped_column(PG_UUID(as_uuid=True), default=None)
     user_id: Mapped[uuid.UUID] = mapped_column(
         PG_UUID(as_uuid=True),
         ForeignKey("Users.id", ondelete="CASCADE"),
@@ -25,5 +76,11 @@ class Notification(Base):
     )
 
     user: Mapped["User"] = relationship("User", back_populates="notifications")
-    
-    
\ No newline at end of file
+
+# Catch-all for rows outside the pre-created monthly partitions; see
+# app/maintenance/partitions.py.
+event.listen(
+    Notification.__table__,
+    "after_create",
+    DDL('CREATE TABLE IF NOT EXISTS "Notifications_default" PARTITION OF "Notifications" DEFAULT')
+)
@@ -10,7 +10,7 @@ class User(Base):
     __tablename__ = "Users"
     last_active: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), 
-        default=datetime.now(timezone.utc)
+        default=lambda: datetime.now(timezone.utc)
     )
 
     notifications: Mapped[List["Notification"]] = relationship(
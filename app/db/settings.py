@@ -1,15 +1,126 @@
+import random
+from typing import Literal
+from pydantic import BaseModel, Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+from app.db.models.enums import NotificationChannel
+
+class BackoffPolicy(BaseModel):
+    base_delay: float = 3
+    multiplier: float = 2
+    max_delay: float = 600
+    jitter: float = 0.2
+
+    def delay(self, attempts: int) -> float:
+        delay = min(
+            self.max_delay,
+            self.base_delay * self.multiplier ** max(attempts - 1, 0)
+        )
+        return delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+class BreakerPolicy(BaseModel):
+    failure_threshold: int = 5
+    recovery_timeout: float = 30
+    half_open_max_calls: int = 1
+
+class RateLimit(BaseModel):
+    rate: float = Field(gt=0)
+    burst: float = Field(ge=1)
+
 class Settings(BaseSettings):
     DATABASE_URL: str
     TEST_DATABASE_URL: str
     DEBUG: bool = False
     TELEGRAM_BOT_TOKEN: str | None = None
     EMAIL_FROM: str | None = None
+    TELEGRAM_MAX_CONNECTIONS: int = 20
+
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 80
+
+    NOTIFY_CHANNEL: str = "notifications_pending"
+
+    WORKER_PROCESSES: int = 1
+    WORKER_COROUTINES: int = 2
+    WORKER_STATS_INTERVAL: float = 30
+    WORKER_DRAIN_TIMEOUT: float = 60
+    WORKER_BATCH_SIZE: int = 100
+    WORKER_IDLE_POLL_INTERVAL: float = 30
+    WORKER_LEASE_SECONDS: float = 60
+    WORKER_CLAIM_RETRY_DELAY: float = 5
+    WORKER_REAPER_INTERVAL: float = 30
+    WORKER_REAPER_BATCH_SIZE: int = 1000
+    WORKER_MAX_CONCURRENCY: int = 200
+    CHANNEL_WORKERS: dict[NotificationChannel, int] = {
+        NotificationChannel.IN_APP: 2,
+        NotificationChannel.EMAIL: 2,
+        NotificationChannel.TELEGRAM: 1,
+    }
+    CHANNEL_BATCH_SIZE: dict[NotificationChannel, int] = {
+        NotificationChannel.IN_APP: 100,
+        NotificationChannel.EMAIL: 50,
+        NotificationChannel.TELEGRAM: 50,
+    }
+    CHANNEL_CONCURRENCY: dict[NotificationChannel, int] = {
+        NotificationChannel.IN_APP: 100,
+        NotificationChannel.EMAIL: 20,
+        NotificationChannel.TELEGRAM: 20,
+    }
+    CHANNEL_RATE_LIMITS: dict[NotificationChannel, RateLimit] = {
+        NotificationChannel.TELEGRAM: RateLimit(rate=30, burst=30),
+        NotificationChannel.EMAIL: RateLimit(rate=50, burst=100),
+    }
+    RECIPIENT_RATE_LIMITS: dict[NotificationChannel, RateLimit] = {
+        NotificationChannel.TELEGRAM: RateLimit(rate=1, burst=3),
+    }
+    RATE_LIMIT_MAX_WAIT: float = 5
+    INAPP_FAST_PATH: bool = False
+    EVENT_BATCH_MAX_SIZE: int = 500
+    IDEMPOTENCY_CACHE_SIZE: int = 100_000
+    IDEMPOTENCY_KEY_TTL_DAYS: int = 7
+    # "sync": every request commits its own event. "buffered": events are
+    # acknowledged with 202 and group-committed by a background flusher.
+    EVENT_INGEST_MODE: Literal["sync", "buffered"] = "sync"
+    # "committed": a buffered request waits for its group to commit.
+    # "accepted": it returns once queued; a crash loses the buffer.
+    EVENT_DURABILITY: Literal["committed", "accepted"] = "committed"
+    EVENT_BUFFER_SIZE: int = 10_000
+    EVENT_BUFFER_PUT_TIMEOUT: float = 1
+    EVENT_FLUSH_SIZE: int = 500
+    EVENT_FLUSH_INTERVAL: float = 0.02
+    LAST_ACTIVE_FLUSH_INTERVAL: float = 10
+    LAST_ACTIVE_THRESHOLD: float = 60
+    LAST_ACTIVE_FLUSH_BATCH_SIZE: int = 5000
+    # Claimed notifications for one user and channel created within this
+    # many seconds of each other are sent as one digest. Channels missing
+    # here are never digested.
+    DIGEST_WINDOW: dict[NotificationChannel, float] = {}
+    DIGEST_MIN_SIZE: int = Field(default=2, ge=2)
+    DIGEST_MAX_SIZE: int = 20
+    TEMPLATES_PATH: str | None = None
+    TEMPLATE_DEFAULT_LOCALE: str = "ru"
+    LOW_PRIORITY_MIN_SHARE: float = Field(default=0.1, ge=0, le=1)
+    INBOX_WINDOW_DAYS: int = 90
+    PARTITION_PRECREATE_MONTHS: int = 3
+    PARTITION_RETENTION_MONTHS: int = 12
+    RETENTION_AGE_DAYS: int = 30
+    RETENTION_BATCH_SIZE: int = 1000
+    RETENTION_ARCHIVE_DIR: str = "archive"
+    CHANNEL_SEND_TIMEOUT: dict[NotificationChannel, float] = {
+        NotificationChannel.IN_APP: 5,
+        NotificationChannel.EMAIL: 30,
+        NotificationChannel.TELEGRAM: 10,
+    }
+    CHANNEL_BREAKERS: dict[NotificationChannel, BreakerPolicy] = {}
+    CHANNEL_BACKOFF: dict[NotificationChannel, BackoffPolicy] = {
+        NotificationChannel.IN_APP: BackoffPolicy(base_delay=1, max_delay=60),
+        NotificationChannel.EMAIL: BackoffPolicy(base_delay=10, max_delay=1800),
+        NotificationChannel.TELEGRAM: BackoffPolicy(base_delay=5, max_delay=600),
+    }
 
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8"
     )
 
-settings = Settings()
\ No newline at end of file
+settings = Settings()
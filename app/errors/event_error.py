@@ -0,0 +1,8 @@
+class EventError(Exception):
+    pass
+
+class DuplicateEventError(EventError):
+    pass
+
+class EventBufferFullError(EventError):
+    pass
@@ -0,0 +1,10 @@
+class TemplateError(Exception):
+    pass
+
+class TemplateNotFoundError(TemplateError):
+    pass
+
+class MissingPayloadKeysError(TemplateError):
+    def __init__(self, missing: list[str]):
+        super().__init__(f"missing payload keys: {', '.join(missing)}")
+        self.missing = missing
@@ -1,3 +1,5 @@
+import asyncio
+import contextlib
 from contextlib import asynccontextmanager
 import sys
 import structlog
@@ -7,12 +9,16 @@ from fastapi.staticfiles import StaticFiles
 
 from app.api.middlewares.user import user_middleware
 from app.api.routers.ui import router as ui
+from app.api.dependencies import flush_events, write_activity
 from app.db.db import engine
+from app.db.settings import settings
 from app.logger.logging_config import setup_logging
 from app.logger.structlog_config import setup_structlog
 from app.api.routers.health import router as health
 from app.api.routers.events import router as events
 from app.api.routers.notifications import router as notifications
+from app.services.activity_tracker import ACTIVITY
+from app.services.event_buffer import EVENT_BUFFER
 
 setup_logging()
 setup_structlog()
@@ -23,7 +29,34 @@ log = structlog.get_logger(__name__)
 async def lifespan(app: FastAPI):
     async with engine.begin() as conn:
         log.info("FastAPI startup")
+
+        activity = asyncio.create_task(
+            ACTIVITY.run(write=write_activity, interval=settings.LAST_ACTIVE_FLUSH_INTERVAL)
+        )
+
+        flusher = None
+        if settings.EVENT_INGEST_MODE == "buffered":
+            flusher = asyncio.create_task(EVENT_BUFFER.run(flush=flush_events))
+
         yield
+
+        if flusher is not None:
+            # Requests have stopped by now; commit what is still buffered.
+            await EVENT_BUFFER.drain()
+            flusher.cancel()
+
+        # Wait for the cancelled task, so a flush it had in flight has put
+        # its batch back before the final flush below.
+        activity.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await activity
+
+        try:
+            await ACTIVITY.flush(write=write_activity)
+
+        except Exception:
+            log.exception("last_active_final_flush_failed")
+
         log.info("FastAPI shutdown")
 
 app = FastAPI(lifespan=lifespan)
@@ -0,0 +1,132 @@
+import argparse
+import asyncio
+import structlog
+from datetime import date, datetime, timezone
+
+from app.db.db import async_session_maker, engine
+from app.db.settings import settings
+from app.logger.logging_config import setup_logging
+from app.logger.structlog_config import setup_structlog
+from app.repositories.partition_repository import (
+    DEFAULT_PARTITION,
+    PARTITION_PREFIX,
+    PartitionRepository,
+    partition_name,
+)
+
+log = structlog.get_logger(__name__)
+
+def month_start(day: date, offset: int = 0) -> date:
+    year, month = divmod(day.year * 12 + day.month - 1 + offset, 12)
+    return date(year, month + 1, 1)
+
+async def ensure_partitions(*, months_ahead: int, today: date | None = None) -> list[str]:
+    """Creates the current month's partition and ``months_ahead`` more, so
+    inserts never fall through to the default partition.
+
+    A month whose rows already landed in the default partition (the job
+    did not run in time) cannot be created over them. For those the default
+    is detached, the partitions are created, the rows are moved into them
+    and the default is attached again, all in the same transaction; inserts
+    into ``Notifications`` wait on the table lock meanwhile."""
+    today = today or datetime.now(timezone.utc).date()
+
+    async with async_session_maker() as session:
+        repo = PartitionRepository(session=session)
+
+        async with session.begin():
+            existing = set(await repo.list_partitions())
+            missing = [
+                month_start(today, offset)
+                for offset in range(months_ahead + 1)
+                if partition_name(month_start(today, offset)) not in existing
+            ]
+
+            overflowed = [
+                start for start in missing
+                if DEFAULT_PARTITION in existing
+                and await repo.default_has_rows(start=start, end=month_start(start, 1))
+            ]
+
+            if overflowed:
+                log.warning(
+                    "partitions_default_overflow",
+                    partitions=[partition_name(start) for start in overflowed]
+                )
+                await repo.detach_partition(name=DEFAULT_PARTITION)
+
+            created = [
+                await repo.create_partition(start=start, end=month_start(start, 1))
+                for start in missing
+            ]
+
+            if overflowed:
+                for start in overflowed:
+                    moved = await repo.move_from_default(start=start, end=month_start(start, 1))
+                    log.info("partition_rows_moved", partition=partition_name(start), rows=moved)
+
+                await repo.attach_default()
+
+    log.info("partitions_ensured", created=created, months_ahead=months_ahead)
+    return created
+
+async def detach_partitions(
+        *,
+        retention_months: int,
+        drop: bool = False,
+        today: date | None = None
+    ) -> list[str]:
+    """Detaches monthly partitions that ended more than ``retention_months``
+    ago. A partition that still holds pending or processing rows is kept."""
+    today = today or datetime.now(timezone.utc).date()
+    cutoff = partition_name(month_start(today, -retention_months))
+
+    async with async_session_maker() as session:
+        repo = PartitionRepository(session=session)
+
+        async with session.begin():
+            candidates = [
+                name for name in await repo.list_partitions()
+                if name.startswith(PARTITION_PREFIX) and name < cutoff
+            ]
+
+        detached = []
+        for name in candidates:
+            async with session.begin():
+                if await repo.has_unfinished(name=name):
+                    log.warning("partition_detach_skipped", partition=name, reason="unfinished rows")
+                    continue
+
+                await repo.detach_partition(name=name, drop=drop)
+                detached.append(name)
+
+    log.info("partitions_detached", detached=detached, dropped=drop)
+    return detached
+
+async def run(args: argparse.Namespace):
+    try:
+        if args.command == "ensure":
+            await ensure_partitions(months_ahead=args.months_ahead)
+        else:
+            await detach_partitions(retention_months=args.retention_months, drop=args.drop)
+
+    finally:
+        await engine.dispose()
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage Notifications partitions")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    ensure = commands.add_parser("ensure", help="create upcoming monthly partitions")
+    ensure.add_argument("--months-ahead", type=int, default=settings.PARTITION_PRECREATE_MONTHS)
+
+    detach = commands.add_parser("detach", help="detach partitions past retention")
+    detach.add_argument("--retention-months", type=int, default=settings.PARTITION_RETENTION_MONTHS)
+    detach.add_argument("--drop", action="store_true", help="drop detached partitions")
+
+    setup_logging()
+    setup_structlog()
+    asyncio.run(run(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+import argparse
+import asyncio
+import gzip
+import json
+import time
+import structlog
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from app.db.db import async_session_maker, engine
+from app.db.models.enums import NotificationStatus
+from app.db.settings import settings
+from app.logger.logging_config import setup_logging
+from app.logger.structlog_config import setup_structlog
+from app.repositories.event_key_repository import EventKeyRepository
+from app.repositories.notification_repository import NotificationRepository
+
+log = structlog.get_logger(__name__)
+
+TERMINAL_STATUSES = [NotificationStatus.READ, NotificationStatus.FAILED, NotificationStatus.DIGESTED]
+
+def archive_path(directory: Path, now: datetime) -> Path:
+    return directory / f"notifications-{now:%Y%m%dT%H%M%SZ}.jsonl.gz"
+
+def to_json_line(row) -> str:
+    return json.dumps(dict(row), default=str, ensure_ascii=False) + "\n"
+
+async def purge_terminal(
+        *,
+        older_than: timedelta,
+        batch_size: int,
+        archive_dir: Path
+    ) -> int:
+    """Archives READ, FAILED and DIGESTED notifications created more than
+    ``older_than`` ago to one gzipped JSONL file, then deletes them.
+
+    Every batch is locked, written and flushed to the archive, and deleted
+    in its own short transaction. A crash between the flush and the commit
+    leaves the batch in the table and in the archive; the next run archives
+    it again rather than losing it."""
+    now = datetime.now(timezone.utc)
+    before = now - older_than
+    path = archive_path(archive_dir, now)
+    archive_dir.mkdir(parents=True, exist_ok=True)
+
+    log.info("retention_started", before=before, batch_size=batch_size, archive=str(path))
+
+    total = 0
+    started = time.monotonic()
+
+    with gzip.open(path, "wt", encoding="utf-8") as archive:
+        async with async_session_maker() as session:
+            repo = NotificationRepository(session=session)
+
+            while True:
+                batch_started = time.monotonic()
+
+                async with session.begin():
+                    rows = await repo.lock_expired(
+                        statuses=TERMINAL_STATUSES,
+                        before=before,
+                        limit=batch_size
+                    )
+                    if not rows:
+                        break
+
+                    archive.writelines(to_json_line(row) for row in rows)
+                    archive.flush()
+
+                    deleted = await repo.delete_by_ids(
+                        ids=[row["id"] for row in rows],
+                        before=before
+                    )
+
+                total += deleted
+                elapsed = time.monotonic() - batch_started
+                log.info(
+                    "retention_batch",
+                    rows=deleted,
+                    rows_per_second=round(deleted / elapsed, 1) if elapsed else None,
+                    total=total
+                )
+
+                if len(rows) < batch_size:
+                    break
+
+    elapsed = time.monotonic() - started
+    log.info(
+        "retention_finished",
+        rows=total,
+        seconds=round(elapsed, 2),
+        rows_per_second=round(total / elapsed, 1) if elapsed else None,
+        archive=str(path)
+    )
+
+    if not total:
+        path.unlink(missing_ok=True)
+
+    return total
+
+async def purge_event_keys(*, older_than: timedelta) -> int:
+    """Forgets idempotency keys past their TTL; a retry older than that is
+    accepted as a new event."""
+    async with async_session_maker() as session:
+        async with session.begin():
+            deleted = await EventKeyRepository(session=session).delete_before(
+                before=datetime.now(timezone.utc) - older_than
+            )
+
+    log.info("event_keys_purged", rows=deleted)
+    return deleted
+
+async def run(args: argparse.Namespace):
+    try:
+        await purge_terminal(
+            older_than=timedelta(days=args.older_than_days),
+            batch_size=args.batch_size,
+            archive_dir=Path(args.archive_dir)
+        )
+        await purge_event_keys(older_than=timedelta(days=settings.IDEMPOTENCY_KEY_TTL_DAYS))
+
+    finally:
+        await engine.dispose()
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Archive and delete READ/FAILED/DIGESTED notifications past retention"
+    )
+    parser.add_argument("--older-than-days", type=int, default=settings.RETENTION_AGE_DAYS)
+    parser.add_argument("--batch-size", type=int, default=settings.RETENTION_BATCH_SIZE)
+    parser.add_argument("--archive-dir", default=settings.RETENTION_ARCHIVE_DIR)
+
+    setup_logging()
+    setup_structlog()
+    asyncio.run(run(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
@@ -6,7 +6,10 @@ from sqlalchemy import pool
 from alembic import context
 
 from app.db.models.base import Base
+from app.db.models.campaign import Campaign, CampaignRead
+from app.db.models.event_key import EventKey
 from app.db.models.notification import Notification
+from app.db.models.rate_limit_bucket import RateLimitBucket
 from app.db.models.user import User
 from app.db.settings import settings
 
@@ -0,0 +1,34 @@
+"""event idempotency keys
+
+Revision ID: 1dfef81140ef
+Revises: 03b43029888a
+Create Date: 2026-10-18 19:21:03.660412
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1dfef81140ef'
+down_revision: Union[str, Sequence[str], None] = '03b43029888a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('EventKeys',
+    sa.Column('key', sa.String(length=200), nullable=False),
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('key')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('EventKeys')
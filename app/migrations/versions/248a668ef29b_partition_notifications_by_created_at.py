@@ -0,0 +1,157 @@
+"""partition notifications by created_at
+
+Revision ID: 248a668ef29b
+Revises: 773b7e33ec21
+Create Date: 2026-10-18 16:40:31.587214
+
+Rebuilds "Notifications" as a table range-partitioned by month on
+created_at. Existing rows are copied into monthly partitions covering their
+range, plus the next three months and a DEFAULT catch-all; afterwards
+python -m app.maintenance.partitions ensure keeps creating months ahead.
+The copy runs in the migration transaction, so plan downtime for large tables.
+"""
+from datetime import date, datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '248a668ef29b'
+down_revision: Union[str, Sequence[str], None] = '773b7e33ec21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+MONTHS_AHEAD = 3
+
+COLUMNS = (
+    'id, created_at, title, message, status, channel, priority, attempts, '
+    'next_attempt_at, updated_at, lease_owner, lease_expires_at, user_id'
+)
+
+
+def _month_start(day: date, offset: int = 0) -> date:
+    year, month = divmod(day.year * 12 + day.month - 1 + offset, 12)
+    return date(year, month + 1, 1)
+
+
+def _columns() -> list[sa.Column]:
+    return [
+        sa.Column('id', sa.UUID(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('title', sa.String(), nullable=True),
+        sa.Column('message', sa.String(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('channel', sa.String(length=50), nullable=False),
+        sa.Column('priority', sa.String(length=10), server_default='high', nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('next_attempt_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('lease_owner', sa.UUID(), nullable=True),
+        sa.Column('lease_expires_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('user_id', sa.UUID(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['Users.id'], ondelete='CASCADE'),
+    ]
+
+
+def _create_indexes() -> None:
+    op.create_index(op.f('ix_Notifications_user_id'), 'Notifications', ['user_id'], unique=False)
+    op.create_index(
+        'ix_Notifications_pending_channel_priority_next_attempt_at',
+        'Notifications',
+        ['channel', 'priority', 'next_attempt_at'],
+        unique=False,
+        postgresql_where=sa.text("status = 'pending'")
+    )
+    op.create_index(
+        'ix_Notifications_processing_lease_expires_at',
+        'Notifications',
+        ['lease_expires_at'],
+        unique=False,
+        postgresql_where=sa.text("status = 'processing'")
+    )
+    op.create_index(
+        'ix_Notifications_processing_lease_owner',
+        'Notifications',
+        ['lease_owner'],
+        unique=False,
+        postgresql_where=sa.text("status = 'processing'")
+    )
+
+
+def _drop_indexes(table: str) -> None:
+    for name in (
+        'ix_Notifications_processing_lease_owner',
+        'ix_Notifications_processing_lease_expires_at',
+        'ix_Notifications_pending_channel_priority_next_attempt_at',
+        'ix_Notifications_user_id',
+    ):
+        op.drop_index(name, table_name=table)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _drop_indexes('Notifications')
+    op.rename_table('Notifications', 'Notifications_unpartitioned')
+    op.execute(
+        'ALTER TABLE "Notifications_unpartitioned" '
+        'RENAME CONSTRAINT "Notifications_pkey" TO "Notifications_unpartitioned_pkey"'
+    )
+
+    op.create_table(
+        'Notifications',
+        *_columns(),
+        sa.PrimaryKeyConstraint('id', 'created_at'),
+        postgresql_partition_by='RANGE (created_at)'
+    )
+
+    oldest = op.get_bind().execute(
+        sa.text('SELECT min(created_at) FROM "Notifications_unpartitioned"')
+    ).scalar()
+    today = datetime.now(timezone.utc).date()
+    month = _month_start(min(oldest.date(), today) if oldest else today)
+    last = _month_start(today, MONTHS_AHEAD)
+
+    while month <= last:
+        following = _month_start(month, 1)
+        op.execute(
+            f'CREATE TABLE "Notifications_p{month:%Y%m}" PARTITION OF "Notifications" '
+            f"FOR VALUES FROM ('{month.isoformat()} 00:00:00+00') "
+            f"TO ('{following.isoformat()} 00:00:00+00')"
+        )
+        month = following
+
+    op.execute('CREATE TABLE "Notifications_default" PARTITION OF "Notifications" DEFAULT')
+
+    op.execute(
+        f'INSERT INTO "Notifications" ({COLUMNS}) '
+        f'SELECT {COLUMNS} FROM "Notifications_unpartitioned"'
+    )
+    op.drop_table('Notifications_unpartitioned')
+
+    _create_indexes()
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _drop_indexes('Notifications')
+    op.rename_table('Notifications', 'Notifications_partitioned')
+    op.execute(
+        'ALTER TABLE "Notifications_partitioned" '
+        'RENAME CONSTRAINT "Notifications_pkey" TO "Notifications_partitioned_pkey"'
+    )
+
+    op.create_table(
+        'Notifications',
+        *_columns(),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.execute(
+        f'INSERT INTO "Notifications" ({COLUMNS}) '
+        f'SELECT {COLUMNS} FROM "Notifications_partitioned"'
+    )
+    # Dropping the parent drops every attached partition with it.
+    op.drop_table('Notifications_partitioned')
+
+    _create_indexes()
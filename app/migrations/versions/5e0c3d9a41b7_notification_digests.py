@@ -0,0 +1,38 @@
+"""notification digests
+
+Revision ID: 5e0c3d9a41b7
+Revises: 1dfef81140ef
+Create Date: 2026-10-18 21:04:37.518226
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e0c3d9a41b7'
+down_revision: Union[str, Sequence[str], None] = '1dfef81140ef'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('Notifications', sa.Column('digest_size', sa.Integer(), nullable=True))
+    op.add_column('Notifications', sa.Column('digest_id', sa.UUID(), nullable=True))
+    op.create_index(
+        'ix_Notifications_digest_id',
+        'Notifications',
+        ['digest_id'],
+        unique=False,
+        postgresql_where=sa.text('digest_id IS NOT NULL')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_Notifications_digest_id', table_name='Notifications')
+    op.drop_column('Notifications', 'digest_id')
+    op.drop_column('Notifications', 'digest_size')
@@ -0,0 +1,50 @@
+"""notification leases
+
+Revision ID: 62a511157c46
+Revises: 69fcd460bb39
+Create Date: 2026-10-18 12:26:05.771903
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '62a511157c46'
+down_revision: Union[str, Sequence[str], None] = '69fcd460bb39'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('Notifications', sa.Column('lease_owner', sa.UUID(), nullable=True))
+    op.add_column('Notifications', sa.Column('lease_expires_at', sa.DateTime(timezone=True), nullable=True))
+    # Rows stuck in PROCESSING before leases existed become reapable at once.
+    op.execute(
+        """UPDATE "Notifications" SET lease_expires_at = now() WHERE status = 'processing'"""
+    )
+    op.create_index(
+        'ix_Notifications_processing_lease_expires_at',
+        'Notifications',
+        ['lease_expires_at'],
+        unique=False,
+        postgresql_where=sa.text("status = 'processing'")
+    )
+    op.create_index(
+        'ix_Notifications_processing_lease_owner',
+        'Notifications',
+        ['lease_owner'],
+        unique=False,
+        postgresql_where=sa.text("status = 'processing'")
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_Notifications_processing_lease_owner', table_name='Notifications')
+    op.drop_index('ix_Notifications_processing_lease_expires_at', table_name='Notifications')
+    op.drop_column('Notifications', 'lease_expires_at')
+    op.drop_column('Notifications', 'lease_owner')
@@ -0,0 +1,42 @@
+"""pending channel next_attempt_at index
+
+Revision ID: 69fcd460bb39
+Revises: a7c51e71a567
+Create Date: 2026-10-18 11:02:47.518230
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '69fcd460bb39'
+down_revision: Union[str, Sequence[str], None] = 'a7c51e71a567'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_Notifications_pending_channel_next_attempt_at',
+        'Notifications',
+        ['channel', 'next_attempt_at'],
+        unique=False,
+        postgresql_where=sa.text("status = 'pending'")
+    )
+    op.drop_index('ix_Notifications_pending_next_attempt_at', table_name='Notifications')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index(
+        'ix_Notifications_pending_next_attempt_at',
+        'Notifications',
+        ['next_attempt_at'],
+        unique=False,
+        postgresql_where=sa.text("status = 'pending'")
+    )
+    op.drop_index('ix_Notifications_pending_channel_next_attempt_at', table_name='Notifications')
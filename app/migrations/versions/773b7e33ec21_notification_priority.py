@@ -0,0 +1,47 @@
+"""notification priority
+
+Revision ID: 773b7e33ec21
+Revises: 7b4b0daefe40
+Create Date: 2026-10-18 15:12:09.304118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '773b7e33ec21'
+down_revision: Union[str, Sequence[str], None] = '7b4b0daefe40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'Notifications',
+        sa.Column('priority', sa.String(length=10), server_default='high', nullable=False)
+    )
+    op.create_index(
+        'ix_Notifications_pending_channel_priority_next_attempt_at',
+        'Notifications',
+        ['channel', 'priority', 'next_attempt_at'],
+        unique=False,
+        postgresql_where=sa.text("status = 'pending'")
+    )
+    op.drop_index('ix_Notifications_pending_channel_next_attempt_at', table_name='Notifications')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index(
+        'ix_Notifications_pending_channel_next_attempt_at',
+        'Notifications',
+        ['channel', 'next_attempt_at'],
+        unique=False,
+        postgresql_where=sa.text("status = 'pending'")
+    )
+    op.drop_index('ix_Notifications_pending_channel_priority_next_attempt_at', table_name='Notifications')
+    op.drop_column('Notifications', 'priority')
@@ -0,0 +1,34 @@
+"""terminal created_at index
+
+Revision ID: 9c2f61d4b8e3
+Revises: 5e0c3d9a41b7
+Create Date: 2026-10-18 23:12:09.402117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c2f61d4b8e3'
+down_revision: Union[str, Sequence[str], None] = '5e0c3d9a41b7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_Notifications_terminal_created_at',
+        'Notifications',
+        ['created_at'],
+        unique=False,
+        postgresql_where=sa.text("status IN ('read', 'failed', 'digested')")
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_Notifications_terminal_created_at', table_name='Notifications')
@@ -0,0 +1,34 @@
+"""pending next_attempt_at index
+
+Revision ID: a7c51e71a567
+Revises: cfc28a4acd38
+Create Date: 2026-10-18 10:12:31.204417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c51e71a567'
+down_revision: Union[str, Sequence[str], None] = 'cfc28a4acd38'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_Notifications_pending_next_attempt_at',
+        'Notifications',
+        ['next_attempt_at'],
+        unique=False,
+        postgresql_where=sa.text("status = 'pending'")
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_Notifications_pending_next_attempt_at', table_name='Notifications')
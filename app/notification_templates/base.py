@@ -1,6 +0,0 @@
-from abc import ABC, abstractmethod
-
-class NotificationTemplate(ABC):
-    @abstractmethod
-    def render(self, payload: dict | None) -> str:
-        pass
\ No newline at end of file
@@ -0,0 +1,119 @@
+import json
+import string
+from pathlib import Path
+import structlog
+
+from app.errors.template_error import MissingPayloadKeysError, TemplateError, TemplateNotFoundError
+
+log = structlog.get_logger(__name__)
+
+class CompiledTemplate:
+    """A template source split once into literal text and payload fields.
+    Only bare ``{name}`` fields are allowed: no format specs, conversions
+    or attribute/index access."""
+
+    def __init__(self, *, name: str, locale: str, source: str, required: frozenset[str]):
+        self.name = name
+        self.locale = locale
+        self.required = required
+        self.__parts: list[tuple[str, str | None]] = []
+
+        try:
+            parsed = list(string.Formatter().parse(source))
+        except ValueError as e:
+            raise TemplateError(f"{name}[{locale}]: {e}") from e
+
+        for literal, field, spec, conversion in parsed:
+            if field is not None and (not field.isidentifier() or spec or conversion):
+                raise TemplateError(f"{name}[{locale}]: unsupported field {{{field}}}")
+
+            if field is not None and field not in required:
+                raise TemplateError(f"{name}[{locale}]: field {field!r} is not declared as required")
+
+            self.__parts.append((literal, field))
+
+    def render(self, payload: dict) -> str:
+        return "".join(
+            literal if field is None else literal + str(payload[field])
+            for literal, field in self.__parts
+        )
+
+class TemplateEngine:
+    """Notification templates loaded from data. Every variant is compiled
+    and checked at load time; rendering only validates the payload keys and
+    joins precompiled parts."""
+
+    def __init__(self, *, templates: dict[str, dict], default_locale: str):
+        self.__default_locale = default_locale
+        self.__compiled: dict[tuple[str, str], CompiledTemplate] = {}
+        self.__required: dict[str, frozenset[str]] = {}
+
+        for name, spec in templates.items():
+            required = frozenset(spec.get("required", []))
+            locales = spec.get("locales", {})
+
+            if default_locale not in locales:
+                raise TemplateError(f"{name}: no {default_locale!r} variant")
+
+            self.__required[name] = required
+            for locale, source in locales.items():
+                self.__compiled[name, locale] = CompiledTemplate(
+                    name=name,
+                    locale=locale,
+                    source=source,
+                    required=required
+                )
+
+        log.info(
+            "notification_templates_loaded",
+            templates=len(self.__required),
+            variants=len(self.__compiled)
+        )
+
+    @classmethod
+    def from_file(cls, path: Path, *, default_locale: str) -> "TemplateEngine":
+        with open(path, encoding="utf-8") as f:
+            return cls(templates=json.load(f), default_locale=default_locale)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.__required
+
+    def template(self, name: str, locale: str | None = None) -> CompiledTemplate:
+        compiled = (
+            self.__compiled.get((name, locale or self.__default_locale))
+            or self.__compiled.get((name, self.__default_locale))
+        )
+        if compiled is None:
+            raise TemplateNotFoundError(name)
+        return compiled
+
+    def render(self, name: str, payload: dict | None, locale: str | None = None) -> str:
+        compiled = self.template(name, locale)
+        payload = payload or {}
+
+        missing = compiled.required - payload.keys()
+        if missing:
+            raise MissingPayloadKeysError(sorted(missing))
+
+        return compiled.render(payload)
+
+    def render_many(
+            self,
+            name: str,
+            payloads: list[dict | None],
+            locale: str | None = None
+        ) -> list[str | TemplateError]:
+        """Renders one template against many payloads; a payload that fails
+        yields its error in place of the message."""
+        compiled = self.template(name, locale)
+        results: list[str | TemplateError] = []
+
+        for payload in payloads:
+            payload = payload or {}
+            missing = compiled.required - payload.keys()
+            results.append(
+                MissingPayloadKeysError(sorted(missing)) if missing
+                else compiled.render(payload)
+            )
+
+        return results
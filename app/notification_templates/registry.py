@@ -1,10 +1,31 @@
+from pathlib import Path
+
 from app.db.models.enums import EventType
-from app.notification_templates.order_cancelled import OrderCancelledTemplate
-from app.notification_templates.order_paid import OrderPaidTemplate
-from app.notification_templates.user_registered import UserRegisteredTemplate
-
-notification_templates = {
-    EventType.USER_REGISTERED: UserRegisteredTemplate,
-    EventType.ORDER_PAID: OrderPaidTemplate,
-    EventType.ORDER_CANCELLED: OrderCancelledTemplate
-}
\ No newline at end of file
+from app.db.settings import settings
+from app.errors.template_error import TemplateError
+from app.notification_templates.engine import TemplateEngine
+
+DEFAULT_TEMPLATES_PATH = Path(__file__).with_name("templates.json")
+DIGEST_TEMPLATE = "notification_digest"
+
+def load_templates() -> TemplateEngine:
+    engine = TemplateEngine.from_file(
+        Path(settings.TEMPLATES_PATH) if settings.TEMPLATES_PATH else DEFAULT_TEMPLATES_PATH,
+        default_locale=settings.TEMPLATE_DEFAULT_LOCALE
+    )
+
+    required = [event_type.value for event_type in EventType]
+    if settings.DIGEST_WINDOW:
+        required.append(DIGEST_TEMPLATE)
+
+    missing = [name for name in required if name not in engine]
+    if missing:
+        raise TemplateError(f"missing templates: {', '.join(missing)}")
+
+    # Digests are titled at claim time with nothing but the count.
+    if DIGEST_TEMPLATE in engine and not engine.template(DIGEST_TEMPLATE).required <= {"count"}:
+        raise TemplateError(f"{DIGEST_TEMPLATE} may only require 'count'")
+
+    return engine
+
+notification_templates = load_templates()
@@ -0,0 +1,103 @@
+import uuid
+import structlog
+from datetime import timedelta
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import and_, exists, func, select
+from sqlalchemy.dialects.postgresql import insert
+
+from app.db.models.campaign import Campaign, CampaignRead
+from app.db.models.user import User
+from app.db.settings import settings
+
+log = structlog.get_logger(__name__)
+
+def _visible_to(user_id: uuid.UUID):
+    # The audience predicate, evaluated against the reader at read time.
+    return and_(
+        User.id == user_id,
+        User.created_at <= Campaign.created_at,
+        User.last_active > Campaign.active_since,
+        Campaign.created_at >= func.now() - timedelta(days=settings.INBOX_WINDOW_DAYS)
+    )
+
+class CampaignRepository:
+    def __init__(self, *, session: AsyncSession):
+        self.__session = session
+
+    async def create(self, *, campaign: Campaign):
+        try:
+            self.__session.add(campaign)
+            await self.__session.flush()
+
+        except SQLAlchemyError:
+            log.exception(
+                "db_create_campaign_failed",
+                campaign_id=campaign.id
+            )
+            raise
+
+    async def list_unread(self, *, user_id: uuid.UUID, limit: int = 100) -> list[Campaign]:
+        read = exists().where(
+            CampaignRead.campaign_id == Campaign.id,
+            CampaignRead.user_id == user_id
+        )
+        query = (
+            select(Campaign)
+            .join(User, _visible_to(user_id))
+            .where(~read)
+            .order_by(Campaign.created_at.desc())
+            .limit(limit)
+        )
+
+        try:
+            result = await self.__session.execute(query)
+            return list(result.scalars().all())
+
+        except SQLAlchemyError:
+            log.exception(
+                "db_list_unread_campaigns_failed",
+                user_id=user_id
+            )
+            raise
+
+    async def get_visible(self, *, campaign_id: uuid.UUID, user_id: uuid.UUID) -> Campaign | None:
+        query = (
+            select(Campaign)
+            .join(User, _visible_to(user_id))
+            .where(Campaign.id == campaign_id)
+        )
+
+        try:
+            result = await self.__session.execute(query)
+            return result.scalar_one_or_none()
+
+        except SQLAlchemyError:
+            log.exception(
+                "db_get_campaign_failed",
+                campaign_id=campaign_id,
+                user_id=user_id
+            )
+            raise
+
+    async def mark_read(self, *, campaign_id: uuid.UUID, user_id: uuid.UUID) -> bool:
+        """Records that ``user_id`` read the campaign. Returns False if it
+        had been read already."""
+        query = (
+            insert(CampaignRead)
+            .values(id=uuid.uuid4(), campaign_id=campaign_id, user_id=user_id, created_at=func.now())
+            .on_conflict_do_nothing(index_elements=["campaign_id", "user_id"])
+            .returning(CampaignRead.id)
+        )
+
+        try:
+            result = await self.__session.execute(query)
+            return result.scalar_one_or_none() is not None
+
+        except SQLAlchemyError:
+            log.exception(
+                "db_mark_campaign_read_failed",
+                campaign_id=campaign_id,
+                user_id=user_id
+            )
+            raise
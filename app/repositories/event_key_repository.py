@@ -0,0 +1,86 @@
+import uuid
+import structlog
+from collections.abc import Callable
+from datetime import datetime
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import String, any_, bindparam, delete, func
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import insert
+
+from app.db.hooks import after_commit
+from app.db.models.event_key import EventKey
+
+log = structlog.get_logger(__name__)
+
+class EventKeyRepository:
+    def __init__(self, *, session: AsyncSession):
+        self.__session = session
+
+    async def claim(self, *, keys: list[str]) -> set[str]:
+        """Inserts ``keys`` and returns the ones that were new. A key held by
+        a concurrent, uncommitted transaction blocks until that transaction
+        ends, so exactly one claimant wins."""
+        if not keys:
+            return set()
+
+        query = (
+            insert(EventKey)
+            .values([
+                {"id": uuid.uuid4(), "key": key, "created_at": func.now()}
+                for key in keys
+            ])
+            .on_conflict_do_nothing(index_elements=["key"])
+            .returning(EventKey.key)
+        )
+
+        try:
+            result = await self.__session.execute(query)
+            return set(result.scalars().all())
+
+        except SQLAlchemyError:
+            log.exception(
+                "db_claim_event_keys_failed",
+                count=len(keys)
+            )
+            raise
+
+    async def release(self, *, keys: list[str]) -> int:
+        """Deletes keys claimed earlier in this transaction, so the events
+        they guarded can be retried with the same key."""
+        if not keys:
+            return 0
+
+        query = delete(EventKey).where(
+            EventKey.key == any_(bindparam("keys", keys, type_=ARRAY(String)))
+        )
+
+        try:
+            result = await self.__session.execute(query)
+            return result.rowcount
+
+        except SQLAlchemyError:
+            log.exception(
+                "db_release_event_keys_failed",
+                count=len(keys)
+            )
+            raise
+
+    def after_commit(self, callback: Callable[[], None]):
+        """Runs ``callback`` once the current transaction commits; it is
+        dropped if the transaction rolls back."""
+        after_commit(self.__session, callback)
+
+    async def delete_before(self, *, before: datetime) -> int:
+        query = delete(EventKey).where(EventKey.created_at < before)
+
+        try:
+            result = await self.__session.execute(query)
+            return result.rowcount
+
+        except SQLAlchemyError:
+            log.exception(
+                "db_delete_event_keys_failed",
+                before=before
+            )
+            raise
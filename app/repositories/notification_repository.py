@@ -1,15 +1,28 @@
 import uuid
 import structlog
-from datetime import datetime
+from collections.abc import Callable
+from datetime import datetime, timedelta
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import and_, select, update, func
+from sqlalchemy import DateTime, RowMapping, and_, any_, bindparam, case, delete, insert, literal, select, update, func
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID
 
-from app.db.models.enums import NotificationStatus
+from app.db.hooks import after_commit
+from app.db.models.enums import NotificationChannel, NotificationPriority, NotificationStatus
 from app.db.models.notification import Notification
+from app.db.models.user import User
+from app.db.settings import settings
 
 log = structlog.get_logger(__name__)
 
+def _lease_expiry(seconds: float):
+    return func.now() + timedelta(seconds=seconds)
+
+def _created_within(days: int):
+    # Notifications is range-partitioned on created_at; bounding it lets
+    # Postgres prune the partitions holding only finished history.
+    return Notification.created_at >= func.now() - timedelta(days=days)
+
 class NotificationRepository:
     def __init__(self, *, session: AsyncSession):
         self.__session = session
@@ -18,6 +31,8 @@ class NotificationRepository:
         try:
             self.__session.add(notification)
             await self.__session.flush()
+            if notification.status == NotificationStatus.PENDING:
+                await self._notify_pending(channels={notification.channel})
 
         except SQLAlchemyError:
             log.exception(
@@ -30,6 +45,10 @@ class NotificationRepository:
         try:
             self.__session.add_all(notifications)
             await self.__session.flush()
+            await self._notify_pending(channels={
+                n.channel for n in notifications
+                if n.status == NotificationStatus.PENDING
+            })
 
         except SQLAlchemyError:
             log.exception(
@@ -37,6 +56,78 @@ class NotificationRepository:
             )
             raise
 
+    async def fan_out(
+        self,
+        *,
+        title: str | None,
+        message: str,
+        channel: NotificationChannel,
+        priority: NotificationPriority,
+        active_since: datetime
+    ) -> int:
+        """Creates one pending notification per user active since
+        ``active_since`` with a single INSERT ... SELECT; no user row is
+        loaded into Python."""
+        recipients = (
+            select(
+                func.gen_random_uuid(),
+                func.now(),
+                literal(title),
+                literal(message),
+                literal(NotificationStatus.PENDING.value),
+                literal(NotificationChannel(channel).value),
+                literal(NotificationPriority(priority).value),
+                literal(0),
+                func.now(),
+                func.now(),
+                User.id
+            )
+            .where(User.last_active > active_since)
+        )
+        query = insert(Notification).from_select(
+            [
+                "id",
+                "created_at",
+                "title",
+                "message",
+                "status",
+                "channel",
+                "priority",
+                "attempts",
+                "next_attempt_at",
+                "updated_at",
+                "user_id",
+            ],
+            recipients
+        )
+
+        try:
+            result = await self.__session.execute(query)
+            if result.rowcount:
+                await self._notify_pending(channels={channel})
+            return result.rowcount
+
+        except SQLAlchemyError:
+            log.exception(
+                "db_fan_out_failed",
+                channel=channel
+            )
+            raise
+
+    async def _notify_pending(self, *, channels: set[NotificationChannel]):
+        # NOTIFY is transactional: listeners are woken only once the
+        # surrounding transaction commits, so workers never see a wakeup
+        # for rows they cannot claim yet.
+        for channel in channels:
+            await self.__session.execute(
+                select(func.pg_notify(settings.NOTIFY_CHANNEL, NotificationChannel(channel).value))
+            )
+
+    def after_commit(self, callback: Callable[[], None]):
+        """Runs ``callback`` once the current transaction commits; it is
+        dropped if the transaction rolls back."""
+        after_commit(self.__session, callback)
+
     async def get_by_id(self, *, id: uuid.UUID):
         query = select(Notification).filter_by(id=id)
         try:
@@ -57,7 +148,13 @@ class NotificationRepository:
         status: NotificationStatus | None = None, 
         limit: int = 10
     ) -> list[Notification]:
-        query = select(Notification).filter_by(user_id=user_id).limit(limit)
+        query = (
+            select(Notification)
+            .filter_by(user_id=user_id)
+            .where(_created_within(settings.INBOX_WINDOW_DAYS))
+            .order_by(Notification.created_at.desc())
+            .limit(limit)
+        )
         
         if status is not None:
             query = query.filter_by(status=status)           
@@ -94,6 +191,41 @@ class NotificationRepository:
             )
             raise
     
+    async def transition(
+        self,
+        *,
+        notification_id: uuid.UUID,
+        expected: NotificationStatus,
+        status: NotificationStatus
+    ) -> Notification | None:
+        query = (
+            update(Notification)
+            .filter_by(id=notification_id, status=expected)
+            .values(
+                status=status,
+                lease_owner=None,
+                lease_expires_at=(
+                    _lease_expiry(settings.WORKER_LEASE_SECONDS)
+                    if status == NotificationStatus.PROCESSING else None
+                ),
+                updated_at=func.now()
+            )
+            .returning(Notification)
+            .execution_options(populate_existing=True)
+        )
+        try:
+            result = await self.__session.execute(query)
+            return result.scalar_one_or_none()
+
+        except SQLAlchemyError:
+            log.exception(
+                "db_transition_failed",
+                notification_id=notification_id,
+                expected=expected,
+                status=status
+            )
+            raise
+
     async def update_attempts(self, *, notification_id: uuid.UUID, new_attempts: int, next_attempt_at: datetime):
         query = (
             update(Notification)
@@ -121,6 +253,7 @@ class NotificationRepository:
         query = (
             select(Notification)
             .filter_by(status=NotificationStatus.PENDING)
+            .where(Notification.next_attempt_at <= func.now())
             .with_for_update(skip_locked=True)
             .limit(limit)
         )
@@ -134,3 +267,317 @@ class NotificationRepository:
                 "db_get_pending_failed"
             )
             raise
+
+    async def claim_pending(
+        self,
+        *,
+        channel: NotificationChannel | None = None,
+        priority: NotificationPriority | None = None,
+        limit: int = 10,
+        lease_owner: uuid.UUID | None = None,
+        lease_seconds: float = settings.WORKER_LEASE_SECONDS
+    ) -> list[Notification]:
+        pending = (
+            select(Notification.id)
+            .filter_by(status=NotificationStatus.PENDING)
+            .where(Notification.next_attempt_at <= func.now())
+            .order_by(Notification.next_attempt_at)
+            .with_for_update(skip_locked=True)
+            .limit(limit)
+        )
+
+        if channel is not None:
+            pending = pending.filter_by(channel=channel)
+
+        if priority is not None:
+            pending = pending.filter_by(priority=priority)
+
+        pending = pending.scalar_subquery()
+        query = (
+            update(Notification)
+            .where(Notification.id.in_(pending))
+            .values(
+                status=NotificationStatus.PROCESSING,
+                lease_owner=lease_owner,
+                lease_expires_at=_lease_expiry(lease_seconds),
+                updated_at=func.now()
+            )
+            .returning(Notification)
+            .execution_options(populate_existing=True)
+        )
+
+        try:
+            result = await self.__session.execute(query)
+            return list(result.scalars().all())
+
+        except SQLAlchemyError:
+            log.exception(
+                "db_claim_pending_failed",
+                channel=channel,
+                priority=priority
+            )
+            raise
+
+    async def next_attempt_due(
+        self,
+        *,
+        channel: NotificationChannel | None = None
+    ) -> datetime | None:
+        query = (
+            select(func.min(Notification.next_attempt_at))
+            .filter_by(status=NotificationStatus.PENDING)
+        )
+
+        if channel is not None:
+            query = query.filter_by(channel=channel)
+
+        try:
+            result = await self.__session.execute(query)
+            return result.scalar_one_or_none()
+
+        except SQLAlchemyError:
+            log.exception(
+                "db_next_attempt_due_failed",
+                channel=channel
+            )
+            raise
+
+    async def bulk_transition(
+        self,
+        *,
+        ids: list[uuid.UUID],
+        status: NotificationStatus,
+        expected: NotificationStatus = NotificationStatus.PROCESSING,
+        next_attempt_at: list[datetime] | None = None,
+        lease_owner: uuid.UUID | None = None,
+        count_attempt: bool = True
+    ) -> list[uuid.UUID]:
+        """Moves every row of ``ids`` still in ``expected`` to ``status`` and,
+        unless ``count_attempt`` is off, counts the attempt.
+        ``next_attempt_at``, when given, is matched to ``ids`` by position.
+        With ``lease_owner`` only rows still leased to that owner are touched.
+        Returns the ids that were actually updated."""
+        id_array = bindparam("ids", ids, type_=ARRAY(PG_UUID(as_uuid=True)))
+
+        query = (
+            update(Notification)
+            .where(Notification.status == expected)
+            .values(
+                status=status,
+                attempts=Notification.attempts + (1 if count_attempt else 0),
+                lease_owner=None,
+                lease_expires_at=None,
+                updated_at=func.now()
+            )
+            .returning(Notification.id)
+            .execution_options(synchronize_session=False)
+        )
+
+        if lease_owner is not None:
+            query = query.where(Notification.lease_owner == lease_owner)
+
+        if next_attempt_at is None:
+            query = query.where(Notification.id == any_(id_array))
+        else:
+            due = func.unnest(
+                id_array,
+                bindparam("due", next_attempt_at, type_=ARRAY(DateTime(timezone=True)))
+            ).table_valued("id", "next_attempt_at").render_derived(name="due")
+
+            query = (
+                query
+                .where(Notification.id == due.c.id)
+                .values(next_attempt_at=due.c.next_attempt_at)
+            )
+
+        try:
+            result = await self.__session.execute(query)
+            return list(result.scalars().all())
+
+        except SQLAlchemyError:
+            log.exception(
+                "db_bulk_transition_failed",
+                status=status,
+                count=len(ids)
+            )
+            raise
+
+    async def link_to_digest(
+        self,
+        *,
+        ids: list[uuid.UUID],
+        digest_ids: list[uuid.UUID],
+        lease_owner: uuid.UUID
+    ) -> list[uuid.UUID]:
+        """Marks the rows of ``ids`` DIGESTED and points each at the digest
+        at the same position of ``digest_ids``, in one statement. Only rows
+        still PROCESSING under ``lease_owner`` are touched; returns the ids
+        that were."""
+        links = func.unnest(
+            bindparam("ids", ids, type_=ARRAY(PG_UUID(as_uuid=True))),
+            bindparam("digest_ids", digest_ids, type_=ARRAY(PG_UUID(as_uuid=True)))
+        ).table_valued("id", "digest_id").render_derived(name="links")
+
+        query = (
+            update(Notification)
+            .where(
+                Notification.id == links.c.id,
+                Notification.status == NotificationStatus.PROCESSING,
+                Notification.lease_owner == lease_owner
+            )
+            .values(
+                status=NotificationStatus.DIGESTED,
+                digest_id=links.c.digest_id,
+                lease_owner=None,
+                lease_expires_at=None,
+                updated_at=func.now()
+            )
+            .returning(Notification.id)
+            .execution_options(synchronize_session=False)
+        )
+
+        try:
+            result = await self.__session.execute(query)
+            return list(result.scalars().all())
+
+        except SQLAlchemyError:
+            log.exception(
+                "db_link_to_digest_failed",
+                count=len(ids)
+            )
+            raise
+
+    async def list_digest_items(self, *, digest_id: uuid.UUID) -> list[Notification]:
+        query = (
+            select(Notification)
+            .filter_by(digest_id=digest_id)
+            .order_by(Notification.created_at)
+        )
+
+        try:
+            result = await self.__session.execute(query)
+            return list(result.scalars().all())
+
+        except SQLAlchemyError:
+            log.exception(
+                "db_list_digest_items_failed",
+                digest_id=digest_id
+            )
+            raise
+
+    async def extend_leases(
+        self,
+        *,
+        lease_owner: uuid.UUID,
+        lease_seconds: float = settings.WORKER_LEASE_SECONDS
+    ) -> int:
+        query = (
+            update(Notification)
+            .filter_by(status=NotificationStatus.PROCESSING, lease_owner=lease_owner)
+            .values(lease_expires_at=_lease_expiry(lease_seconds))
+            .execution_options(synchronize_session=False)
+        )
+
+        try:
+            result = await self.__session.execute(query)
+            return result.rowcount
+
+        except SQLAlchemyError:
+            log.exception(
+                "db_extend_leases_failed",
+                lease_owner=lease_owner
+            )
+            raise
+
+    async def reclaim_expired(self, *, max_attempts: int, limit: int = 1000) -> int:
+        """Returns rows whose lease ran out to PENDING, counting the lost
+        attempt; rows that have used up ``max_attempts`` become FAILED."""
+        expired = (
+            select(Notification.id)
+            .filter_by(status=NotificationStatus.PROCESSING)
+            .where(Notification.lease_expires_at < func.now())
+            .with_for_update(skip_locked=True)
+            .limit(limit)
+            .scalar_subquery()
+        )
+        query = (
+            update(Notification)
+            .where(Notification.id.in_(expired))
+            .values(
+                status=case(
+                    (
+                        Notification.attempts + 1 >= max_attempts,
+                        literal(NotificationStatus.FAILED.value)
+                    ),
+                    else_=literal(NotificationStatus.PENDING.value)
+                ),
+                attempts=Notification.attempts + 1,
+                next_attempt_at=func.now(),
+                lease_owner=None,
+                lease_expires_at=None,
+                updated_at=func.now()
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+        try:
+            result = await self.__session.execute(query)
+            return result.rowcount
+
+        except SQLAlchemyError:
+            log.exception(
+                "db_reclaim_expired_failed"
+            )
+            raise
+
+    async def lock_expired(
+        self,
+        *,
+        statuses: list[NotificationStatus],
+        before: datetime,
+        limit: int = 1000
+    ) -> list[RowMapping]:
+        """Locks up to ``limit`` rows in ``statuses`` created before
+        ``before`` and returns their raw column values, oldest first."""
+        query = (
+            select(*Notification.__table__.columns)
+            .where(
+                Notification.status.in_(statuses),
+                Notification.created_at < before
+            )
+            .order_by(Notification.created_at)
+            .with_for_update(skip_locked=True)
+            .limit(limit)
+        )
+
+        try:
+            result = await self.__session.execute(query)
+            return list(result.mappings().all())
+
+        except SQLAlchemyError:
+            log.exception(
+                "db_lock_expired_failed",
+                before=before
+            )
+            raise
+
+    async def delete_by_ids(self, *, ids: list[uuid.UUID], before: datetime) -> int:
+        query = (
+            delete(Notification)
+            .where(
+                Notification.id == any_(bindparam("ids", ids, type_=ARRAY(PG_UUID(as_uuid=True)))),
+                Notification.created_at < before
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+        try:
+            result = await self.__session.execute(query)
+            return result.rowcount
+
+        except SQLAlchemyError:
+            log.exception(
+                "db_delete_notifications_failed",
+                count=len(ids)
+            )
+            raise
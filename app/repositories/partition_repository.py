@@ -0,0 +1,135 @@
+import structlog
+from datetime import date, datetime, time, timezone
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import exists, select, table, column, text
+
+from app.db.models.enums import NotificationStatus
+from app.db.models.notification import Notification
+
+log = structlog.get_logger(__name__)
+
+PARTITION_PREFIX = f"{Notification.__tablename__}_p"
+DEFAULT_PARTITION = f"{Notification.__tablename__}_default"
+
+def partition_name(month: date) -> str:
+    return f"{PARTITION_PREFIX}{month:%Y%m}"
+
+def month_bounds(start: date, end: date) -> dict[str, datetime]:
+    return {
+        "start": datetime.combine(start, time(), tzinfo=timezone.utc),
+        "end": datetime.combine(end, time(), tzinfo=timezone.utc),
+    }
+
+class PartitionRepository:
+    """Monthly range partitions of ``Notifications`` on ``created_at``.
+    Partition names follow ``Notifications_pYYYYMM``; DDL cannot take bind
+    parameters, so names and bounds are only ever built from dates."""
+
+    def __init__(self, *, session: AsyncSession):
+        self.__session = session
+
+    async def list_partitions(self) -> list[str]:
+        query = text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE parent.relname = :parent "
+            "ORDER BY child.relname"
+        )
+        try:
+            result = await self.__session.execute(query, {"parent": Notification.__tablename__})
+            return list(result.scalars().all())
+
+        except SQLAlchemyError:
+            log.exception("db_list_partitions_failed")
+            raise
+
+    async def create_partition(self, *, start: date, end: date) -> str:
+        name = partition_name(start)
+        query = text(
+            f'CREATE TABLE IF NOT EXISTS "{name}" '
+            f'PARTITION OF "{Notification.__tablename__}" '
+            f"FOR VALUES FROM ('{start.isoformat()} 00:00:00+00') "
+            f"TO ('{end.isoformat()} 00:00:00+00')"
+        )
+        try:
+            await self.__session.execute(query)
+            return name
+
+        except SQLAlchemyError:
+            log.exception("db_create_partition_failed", partition=name)
+            raise
+
+    async def default_has_rows(self, *, start: date, end: date) -> bool:
+        """Whether rows of ``[start, end)`` already fell through to the
+        default partition; Postgres refuses to create a partition over them."""
+        query = text(
+            f'SELECT EXISTS (SELECT 1 FROM "{DEFAULT_PARTITION}" '
+            "WHERE created_at >= :start AND created_at < :end)"
+        )
+        try:
+            result = await self.__session.execute(query, month_bounds(start, end))
+            return result.scalar_one()
+
+        except SQLAlchemyError:
+            log.exception("db_default_partition_check_failed", start=start, end=end)
+            raise
+
+    async def move_from_default(self, *, start: date, end: date) -> int:
+        """Moves rows of ``[start, end)`` out of the detached default
+        partition back through the parent, into their monthly partition."""
+        query = text(
+            f'WITH moved AS (DELETE FROM "{DEFAULT_PARTITION}" '
+            "WHERE created_at >= :start AND created_at < :end RETURNING *) "
+            f'INSERT INTO "{Notification.__tablename__}" SELECT * FROM moved'
+        )
+        try:
+            result = await self.__session.execute(query, month_bounds(start, end))
+            return result.rowcount
+
+        except SQLAlchemyError:
+            log.exception("db_move_from_default_failed", start=start, end=end)
+            raise
+
+    async def attach_default(self):
+        try:
+            await self.__session.execute(text(
+                f'ALTER TABLE "{Notification.__tablename__}" '
+                f'ATTACH PARTITION "{DEFAULT_PARTITION}" DEFAULT'
+            ))
+
+        except SQLAlchemyError:
+            log.exception("db_attach_default_partition_failed")
+            raise
+
+    async def has_unfinished(self, *, name: str) -> bool:
+        """Whether the partition still holds rows the worker may claim."""
+        partition = table(name, column("status"))
+        query = select(
+            exists().where(
+                partition.c.status.in_([
+                    NotificationStatus.PENDING.value,
+                    NotificationStatus.PROCESSING.value
+                ])
+            )
+        )
+        try:
+            result = await self.__session.execute(query)
+            return result.scalar_one()
+
+        except SQLAlchemyError:
+            log.exception("db_partition_unfinished_check_failed", partition=name)
+            raise
+
+    async def detach_partition(self, *, name: str, drop: bool = False):
+        try:
+            await self.__session.execute(text(
+                f'ALTER TABLE "{Notification.__tablename__}" DETACH PARTITION "{name}"'
+            ))
+            if drop:
+                await self.__session.execute(text(f'DROP TABLE "{name}"'))
+
+        except SQLAlchemyError:
+            log.exception("db_detach_partition_failed", partition=name)
+            raise
@@ -0,0 +1,121 @@
+import math
+import uuid
+import structlog
+from datetime import datetime, timezone
+from typing import NamedTuple
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import Float, Integer, String, cast, column, func, update, values
+from sqlalchemy.dialects.postgresql import insert
+
+from app.db.models.rate_limit_bucket import RateLimitBucket
+from app.db.settings import RateLimit
+
+log = structlog.get_logger(__name__)
+
+class Grant(NamedTuple):
+    granted: int
+    tokens: float
+    rate: float
+
+class RateLimitRepository:
+    def __init__(self, *, session: AsyncSession):
+        self.__session = session
+
+    async def acquire(self, *, requests: dict[str, tuple[int, RateLimit]]) -> dict[str, Grant]:
+        """Takes up to the requested number of tokens from every bucket in a
+        single upsert. Buckets are refilled from their elapsed time first, and
+        a bucket with too few tokens grants what it has.
+
+        Rows are upserted in key order, so two batches sharing buckets lock
+        them in the same order and cannot deadlock."""
+        if not requests:
+            return {}
+
+        now = datetime.now(timezone.utc)
+        rows = [
+            {
+                "id": uuid.uuid4(),
+                "key": key,
+                "capacity": limit.burst,
+                "rate": limit.rate,
+                "granted": min(requested, math.floor(limit.burst)),
+                "tokens": limit.burst - min(requested, math.floor(limit.burst)),
+                "updated_at": now,
+                "created_at": now,
+            }
+            for key, (requested, limit) in sorted(requests.items())
+        ]
+
+        bucket = RateLimitBucket.__table__
+        query = insert(bucket).values(rows)
+        excluded = query.excluded
+
+        # On conflict EXCLUDED.granted carries the requested count capped at
+        # the burst; every SET expression below sees the bucket as it was
+        # before this statement.
+        refilled = func.least(
+            excluded.capacity,
+            bucket.c.tokens
+            + cast(func.extract("epoch", func.now() - bucket.c.updated_at), Float) * excluded.rate
+        )
+        granted = func.least(excluded.granted, func.floor(refilled))
+
+        query = query.on_conflict_do_update(
+            index_elements=[bucket.c.key],
+            set_={
+                "tokens": refilled - granted,
+                "granted": granted,
+                "capacity": excluded.capacity,
+                "rate": excluded.rate,
+                "updated_at": func.now(),
+            }
+        ).returning(bucket.c.key, bucket.c.granted, bucket.c.tokens, bucket.c.rate)
+
+        try:
+            result = await self.__session.execute(query)
+            return {
+                row.key: Grant(granted=row.granted, tokens=row.tokens, rate=row.rate)
+                for row in result
+            }
+
+        except SQLAlchemyError:
+            log.exception(
+                "db_rate_limit_acquire_failed",
+                keys=list(requests)
+            )
+            raise
+
+    async def refund(self, *, unused: dict[str, int]) -> int:
+        """Puts tokens taken by ``acquire`` but not spent back into their
+        buckets, capped at capacity. Meant for the transaction that acquired
+        them, which still holds the bucket rows locked."""
+        unused = {key: count for key, count in unused.items() if count > 0}
+        if not unused:
+            return 0
+
+        bucket = RateLimitBucket.__table__
+        refunds = (
+            values(
+                column("key", String),
+                column("tokens", Integer),
+                name="refunds"
+            )
+            .data(sorted(unused.items()))
+        )
+        query = (
+            update(bucket)
+            .where(bucket.c.key == refunds.c.key)
+            .values(tokens=func.least(bucket.c.capacity, bucket.c.tokens + refunds.c.tokens))
+        )
+
+        try:
+            result = await self.__session.execute(query)
+            return result.rowcount
+
+        except SQLAlchemyError:
+            log.exception(
+                "db_rate_limit_refund_failed",
+                keys=list(unused)
+            )
+            raise
@@ -1,9 +1,10 @@
 import uuid
 import structlog
-from datetime import datetime
+from datetime import datetime, timedelta
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import func, select, update
+from sqlalchemy import DateTime, any_, bindparam, column, select, update, values
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID
 
 from app.db.models.notification import Notification
 from app.db.models.user import User
@@ -54,18 +55,57 @@ class UserRepository:
             )
             raise
 
-    async def update_last_active(self, *, user_id: uuid.UUID):
+    async def existing_ids(self, *, user_ids: list[uuid.UUID]) -> set[uuid.UUID]:
+        query = (
+            select(User.id)
+            .where(User.id == any_(bindparam("ids", user_ids, type_=ARRAY(PG_UUID(as_uuid=True)))))
+        )
+
+        try:
+            result = await self.__session.execute(query)
+            return set(result.scalars().all())
+
+        except SQLAlchemyError:
+            log.exception(
+                "db_existing_user_ids_failed",
+                count=len(user_ids)
+            )
+            raise
+
+    async def bulk_update_last_active(
+        self,
+        *,
+        seen: dict[uuid.UUID, datetime],
+        threshold: timedelta
+    ) -> int:
+        """Applies all ``seen`` timestamps with one UPDATE ... FROM (VALUES).
+        Rows that would move by less than ``threshold`` are left alone, so
+        they cost neither a new tuple version nor WAL."""
+        batch = (
+            values(
+                column("id", PG_UUID(as_uuid=True)),
+                column("last_active", DateTime(timezone=True)),
+                name="seen"
+            )
+            .data(list(seen.items()))
+        )
         query = (
             update(User)
-            .filter_by(id=user_id)
-            .values(last_active=func.now())
+            .where(
+                User.id == batch.c.id,
+                User.last_active < batch.c.last_active - threshold
+            )
+            .values(last_active=batch.c.last_active)
+            .execution_options(synchronize_session=False)
         )
 
         try:
-            await self.__session.execute(query)
-        
+            result = await self.__session.execute(query)
+            return result.rowcount
+
         except SQLAlchemyError:
             log.exception(
-                "db_update_last_active_failed"
+                "db_bulk_update_last_active_failed",
+                count=len(seen)
             )
             raise
@@ -1,7 +1,21 @@
-from typing import Protocol
+from typing import Protocol, runtime_checkable
 
 from app.db.models.notification import Notification
 
 class SenderProtocol(Protocol):
+    async def startup(self) -> None:
+        ...
+
+    async def shutdown(self) -> None:
+        ...
+
     async def send(self, notification: Notification) -> None:
-        ...
\ No newline at end of file
+        ...
+
+@runtime_checkable
+class BatchSenderProtocol(SenderProtocol, Protocol):
+    async def send_many(self, notifications: list[Notification]) -> list[Exception | None]:
+        """Delivers a batch of notifications of one channel. Returns one entry
+        per notification, in order: ``None`` on success, otherwise the
+        ``TemporaryError``/``FatalError`` for that notification."""
+        ...
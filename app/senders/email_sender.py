@@ -5,6 +5,12 @@ from app.errors.notification_error import FatalError, TemporaryError
 from app.db.models.notification import Notification
 
 class EmailSender:
+    async def startup(self):
+        pass
+
+    async def shutdown(self):
+        pass
+
     async def send(self, notification: Notification):
         try:
             await asyncio.sleep(1)
@@ -12,4 +18,14 @@ class EmailSender:
         except asyncio.TimeoutError:
             raise TemporaryError("SMTP timeout")
         except SMTPRecipientsRefused:
-            raise FatalError("Invalid email")
\ No newline at end of file
+            raise FatalError("Invalid email")
+
+    async def send_many(self, notifications: list[Notification]) -> list[Exception | None]:
+        try:
+            await asyncio.sleep(1)
+        except asyncio.TimeoutError:
+            return [TemporaryError("SMTP timeout")] * len(notifications)
+
+        for notification in notifications:
+            print(f"[EMAIL] {notification.message}")
+        return [None] * len(notifications)
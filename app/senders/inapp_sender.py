@@ -4,6 +4,12 @@ from app.errors.notification_error import FatalError, TemporaryError
 from app.db.models.notification import Notification
 
 class InAppSender:
+    async def startup(self):
+        pass
+
+    async def shutdown(self):
+        pass
+
     async def send(self, notification: Notification):
         try:
             await asyncio.sleep(1)
@@ -11,4 +17,14 @@ class InAppSender:
         except asyncio.TimeoutError:
             raise TemporaryError("sending timeout")
         except Exception:
-            raise FatalError("pass")
\ No newline at end of file
+            raise FatalError("pass")
+
+    async def send_many(self, notifications: list[Notification]) -> list[Exception | None]:
+        try:
+            await asyncio.sleep(1)
+        except asyncio.TimeoutError:
+            return [TemporaryError("sending timeout")] * len(notifications)
+
+        for notification in notifications:
+            print(f"[IN-APP] {notification.message}")
+        return [None] * len(notifications)
@@ -1,11 +1,32 @@
+import asyncio
+import structlog
+
 from app.db.models.enums import NotificationChannel
+from app.senders.base import SenderProtocol
 from app.senders.email_sender import EmailSender
 from app.senders.inapp_sender import InAppSender
 from app.senders.telegram_sender import TelegramSender
 
+log = structlog.get_logger(__name__)
+
+SENDERS: dict[NotificationChannel, SenderProtocol] = {
+    NotificationChannel.IN_APP: InAppSender(),
+    NotificationChannel.TELEGRAM: TelegramSender(),
+    NotificationChannel.EMAIL: EmailSender(),
+}
+
+async def start_senders(senders: dict[NotificationChannel, SenderProtocol] = SENDERS):
+    await asyncio.gather(*(sender.startup() for sender in senders.values()))
+    log.info("senders_started", channels=[channel.value for channel in senders])
+
+async def stop_senders(senders: dict[NotificationChannel, SenderProtocol] = SENDERS):
+    results = await asyncio.gather(
+        *(sender.shutdown() for sender in senders.values()),
+        return_exceptions=True
+    )
+
+    for channel, result in zip(senders, results):
+        if isinstance(result, Exception):
+            log.error("sender_shutdown_failed", channel=channel, error=str(result))
 
-SENDERS = {
-    NotificationChannel.IN_APP: InAppSender,
-    NotificationChannel.TELEGRAM: TelegramSender,
-    NotificationChannel.EMAIL: EmailSender,
-}
\ No newline at end of file
+    log.info("senders_stopped")
@@ -1,8 +1,45 @@
-import asyncio
+import httpx
+import structlog
 
 from app.db.models.notification import Notification
+from app.db.settings import settings
+from app.errors.notification_error import TemporaryError
+
+log = structlog.get_logger(__name__)
 
 class TelegramSender:
+    API_URL = "https://api.telegram.org"
+
+    def __init__(self, *, max_connections: int = settings.TELEGRAM_MAX_CONNECTIONS):
+        self.__max_connections = max_connections
+        self.__client: httpx.AsyncClient | None = None
+
+    async def startup(self):
+        # One keep-alive pool per worker process: TLS handshakes with the
+        # Bot API are paid when a connection is first opened, not per message.
+        self.__client = httpx.AsyncClient(
+            base_url=f"{self.API_URL}/bot{settings.TELEGRAM_BOT_TOKEN}",
+            limits=httpx.Limits(
+                max_connections=self.__max_connections,
+                max_keepalive_connections=self.__max_connections
+            ),
+            timeout=httpx.Timeout(10)
+        )
+
+    async def shutdown(self):
+        if self.__client is not None:
+            await self.__client.aclose()
+            self.__client = None
+
     async def send(self, notification: Notification):
-        await asyncio.sleep(1)
-        print(f"[TG] Send to user {notification.user_id}: {notification.message}")
\ No newline at end of file
+        if self.__client is None:
+            raise TemporaryError("telegram sender is not started")
+
+        # Still a stub: users have no Telegram chat id yet, and the internal
+        # user id is not one. Posting to sendMessage through the pool waits
+        # for that recipient mapping.
+        log.info(
+            "telegram_send_stubbed",
+            notification_id=notification.id,
+            user_id=notification.user_id
+        )
@@ -0,0 +1,64 @@
+import asyncio
+import uuid
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timezone
+import structlog
+
+log = structlog.get_logger(__name__)
+
+WriteActivity = Callable[[dict[uuid.UUID, datetime]], Awaitable[int]]
+
+class ActivityTracker:
+    """Coalesces ``last_active`` bumps in memory. Each user keeps only its
+    latest timestamp until the next flush writes the whole map at once.
+    Bumps not yet flushed are lost if the process dies; ``last_active``
+    only feeds the broadcast audience, which tolerates that."""
+
+    def __init__(self):
+        self.__seen: dict[uuid.UUID, datetime] = {}
+
+    def record(self, user_id: uuid.UUID, at: datetime | None = None):
+        at = at or datetime.now(timezone.utc)
+        previous = self.__seen.get(user_id)
+
+        if previous is None or at > previous:
+            self.__seen[user_id] = at
+
+    @property
+    def pending(self) -> int:
+        return len(self.__seen)
+
+    async def flush(self, *, write: WriteActivity) -> int:
+        if not self.__seen:
+            return 0
+
+        seen, self.__seen = self.__seen, {}
+
+        try:
+            updated = await write(seen)
+
+        except BaseException:
+            # Put the batch back so the next flush retries it; this includes
+            # a flush cancelled at shutdown, which is retried right after.
+            for user_id, at in seen.items():
+                self.record(user_id, at)
+            raise
+
+        log.info(
+            "last_active_flushed",
+            users=len(seen),
+            updated=updated
+        )
+        return updated
+
+    async def run(self, *, write: WriteActivity, interval: float):
+        while True:
+            await asyncio.sleep(interval)
+
+            try:
+                await self.flush(write=write)
+
+            except Exception:
+                log.exception("last_active_flush_failed", pending=self.pending)
+
+ACTIVITY = ActivityTracker()
@@ -0,0 +1,108 @@
+import time
+from enum import Enum
+import structlog
+
+from app.db.models.enums import NotificationChannel
+from app.db.settings import BreakerPolicy, settings
+
+log = structlog.get_logger(__name__)
+
+class BreakerState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+class CircuitBreaker:
+    """Per-process breaker for one channel. Opens after ``failure_threshold``
+    consecutive temporary failures, lets ``half_open_max_calls`` probes
+    through once ``recovery_timeout`` has passed, and closes again on the
+    first successful probe."""
+
+    def __init__(self, *, name: str, policy: BreakerPolicy):
+        self.__name = name
+        self.__policy = policy
+        self.__state = BreakerState.CLOSED
+        self.__failures = 0
+        self.__opened_at = 0.0
+        self.__probes = 0
+
+    @property
+    def state(self) -> BreakerState:
+        if (
+            self.__state == BreakerState.OPEN
+            and time.monotonic() - self.__opened_at >= self.__policy.recovery_timeout
+        ):
+            self._move(BreakerState.HALF_OPEN)
+        return self.__state
+
+    @property
+    def retry_in(self) -> float:
+        if self.state != BreakerState.OPEN:
+            return 0
+        return max(self.__opened_at + self.__policy.recovery_timeout - time.monotonic(), 0)
+
+    def available(self) -> bool:
+        """Whether a call would currently be let through, without taking a
+        half-open probe slot."""
+        state = self.state
+        return state == BreakerState.CLOSED or (
+            state == BreakerState.HALF_OPEN
+            and self.__probes < self.__policy.half_open_max_calls
+        )
+
+    def allow(self) -> bool:
+        state = self.state
+
+        if state == BreakerState.CLOSED:
+            return True
+
+        if state == BreakerState.HALF_OPEN and self.__probes < self.__policy.half_open_max_calls:
+            self.__probes += 1
+            return True
+
+        return False
+
+    def record_success(self):
+        self.__failures = 0
+        if self.__state != BreakerState.CLOSED:
+            self._move(BreakerState.CLOSED)
+
+    def record_failure(self):
+        if self.__state == BreakerState.OPEN:
+            # Late result from a call that started before the breaker opened.
+            return
+
+        self.__failures += 1
+
+        if (
+            self.__state == BreakerState.HALF_OPEN
+            or self.__failures >= self.__policy.failure_threshold
+        ):
+            self._move(BreakerState.OPEN)
+
+    def _move(self, state: BreakerState):
+        log.warning(
+            "circuit_breaker_state_changed",
+            breaker=self.__name,
+            previous=self.__state,
+            state=state,
+            failures=self.__failures
+        )
+        self.__state = state
+        self.__probes = 0
+
+        if state == BreakerState.OPEN:
+            self.__opened_at = time.monotonic()
+        elif state == BreakerState.CLOSED:
+            self.__failures = 0
+
+def create_breakers() -> dict[NotificationChannel, CircuitBreaker]:
+    return {
+        channel: CircuitBreaker(
+            name=channel.value,
+            policy=settings.CHANNEL_BREAKERS.get(channel) or BreakerPolicy()
+        )
+        for channel in NotificationChannel
+    }
+
+BREAKERS = create_breakers()
@@ -0,0 +1,132 @@
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from typing import NamedTuple
+import structlog
+
+from app.db.settings import settings
+from app.errors.event_error import EventBufferFullError
+from app.services.event_service import EventResult, SystemEvent
+
+log = structlog.get_logger(__name__)
+
+FlushEvents = Callable[[list[SystemEvent]], Awaitable[list[EventResult]]]
+
+class BufferedEvent(NamedTuple):
+    event: SystemEvent
+    done: asyncio.Future[EventResult] | None
+
+class EventBuffer:
+    """Group commit for system events. Requests append to a bounded queue;
+    one flusher takes up to ``flush_size`` events, or whatever arrived
+    within ``flush_interval`` of the first one, and commits them in a
+    single transaction.
+
+    With ``wait_for_commit`` a request is answered only after its group
+    committed; without it, events still in the buffer are lost if the
+    process dies."""
+
+    def __init__(
+            self,
+            *,
+            maxsize: int,
+            flush_size: int,
+            flush_interval: float,
+            put_timeout: float,
+            wait_for_commit: bool
+        ):
+        self.__queue: asyncio.Queue[BufferedEvent] = asyncio.Queue(maxsize=maxsize)
+        self.__flush_size = flush_size
+        self.__flush_interval = flush_interval
+        self.__put_timeout = put_timeout
+        self.__wait_for_commit = wait_for_commit
+
+    async def submit(self, event: SystemEvent) -> EventResult | None:
+        done = asyncio.get_running_loop().create_future() if self.__wait_for_commit else None
+
+        try:
+            await asyncio.wait_for(
+                self.__queue.put(BufferedEvent(event, done)),
+                self.__put_timeout
+            )
+
+        except TimeoutError:
+            log.warning(
+                "event_buffer_full",
+                size=self.__queue.qsize()
+            )
+            raise EventBufferFullError("event buffer is full")
+
+        return await done if done is not None else None
+
+    async def run(self, *, flush: FlushEvents):
+        loop = asyncio.get_running_loop()
+
+        while True:
+            batch = [await self.__queue.get()]
+            deadline = loop.time() + self.__flush_interval
+
+            while len(batch) < self.__flush_size:
+                try:
+                    batch.append(self.__queue.get_nowait())
+                    continue
+
+                except asyncio.QueueEmpty:
+                    pass
+
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+
+                try:
+                    batch.append(await asyncio.wait_for(self.__queue.get(), timeout))
+
+                except TimeoutError:
+                    break
+
+            await self._flush(batch, flush)
+
+    async def drain(self):
+        """Waits until every buffered event has been flushed."""
+        await self.__queue.join()
+
+    async def _flush(self, batch: list[BufferedEvent], flush: FlushEvents):
+        started = time.monotonic()
+
+        try:
+            results = await flush([b.event for b in batch])
+
+        except Exception as e:
+            log.exception(
+                "event_buffer_flush_failed",
+                batch_size=len(batch)
+            )
+            for b in batch:
+                if b.done is not None and not b.done.done():
+                    b.done.set_exception(e)
+
+        else:
+            for b, result in zip(batch, results):
+                if b.done is not None and not b.done.done():
+                    b.done.set_result(result)
+
+            log.info(
+                "event_buffer_flushed",
+                batch_size=len(batch),
+                seconds=round(time.monotonic() - started, 4)
+            )
+
+        finally:
+            for _ in batch:
+                self.__queue.task_done()
+
+def create_event_buffer() -> EventBuffer:
+    return EventBuffer(
+        maxsize=settings.EVENT_BUFFER_SIZE,
+        flush_size=settings.EVENT_FLUSH_SIZE,
+        flush_interval=settings.EVENT_FLUSH_INTERVAL,
+        put_timeout=settings.EVENT_BUFFER_PUT_TIMEOUT,
+        wait_for_commit=settings.EVENT_DURABILITY == "committed"
+    )
+
+EVENT_BUFFER = create_event_buffer()
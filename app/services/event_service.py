@@ -1,29 +1,51 @@
 import uuid
 import structlog
+from typing import NamedTuple
 
-from app.db.models.enums import EventCategory, EventType, NotificationChannel
-from app.services.notification_service import NotificationService
+from app.db.models.enums import EventCategory, EventType, NotificationChannel, NotificationPriority
+from app.errors.event_error import DuplicateEventError
+from app.errors.template_error import TemplateError, TemplateNotFoundError
+from app.notification_templates.engine import TemplateEngine
+from app.services.idempotency_service import IdempotencyService
+from app.services.notification_service import NotificationDraft, NotificationService
 from app.notification_templates.registry import notification_templates
 from app.services.user_service import UserService
 
 log = structlog.get_logger(__name__)
 
+class SystemEvent(NamedTuple):
+    type: EventType
+    user_id: uuid.UUID
+    payload: dict
+    idempotency_key: str | None = None
+    locale: str | None = None
+
+class EventResult(NamedTuple):
+    notification_id: uuid.UUID | None = None
+    error: str | None = None
+    duplicate: bool = False
+
 class EventService:
     def __init__(
         self,
         *,
         user_service: UserService,
-        notification_service: NotificationService
+        notification_service: NotificationService,
+        idempotency: IdempotencyService | None = None,
+        templates: TemplateEngine | None = None
     ):
         self.__user_service = user_service
         self.__notification_service = notification_service
-        self.__notification_templates = notification_templates
+        self.__idempotency = idempotency
+        self.__templates = templates or notification_templates
 
     async def handle_system_event(
         self, 
         event_type: EventType, 
         user_id: uuid.UUID,
-        payload: dict
+        payload: dict,
+        idempotency_key: str | None = None,
+        locale: str | None = None
     ):
         log.info(
             "system_event_received",
@@ -31,25 +53,41 @@ class EventService:
             user_id=user_id
         )
 
+        if idempotency_key is not None and not await self._claim_keys([idempotency_key]):
+            log.info(
+                "system_event_duplicate",
+                event_type=event_type,
+                user_id=user_id,
+                idempotency_key=idempotency_key
+            )
+            raise DuplicateEventError(idempotency_key)
+
         try:
-            template = self.__notification_templates[event_type]()
+            message = self.__templates.render(event_type, payload, locale)
 
-        except KeyError: 
+        except TemplateNotFoundError:
             log.error(
                 "system_event_template_not_found",
                 event_type=event_type
             )
             raise
-        
-        try:
-            message = template.render(payload)
 
+        except TemplateError:
+            log.exception(
+                "system_event_render_failed",
+                event_type=event_type,
+                user_id=user_id
+            )
+            raise
+
+        try:
             await self.__user_service.update_last_active(user_id=user_id)
 
             await self.__notification_service.create_notification(
                 user_id=user_id, 
                 message=message, 
-                channel=NotificationChannel.IN_APP
+                channel=NotificationChannel.IN_APP,
+                priority=NotificationPriority.HIGH
             )
             
             log.info(
@@ -67,6 +105,117 @@ class EventService:
             )
             raise
 
+    async def handle_system_events(self, events: list[SystemEvent]) -> list[EventResult]:
+        """Handles a batch of system events with one ``last_active`` update
+        and one notification insert. A bad event fails on its own; the
+        result list is aligned with ``events``."""
+        log.info(
+            "system_events_batch_received",
+            batch_size=len(events)
+        )
+
+        results: list[EventResult | None] = [None] * len(events)
+        groups: dict[tuple[EventType, str | None], list[int]] = {}
+
+        claimed = await self._claim_keys([
+            event.idempotency_key for event in events
+            if event.idempotency_key is not None
+        ])
+
+        for i, event in enumerate(events):
+            if event.idempotency_key is not None:
+                if event.idempotency_key not in claimed:
+                    results[i] = EventResult(duplicate=True)
+                    continue
+                # A key repeated inside the batch only counts once.
+                claimed.discard(event.idempotency_key)
+
+            groups.setdefault((event.type, event.locale), []).append(i)
+
+        rendered: list[tuple[int, SystemEvent, str]] = []
+        for (event_type, locale), indexes in groups.items():
+            try:
+                messages = self.__templates.render_many(
+                    event_type,
+                    [events[i].payload for i in indexes],
+                    locale
+                )
+
+            except TemplateNotFoundError:
+                for i in indexes:
+                    results[i] = EventResult(error="template not found")
+                continue
+
+            for i, message in zip(indexes, messages):
+                if isinstance(message, TemplateError):
+                    results[i] = EventResult(error=f"render failed: {message}")
+                else:
+                    rendered.append((i, events[i], message))
+
+        rendered.sort(key=lambda r: r[0])
+
+        try:
+            known_users = await self.__user_service.touch_many(
+                user_ids=[event.user_id for _, event, _ in rendered]
+            )
+
+            accepted = []
+            for i, event, message in rendered:
+                if event.user_id in known_users:
+                    accepted.append((i, event, message))
+                else:
+                    results[i] = EventResult(error="user not found")
+
+            # A failed event must stay retryable under its key.
+            await self._release_keys([
+                event.idempotency_key
+                for event, result in zip(events, results)
+                if event.idempotency_key is not None
+                and result is not None and result.error is not None
+            ])
+
+            notifications = await self.__notification_service.create_notifications(
+                drafts=[
+                    NotificationDraft(
+                        user_id=event.user_id,
+                        message=message,
+                        channel=NotificationChannel.IN_APP,
+                        priority=NotificationPriority.HIGH
+                    )
+                    for _, event, message in accepted
+                ]
+            ) if accepted else []
+
+        except Exception:
+            log.exception(
+                "system_events_batch_failed",
+                batch_size=len(events)
+            )
+            raise
+
+        for (i, _, _), notification in zip(accepted, notifications):
+            results[i] = EventResult(notification_id=notification.id)
+
+        log.info(
+            "system_events_batch_handled",
+            batch_size=len(events),
+            created=len(notifications)
+        )
+        return results
+
+    async def _claim_keys(self, keys: list[str]) -> set[str]:
+        if not keys:
+            return set()
+
+        if self.__idempotency is None:
+            return set(keys)
+
+        return await self.__idempotency.claim(keys=keys)
+
+    async def _release_keys(self, keys: list[str]):
+        if keys and self.__idempotency is not None:
+            await self.__idempotency.release(keys=keys)
+
     async def handle_custom_event(self, user_id: uuid.UUID, title: str, message: str, category: EventCategory):
         log.info(
             "customm_event_received",
@@ -82,7 +231,8 @@ class EventService:
                 title=title,
                 message=message,
                 channel=NotificationChannel.IN_APP,
-                category=category
+                category=category,
+                priority=NotificationPriority.LOW
             )
             
             log.info(
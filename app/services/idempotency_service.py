@@ -0,0 +1,81 @@
+from collections import OrderedDict
+import structlog
+
+from app.db.settings import settings
+from app.repositories.event_key_repository import EventKeyRepository
+
+log = structlog.get_logger(__name__)
+
+class RecentKeys:
+    """Bounded LRU of idempotency keys this process has seen committed."""
+
+    def __init__(self, *, maxsize: int):
+        self.__maxsize = maxsize
+        self.__keys: OrderedDict[str, None] = OrderedDict()
+
+    def __contains__(self, key: str) -> bool:
+        if key not in self.__keys:
+            return False
+
+        self.__keys.move_to_end(key)
+        return True
+
+    def add(self, key: str):
+        self.__keys[key] = None
+        self.__keys.move_to_end(key)
+
+        while len(self.__keys) > self.__maxsize:
+            self.__keys.popitem(last=False)
+
+RECENT_KEYS = RecentKeys(maxsize=settings.IDEMPOTENCY_CACHE_SIZE)
+
+class IdempotencyService:
+    def __init__(
+            self,
+            *,
+            event_key_repo: EventKeyRepository,
+            recent: RecentKeys | None = None
+        ):
+        self.__repo = event_key_repo
+        self.__recent = recent or RECENT_KEYS
+        self.__claimed: set[str] = set()
+
+    async def claim(self, *, keys: list[str]) -> set[str]:
+        """Returns the keys seen for the first time. Keys already in the
+        local LRU are rejected without a query; the rest are claimed in
+        Postgres within the caller's transaction, and reach the LRU only
+        once it commits, so a rolled-back request can be retried."""
+        fresh = [key for key in dict.fromkeys(keys) if key not in self.__recent]
+        if not fresh:
+            log.info("event_keys_duplicate_cached", count=len(keys))
+            return set()
+
+        claimed = await self.__repo.claim(keys=fresh)
+
+        # A conflict means another transaction committed the key.
+        for key in fresh:
+            if key not in claimed:
+                self.__recent.add(key)
+
+        if claimed:
+            self.__claimed |= claimed
+            self.__repo.after_commit(lambda: self._remember(claimed))
+
+        return claimed
+
+    async def release(self, *, keys: list[str]):
+        """Gives back keys claimed in the current transaction whose events
+        were not handled after all."""
+        keys = [key for key in dict.fromkeys(keys) if key in self.__claimed]
+        if not keys:
+            return
+
+        await self.__repo.release(keys=keys)
+        self.__claimed.difference_update(keys)
+
+        log.info("event_keys_released", count=len(keys))
+
+    def _remember(self, keys: set[str]):
+        for key in keys & self.__claimed:
+            self.__recent.add(key)
+        self.__claimed -= keys
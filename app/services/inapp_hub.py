@@ -0,0 +1,50 @@
+import asyncio
+import uuid
+from collections import defaultdict
+import structlog
+
+from app.db.models.notification import Notification
+
+log = structlog.get_logger(__name__)
+
+class InAppHub:
+    """Hands IN_APP notifications committed by this process straight to the
+    SSE streams open in this process. Streams in other processes, and any
+    push that is dropped here, still pick the row up from the inbox poll."""
+
+    def __init__(self, *, queue_size: int = 100):
+        self.__queue_size = queue_size
+        self.__subscribers: defaultdict[uuid.UUID, set[asyncio.Queue[Notification]]] = defaultdict(set)
+
+    def subscribe(self, user_id: uuid.UUID) -> asyncio.Queue[Notification]:
+        queue: asyncio.Queue[Notification] = asyncio.Queue(maxsize=self.__queue_size)
+        self.__subscribers[user_id].add(queue)
+        return queue
+
+    def unsubscribe(self, user_id: uuid.UUID, queue: asyncio.Queue[Notification]):
+        queues = self.__subscribers.get(user_id)
+        if queues is None:
+            return
+
+        queues.discard(queue)
+        if not queues:
+            del self.__subscribers[user_id]
+
+    def publish(self, notification: Notification) -> int:
+        delivered = 0
+
+        for queue in self.__subscribers.get(notification.user_id, ()):
+            try:
+                queue.put_nowait(notification)
+                delivered += 1
+
+            except asyncio.QueueFull:
+                log.warning(
+                    "inapp_push_dropped",
+                    notification_id=notification.id,
+                    user_id=notification.user_id
+                )
+
+        return delivered
+
+INAPP_HUB = InAppHub()
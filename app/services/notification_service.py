@@ -1,4 +1,5 @@
-from collections.abc import Callable
+import asyncio
+from typing import NamedTuple
 import uuid
 import structlog
 import json
@@ -6,135 +7,536 @@ from datetime import timezone, datetime, timedelta
 
 from app.errors.notification_error import FatalError, NotificationError, TemporaryError
 from app.errors.user_error import UserError
-from app.senders.base import SenderProtocol
+from app.senders.base import BatchSenderProtocol, SenderProtocol
 from app.senders.registry import SENDERS
+from app.services.circuit_breaker import BREAKERS, CircuitBreaker
+from app.services.inapp_hub import INAPP_HUB, InAppHub
+from app.repositories.campaign_repository import CampaignRepository
 from app.repositories.notification_repository import NotificationRepository
-from app.db.models.enums import EventCategory, NotificationChannel, NotificationStatus
+from app.db.models.enums import EventCategory, NotificationChannel, NotificationPriority, NotificationStatus
+from app.db.models.campaign import Campaign
 from app.db.models.notification import Notification
+from app.db.settings import BackoffPolicy, settings
+from app.notification_templates.registry import DIGEST_TEMPLATE, notification_templates
 from app.services.user_service import UserService
 
 log = structlog.get_logger(__name__)
 
-SenderFactory = Callable[[], SenderProtocol]
+class DeliveryOutcome(NamedTuple):
+    notification: Notification
+    status: NotificationStatus
+    next_attempt_at: datetime | None = None
+    reason: str | None = None
+    spend_attempt: bool = True
+
+class NotificationDraft(NamedTuple):
+    user_id: uuid.UUID
+    message: str
+    channel: NotificationChannel
+    title: str | None = None
+    priority: NotificationPriority = NotificationPriority.HIGH
 
 class NotificationService:
     MAX_ATTEMPTS = 5
-    DELAY = 3
 
     def __init__(
             self, 
             *, 
             notification_repo: NotificationRepository,
             user_service: UserService,
-            senders: dict[NotificationChannel, SenderFactory] | None = None,
+            senders: dict[NotificationChannel, SenderProtocol] | None = None,
+            backoff: dict[NotificationChannel, BackoffPolicy] | None = None,
+            breakers: dict[NotificationChannel, CircuitBreaker] | None = None,
+            send_timeouts: dict[NotificationChannel, float] | None = None,
+            low_priority_share: float | None = None,
+            inapp_hub: InAppHub | None = None,
+            inapp_fast_path: bool | None = None,
+            campaign_repo: CampaignRepository | None = None,
+            digest_windows: dict[NotificationChannel, float] | None = None,
         ):
         self.__repo = notification_repo
+        self.__campaign_repo = campaign_repo
         self.__user_service = user_service
         self.__senders = senders or SENDERS
-
-    async def process_sending(self, *, notification: Notification):
-        attempts = notification.attempts + 1
-
-        next_attempt_at = datetime.now(timezone.utc) + timedelta(seconds=self.DELAY)
-
-        await self.__repo.update_attempts(
-            notification_id=notification.id, 
-            new_attempts=attempts,
-            next_attempt_at=next_attempt_at
+        self.__backoff = backoff or settings.CHANNEL_BACKOFF
+        self.__breakers = breakers or BREAKERS
+        self.__send_timeouts = send_timeouts or settings.CHANNEL_SEND_TIMEOUT
+        self.__digest_windows = settings.DIGEST_WINDOW if digest_windows is None else digest_windows
+        self.__inapp_hub = inapp_hub or INAPP_HUB
+        self.__inapp_fast_path = (
+            settings.INAPP_FAST_PATH if inapp_fast_path is None else inapp_fast_path
+        )
+        self.__low_priority_share = (
+            settings.LOW_PRIORITY_MIN_SHARE if low_priority_share is None else low_priority_share
         )
 
+    def _next_attempt_at(
+            self,
+            *,
+            channel: NotificationChannel,
+            attempts: int,
+            retry_after: int | None = None
+        ) -> datetime:
+        policy = self.__backoff.get(channel) or BackoffPolicy()
+        delay = policy.delay(attempts)
+
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+
+        return datetime.now(timezone.utc) + timedelta(seconds=delay)
+
+    async def deliver(self, *, notification: Notification) -> DeliveryOutcome:
+        """Sends one claimed notification and decides where it goes next,
+        without touching the database; see ``record_outcomes``."""
+        sender = self.__senders[notification.channel]
+        breaker = self.__breakers[notification.channel]
+
+        if not breaker.allow():
+            return self.defer(
+                notification=notification,
+                delay=max(breaker.retry_in, 1),
+                reason="circuit open"
+            )
+
         log.info(
-            "notification_sending_attempt",
+            "notification_sending",
             notification_id=notification.id,
-            attempt=attempts,
+            attempt=notification.attempts + 1,
             channel=notification.channel
         )
 
-        sender = self.__senders[notification.channel]()
+        try:
+            await self._send(sender, notification)
+            error = None
+
+        except Exception as e:
+            error = e
+
+        except BaseException:
+            breaker.record_failure()
+            raise
 
+        self._record_breaker(breaker, [error])
+        return self._outcome(notification=notification, error=error)
+
+    async def _send(self, sender: SenderProtocol, notification: Notification):
         try:
-            log.info(
-                "notification_sending",
-                notification_id=notification.id
-            )
-            await sender.send(notification)
-            await self.mark_as_sent(notification_id=notification.id)
+            async with asyncio.timeout(self.__send_timeouts.get(notification.channel)):
+                await sender.send(notification)
+
+        except TimeoutError:
+            raise TemporaryError("send deadline exceeded")
+
+    def _record_breaker(self, breaker: CircuitBreaker, errors: list[Exception | None]):
+        # A FatalError means the provider answered and rejected one message;
+        # only unanswered or temporarily failed calls count against it.
+        if all(
+            error is not None and not isinstance(error, FatalError)
+            for error in errors
+        ):
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+
+    def channel_retry_in(self, *, channel: NotificationChannel) -> float:
+        """Seconds until the channel's breaker lets calls through again;
+        0 when it is closed or probing."""
+        breaker = self.__breakers[channel]
+        return 0 if breaker.available() else max(breaker.retry_in, 1)
+
+    def defer(self, *, notification: Notification, delay: float, reason: str) -> DeliveryOutcome:
+        """An outcome that returns the notification to the queue without
+        sending it and without spending one of its attempts."""
+        return DeliveryOutcome(
+            notification,
+            NotificationStatus.PENDING,
+            next_attempt_at=datetime.now(timezone.utc) + timedelta(seconds=delay),
+            reason=reason,
+            spend_attempt=False
+        )
+
+    def sends_in_batches(self, *, channel: NotificationChannel) -> bool:
+        return isinstance(self.__senders[channel], BatchSenderProtocol)
+
+    async def deliver_many(self, *, notifications: list[Notification]) -> list[DeliveryOutcome]:
+        """Same as ``deliver`` for a single-channel batch, handed to the
+        sender's ``send_many`` in one call."""
+        if not notifications:
+            return []
 
-        except TemporaryError as e:
-            await self._handle_retry(
-                notification=notification, 
-                attempts=attempts, 
-                error=e
+        channel = notifications[0].channel
+        sender = self.__senders[channel]
+        breaker = self.__breakers[channel]
+
+        if not breaker.allow():
+            return [
+                self.defer(notification=n, delay=max(breaker.retry_in, 1), reason="circuit open")
+                for n in notifications
+            ]
+
+        log.info(
+            "notification_sending_batch",
+            channel=channel,
+            batch_size=len(notifications)
+        )
+
+        try:
+            async with asyncio.timeout(self.__send_timeouts.get(channel)):
+                errors = await sender.send_many(notifications)
+
+        except TimeoutError:
+            errors = [TemporaryError("send deadline exceeded")] * len(notifications)
+
+        except Exception as e:
+            errors = [e] * len(notifications)
+
+        except BaseException:
+            breaker.record_failure()
+            raise
+
+        if len(errors) != len(notifications):
+            log.error(
+                "notification_send_many_result_mismatch",
+                channel=channel,
+                expected=len(notifications),
+                received=len(errors)
             )
-            
-        except FatalError as e:
-            await self._handle_failure(
-                notification=notification, 
-                attempts=attempts, 
-                error=e
-            )
-
-    async def _handle_retry(
-            self, *, 
-            notification: Notification, 
-            attempts: int, 
-            error: Exception
-        ):
-        if attempts >= self.MAX_ATTEMPTS:
-            await self.mark_as_failed(notification_id=notification.id)
+            errors = [TemporaryError("sender returned no result for this notification")] * len(notifications)
+
+        self._record_breaker(breaker, errors)
+
+        return [
+            self._outcome(notification=n, error=error)
+            for n, error in zip(notifications, errors)
+        ]
+
+    def _outcome(
+            self,
+            *,
+            notification: Notification,
+            error: Exception | None = None
+        ) -> DeliveryOutcome:
+        attempts = notification.attempts + 1
 
+        if error is None:
+            return DeliveryOutcome(notification, NotificationStatus.SENT)
+
+        if isinstance(error, FatalError):
+            return DeliveryOutcome(notification, NotificationStatus.FAILED, reason=str(error))
+
+        if not isinstance(error, TemporaryError):
             log.error(
-                "notification_failed_max_attempts",
+                "notification_sender_unexpected_error",
                 notification_id=notification.id,
-                attempts=attempts
+                channel=notification.channel,
+                error=repr(error)
             )
-            return
-        
-        await self.mark_as_pending(notification_id=notification.id)
 
-        log.warning(
-            "notification_retry_scheduled",
-            notification_id=notification.id,
-            attempt=attempts,
+        if attempts >= self.MAX_ATTEMPTS:
+            return DeliveryOutcome(notification, NotificationStatus.FAILED, reason=str(error))
+
+        return DeliveryOutcome(
+            notification,
+            NotificationStatus.PENDING,
+            next_attempt_at=self._next_attempt_at(
+                channel=notification.channel,
+                attempts=attempts,
+                retry_after=getattr(error, "retry_after", None)
+            ),
             reason=str(error)
         )
 
-    async def _handle_failure(
-        self,
-        notification: Notification,
-        attempts: int,
-        error: Exception,
-    ):
-        await self.mark_as_failed(notification_id=notification.id)
+    async def record_outcomes(
+            self,
+            *,
+            outcomes: list[DeliveryOutcome],
+            lease_owner: uuid.UUID | None = None
+        ):
+        """Writes a dispatched batch back with one UPDATE per target status
+        (deferred notifications, which keep their attempt, get their own).
+        Rows whose lease was lost to the reaper in the meantime are skipped."""
+        by_status: dict[tuple[NotificationStatus, bool], list[DeliveryOutcome]] = {}
+        for outcome in outcomes:
+            by_status.setdefault((outcome.status, outcome.spend_attempt), []).append(outcome)
+
+        for (status, spend_attempt), group in by_status.items():
+            ids = [o.notification.id for o in group]
+
+            updated = await self.__repo.bulk_transition(
+                ids=ids,
+                status=status,
+                next_attempt_at=(
+                    [o.next_attempt_at for o in group]
+                    if status == NotificationStatus.PENDING else None
+                ),
+                lease_owner=lease_owner,
+                count_attempt=spend_attempt
+            )
 
-        log.error(
-            "notification_failed",
-            notification_id=notification.id,
-            channel=notification.channel,
-            attempts=attempts,
-            reason=str(error),
-        )
+            if len(updated) != len(ids):
+                updated_ids = set(updated)
+                log.warning(
+                    "notification_outcomes_skipped",
+                    status=status,
+                    skipped=[i for i in ids if i not in updated_ids]
+                )
+
+            for o in group:
+                if status == NotificationStatus.FAILED:
+                    log.error(
+                        "notification_failed",
+                        notification_id=o.notification.id,
+                        channel=o.notification.channel,
+                        attempts=o.notification.attempts + 1,
+                        reason=o.reason
+                    )
+                elif not spend_attempt:
+                    log.info(
+                        "notification_deferred",
+                        notification_id=o.notification.id,
+                        next_attempt_at=o.next_attempt_at,
+                        reason=o.reason
+                    )
+                elif status == NotificationStatus.PENDING:
+                    log.warning(
+                        "notification_retry_scheduled",
+                        notification_id=o.notification.id,
+                        attempt=o.notification.attempts + 1,
+                        reason=o.reason
+                    )
+
+            log.info(
+                "notification_outcomes_recorded",
+                status=status,
+                count=len(updated)
+            )
 
-    async def get_processing(self, *, limit: int = 10) -> list[Notification]:
+    async def get_processing(
+            self,
+            *,
+            channel: NotificationChannel | None = None,
+            limit: int = 10,
+            lease_owner: uuid.UUID | None = None
+        ) -> list[Notification]:
         try:
-            notifications = await self.__repo.get_pending(limit=limit)
+            notifications = await self._claim_by_priority(
+                channel=channel,
+                limit=limit,
+                lease_owner=lease_owner
+            )
 
             for n in notifications:
                 log.info(
                     "notification_get_processing",
                     notification_id=n.id
                 )
-                await self.mark_as_processing(notification_id=n.id)
         
             return notifications
         
         except NotificationError:
             log.exception(
                 "notification_get_processing_failed",
+                channel=channel
             )
             raise
 
+    async def _claim_by_priority(
+            self,
+            *,
+            channel: NotificationChannel | None,
+            limit: int,
+            lease_owner: uuid.UUID | None
+        ) -> list[Notification]:
+        # High priority fills the batch first, but a broadcast backlog must
+        # not starve forever: low priority always gets its reserved share
+        # and any room high priority leaves unused.
+        reserved = min(max(round(limit * self.__low_priority_share), 1), limit)
+
+        high = await self.__repo.claim_pending(
+            channel=channel,
+            priority=NotificationPriority.HIGH,
+            limit=limit - reserved,
+            lease_owner=lease_owner
+        ) if limit > reserved else []
+
+        low = await self.__repo.claim_pending(
+            channel=channel,
+            priority=NotificationPriority.LOW,
+            limit=limit - len(high),
+            lease_owner=lease_owner
+        )
+
+        if len(high) == limit - reserved and len(high) + len(low) < limit:
+            high += await self.__repo.claim_pending(
+                channel=channel,
+                priority=NotificationPriority.HIGH,
+                limit=limit - len(high) - len(low),
+                lease_owner=lease_owner
+            )
+
+        return high + low
+
+    async def coalesce(
+            self,
+            *,
+            notifications: list[Notification],
+            lease_owner: uuid.UUID
+        ) -> list[Notification]:
+        """Merges claimed notifications for the same user and channel that
+        were created within the channel's digest window into one digest,
+        leased to ``lease_owner`` like the rest of the batch. The originals
+        become DIGESTED and link to it. Returns what should be sent: the
+        untouched notifications and the digests, in claim order.
+
+        Must run in the transaction that claimed ``notifications``, so the
+        originals are still locked. Only first attempts are merged; a row
+        that was already tried, or is itself a digest, is sent as it is."""
+        groups: dict[tuple[uuid.UUID, NotificationChannel], list[Notification]] = {}
+        for n in notifications:
+            if n.channel in self.__digest_windows and n.attempts == 0 and n.digest_size is None:
+                groups.setdefault((n.user_id, n.channel), []).append(n)
+
+        chunks = {
+            uuid.uuid4(): chunk
+            for group in groups.values()
+            for chunk in self._digest_chunks(group)
+        }
+        if not chunks:
+            return notifications
+
+        # Link first and build each digest from the originals actually
+        # linked: a row missing here is no longer leased to us and must not
+        # be sent by this worker, on its own or inside a digest.
+        digest_of = {n.id: digest_id for digest_id, chunk in chunks.items() for n in chunk}
+        linked = set(await self.__repo.link_to_digest(
+            ids=list(digest_of),
+            digest_ids=list(digest_of.values()),
+            lease_owner=lease_owner
+        ))
+
+        if len(linked) != len(digest_of):
+            log.warning(
+                "notification_digest_links_skipped",
+                skipped=[i for i in digest_of if i not in linked]
+            )
+
+        digests = {
+            digest_id: self._new_digest(digest_id, members, lease_owner)
+            for digest_id, chunk in chunks.items()
+            if (members := [n for n in chunk if n.id in linked])
+        }
+        await self.__repo.bulk_create(notifications=list(digests.values()))
+
+        log.info(
+            "notifications_digested",
+            digests=len(digests),
+            merged=len(linked)
+        )
+
+        result: dict[uuid.UUID, Notification] = {}
+        for n in notifications:
+            if n.id in digest_of:
+                if n.id not in linked:
+                    continue
+                n = digests[digest_of[n.id]]
+            result.setdefault(n.id, n)
+        return list(result.values())
+
+    def _digest_chunks(self, group: list[Notification]) -> list[list[Notification]]:
+        window = timedelta(seconds=self.__digest_windows[group[0].channel])
+        chunks: list[list[Notification]] = []
+
+        for n in sorted(group, key=lambda n: n.created_at):
+            if (
+                not chunks
+                or n.created_at - chunks[-1][0].created_at > window
+                or len(chunks[-1]) >= settings.DIGEST_MAX_SIZE
+            ):
+                chunks.append([])
+            chunks[-1].append(n)
+
+        return [c for c in chunks if len(c) >= settings.DIGEST_MIN_SIZE]
+
+    def _new_digest(
+            self,
+            digest_id: uuid.UUID,
+            chunk: list[Notification],
+            lease_owner: uuid.UUID
+        ) -> Notification:
+        now = datetime.now(timezone.utc)
+
+        return Notification(
+            id=digest_id,
+            created_at=now,
+            user_id=chunk[0].user_id,
+            channel=chunk[0].channel,
+            title=notification_templates.render(DIGEST_TEMPLATE, {"count": len(chunk)}),
+            message="\n".join(
+                f"{n.title}: {n.message}" if n.title else n.message
+                for n in chunk
+            ),
+            priority=(
+                NotificationPriority.HIGH
+                if any(n.priority == NotificationPriority.HIGH for n in chunk)
+                else NotificationPriority.LOW
+            ),
+            status=NotificationStatus.PROCESSING,
+            attempts=0,
+            next_attempt_at=now,
+            updated_at=now,
+            lease_owner=lease_owner,
+            lease_expires_at=now + timedelta(seconds=settings.WORKER_LEASE_SECONDS),
+            digest_size=len(chunk)
+        )
+
+    async def digest_items(self, *, digest_id: uuid.UUID, user_id: uuid.UUID) -> list[Notification]:
+        digest = await self.notification_by_id(notification_id=digest_id, user_id=user_id)
+
+        if digest.digest_size is None:
+            return []
+
+        return await self.__repo.list_digest_items(digest_id=digest.id)
+
+    async def extend_leases(self, *, lease_owner: uuid.UUID) -> int:
+        extended = await self.__repo.extend_leases(lease_owner=lease_owner)
+        log.debug(
+            "notification_leases_extended",
+            lease_owner=lease_owner,
+            count=extended
+        )
+        return extended
+
+    async def reclaim_expired(self, *, limit: int = 1000) -> int:
+        reclaimed = await self.__repo.reclaim_expired(
+            max_attempts=self.MAX_ATTEMPTS,
+            limit=limit
+        )
+
+        if reclaimed:
+            log.warning(
+                "notification_expired_leases_reclaimed",
+                count=reclaimed
+            )
+        return reclaimed
+
+    async def next_due_in(
+            self,
+            *,
+            channel: NotificationChannel | None = None,
+            default: float
+        ) -> float:
+        due = await self.__repo.next_attempt_due(channel=channel)
+
+        if due is None:
+            return default
+
+        delay = (due - datetime.now(timezone.utc)).total_seconds()
+        return min(max(delay, 0), default)
+
     async def mark_as_read(self, *, notification_id: uuid.UUID, user_id: uuid.UUID):
+        if await self._mark_campaign_read(campaign_id=notification_id, user_id=user_id):
+            return
+
         try:
             notification = await self.__repo.get_by_id(id=notification_id)
 
@@ -172,17 +574,19 @@ class NotificationService:
 
     async def mark_as_sent(self, *, notification_id: uuid.UUID):
         try:
-            notification = await self.__repo.get_by_id(id=notification_id)
+            notification = await self.__repo.transition(
+                notification_id=notification_id,
+                expected=NotificationStatus.PROCESSING,
+                status=NotificationStatus.SENT
+            )
 
-            if notification.status != NotificationStatus.PROCESSING:
+            if notification is None:
                 log.warning(
                     "notification_mark_sent_invalid_status",
-                    notification_id=notification_id,
-                    current_status=notification.status
+                    notification_id=notification_id
                 )
                 raise ValueError("Cannot mark a notification that isn't processing")
 
-            await self.__repo.mark_status(notification_id=notification_id, status=NotificationStatus.SENT)
             log.info(
                 "notification_marked_as_sent",
                 notification_id=notification_id
@@ -197,17 +601,19 @@ class NotificationService:
 
     async def mark_as_pending(self, *, notification_id: uuid.UUID):
         try:
-            notification = await self.__repo.get_by_id(id=notification_id)
+            notification = await self.__repo.transition(
+                notification_id=notification_id,
+                expected=NotificationStatus.PROCESSING,
+                status=NotificationStatus.PENDING
+            )
 
-            if notification.status != NotificationStatus.PROCESSING:
+            if notification is None:
                 log.warning(
                     "notification_mark_pending_invalid_status",
-                    notification_id=notification_id,
-                    current_status=notification.status
+                    notification_id=notification_id
                 )
                 raise ValueError("Cannot mark a notification that isn't processing")
             
-            await self.__repo.mark_status(notification_id=notification_id, status=NotificationStatus.PENDING)
             log.info(
                 "notification_marked_as_pending",
                 notification_id=notification_id
@@ -222,19 +628,21 @@ class NotificationService:
 
     async def mark_as_failed(self, *, notification_id: uuid.UUID):
         try:
-            notification = await self.__repo.get_by_id(id=notification_id)
+            notification = await self.__repo.transition(
+                notification_id=notification_id,
+                expected=NotificationStatus.PROCESSING,
+                status=NotificationStatus.FAILED
+            )
 
-            if notification.status != NotificationStatus.PROCESSING:
+            if notification is None:
                 log.warning(
                     "notification_mark_failed_invalid_status",
-                    notification_id=notification_id,
-                    current_status=notification.status
+                    notification_id=notification_id
                 )
                 raise ValueError("Cannot mark a notification that isn't processing")
             
-            await self.__repo.mark_status(notification_id=notification_id, status=NotificationStatus.FAILED) 
             log.info(
-                "notification_marked_as_pending",
+                "notification_marked_as_failed",
                 notification_id=notification_id
             )
 
@@ -247,17 +655,19 @@ class NotificationService:
 
     async def mark_as_processing(self, *, notification_id: uuid.UUID):
         try:
-            notification = await self.__repo.get_by_id(id=notification_id)
+            notification = await self.__repo.transition(
+                notification_id=notification_id,
+                expected=NotificationStatus.PENDING,
+                status=NotificationStatus.PROCESSING
+            )
 
-            if notification.status != NotificationStatus.PENDING:
+            if notification is None:
                 log.warning(
                     "notification_mark_processing_invalid_status",
-                    notification_id=notification_id,
-                    current_status=notification.status
+                    notification_id=notification_id
                 )
                 raise ValueError("Cannot mark a notification that isn't pending")
             
-            await self.__repo.mark_status(notification_id=notification_id, status=NotificationStatus.PROCESSING)
             log.info(
                 "notification_marked_as_processing",
                 notification_id=notification_id
@@ -296,9 +706,52 @@ class NotificationService:
             )
             raise IndexError("Notification id doesn't exist")
 
-    async def get_sent(self, *, user_id: uuid.UUID) -> list[Notification]:
+    async def _mark_campaign_read(self, *, campaign_id: uuid.UUID, user_id: uuid.UUID) -> bool:
+        if self.__campaign_repo is None:
+            return False
+
+        campaign = await self.__campaign_repo.get_visible(campaign_id=campaign_id, user_id=user_id)
+        if campaign is None:
+            return False
+
+        await self.__campaign_repo.mark_read(campaign_id=campaign_id, user_id=user_id)
+        log.info(
+            "campaign_marked_as_read",
+            campaign_id=campaign_id,
+            user_id=user_id
+        )
+        return True
+
+    def _campaign_notification(self, *, campaign: Campaign, user_id: uuid.UUID) -> Notification:
+        # Transient, never added to the session: the inbox renders campaigns
+        # like the recipient's own sent notifications.
+        return Notification(
+            id=campaign.id,
+            user_id=user_id,
+            title=campaign.title,
+            message=campaign.message,
+            channel=campaign.channel,
+            priority=NotificationPriority.LOW,
+            status=NotificationStatus.SENT,
+            attempts=0,
+            created_at=campaign.created_at
+        )
+
+    async def get_sent(self, *, user_id: uuid.UUID, limit: int = 100) -> list[Notification]:
         try:
-            notifications = await self.__repo.list_by_user(user_id=user_id, status=NotificationStatus.SENT, limit=100)
+            notifications = await self.__repo.list_by_user(user_id=user_id, status=NotificationStatus.SENT, limit=limit)
+
+            if self.__campaign_repo is not None:
+                campaigns = await self.__campaign_repo.list_unread(user_id=user_id, limit=limit)
+                notifications = sorted(
+                    [
+                        *notifications,
+                        *(self._campaign_notification(campaign=c, user_id=user_id) for c in campaigns)
+                    ],
+                    key=lambda n: n.created_at,
+                    reverse=True
+                )[:limit]
+
             log.info(
                 "get_sent_by_user",
                 user_id=user_id
@@ -337,31 +790,45 @@ class NotificationService:
         title: str,
         message: str,
         category: EventCategory,
-        channel: NotificationChannel
+        channel: NotificationChannel,
+        priority: NotificationPriority = NotificationPriority.LOW
     ):
-        if category == EventCategory.GENERAL:
-            try:
-                users = await self.__user_service.get_all_active()
-
-                notifications = [
-                    Notification(
-                        user_id=user.id,
-                        title=title,
-                        message=message,
-                        channel=channel,
-                        status=NotificationStatus.PENDING
-                    )
-                    for user in users
-                ]
+        if category == EventCategory.GENERAL and channel == NotificationChannel.IN_APP and self.__campaign_repo is not None:
+            # Fan-out on read: one row for the whole audience, matched to
+            # users when they open their inbox.
+            campaign = Campaign(
+                title=title,
+                message=message,
+                channel=channel,
+                category=category,
+                active_since=self.__user_service.active_since()
+            )
+            await self.__campaign_repo.create(campaign=campaign)
 
-                await self.__repo.bulk_create(notifications=notifications)
+            log.info(
+                "campaign_create",
+                campaign_id=campaign.id,
+                title=title,
+                category=category
+            )
+
+        elif category == EventCategory.GENERAL:
+            try:
+                created = await self.__repo.fan_out(
+                    title=title,
+                    message=message,
+                    channel=channel,
+                    priority=priority,
+                    active_since=self.__user_service.active_since()
+                )
 
                 log.info(
                     "notifications_create_for_category",
                     title=title,
                     message=message,
                     channel=channel,
-                    category=category
+                    category=category,
+                    created=created
                 )
 
             except NotificationError:
@@ -374,23 +841,73 @@ class NotificationService:
                 )
                 raise
 
+    def _new_notification(self, draft: NotificationDraft) -> Notification:
+        # IN_APP delivery is only a status flip, so the fast path commits the
+        # row as SENT and pushes it to open streams instead of queueing it.
+        fast_path = self.__inapp_fast_path and draft.channel == NotificationChannel.IN_APP
+
+        return Notification(
+            user_id = draft.user_id,
+            title = draft.title,
+            message = draft.message,
+            channel = draft.channel,
+            priority = draft.priority,
+            status = NotificationStatus.SENT if fast_path else NotificationStatus.PENDING,
+            attempts = 1 if fast_path else 0
+        )
+
+    async def create_notifications(self, *, drafts: list[NotificationDraft]) -> list[Notification]:
+        """Creates all ``drafts`` with one bulk insert."""
+        notifications = [self._new_notification(d) for d in drafts]
+
+        try:
+            await self.__repo.bulk_create(notifications=notifications)
+
+            pushed = [n for n in notifications if n.status == NotificationStatus.SENT]
+            if pushed:
+                self.__repo.after_commit(
+                    lambda: [self.__inapp_hub.publish(n) for n in pushed]
+                )
+
+            log.info(
+                "notifications_create_batch",
+                count=len(notifications)
+            )
+            return notifications
+
+        except NotificationError:
+            log.exception(
+                "notifications_create_batch_failed",
+                count=len(notifications)
+            )
+            raise
+
     async def create_notification(
             self, 
             *,
             user_id: uuid.UUID,
             title: str | None = None,
             message: str,
-            channel: NotificationChannel
+            channel: NotificationChannel,
+            priority: NotificationPriority = NotificationPriority.HIGH
         ) -> Notification:
-        notification = Notification(
-            user_id = user_id,
-            title=title,
-            message = message,
-            channel = channel,
-            status = NotificationStatus.PENDING
+        notification = self._new_notification(
+            NotificationDraft(
+                user_id=user_id,
+                title=title,
+                message=message,
+                channel=channel,
+                priority=priority
+            )
         )
         try:
             await self.__repo.create(notification=notification)
+
+            if notification.status == NotificationStatus.SENT:
+                self.__repo.after_commit(
+                    lambda: self.__inapp_hub.publish(notification)
+                )
+
             log.info(
                 "notification_create",
                 user_id=notification.user_id,
@@ -0,0 +1,88 @@
+import structlog
+
+from app.db.models.enums import NotificationChannel
+from app.db.models.notification import Notification
+from app.db.settings import RateLimit, settings
+from app.repositories.rate_limit_repository import Grant, RateLimitRepository
+
+log = structlog.get_logger(__name__)
+
+class RateLimitService:
+    def __init__(
+            self,
+            *,
+            rate_limit_repo: RateLimitRepository,
+            channel_limits: dict[NotificationChannel, RateLimit] | None = None,
+            recipient_limits: dict[NotificationChannel, RateLimit] | None = None,
+        ):
+        self.__repo = rate_limit_repo
+        self.__channel_limits = (
+            settings.CHANNEL_RATE_LIMITS if channel_limits is None else channel_limits
+        )
+        self.__recipient_limits = (
+            settings.RECIPIENT_RATE_LIMITS if recipient_limits is None else recipient_limits
+        )
+
+    def _keys(self, notification: Notification) -> list[tuple[str, RateLimit]]:
+        keys = []
+        channel = NotificationChannel(notification.channel)
+
+        if channel in self.__channel_limits:
+            keys.append((f"channel:{channel.value}", self.__channel_limits[channel]))
+
+        if channel in self.__recipient_limits:
+            keys.append((
+                f"recipient:{channel.value}:{notification.user_id}",
+                self.__recipient_limits[channel]
+            ))
+
+        return keys
+
+    async def admit(
+            self,
+            *,
+            notifications: list[Notification]
+        ) -> tuple[list[Notification], list[tuple[Notification, float]]]:
+        """Splits a batch into notifications that may be sent now and
+        throttled ones, each paired with the seconds until it may be retried.
+        Tokens for the whole batch are taken in a single statement; tokens a
+        throttled notification took from its other buckets are given back."""
+        keys = {n.id: self._keys(n) for n in notifications}
+
+        requests: dict[str, tuple[int, RateLimit]] = {}
+        for n in notifications:
+            for key, limit in keys[n.id]:
+                count, _ = requests.get(key, (0, limit))
+                requests[key] = (count + 1, limit)
+
+        if not requests:
+            return notifications, []
+
+        grants = await self.__repo.acquire(requests=requests)
+        budget = {key: grant.granted for key, grant in grants.items()}
+
+        admitted = []
+        throttled = []
+        for n in notifications:
+            exhausted = [key for key, _ in keys[n.id] if budget[key] <= 0]
+
+            if exhausted:
+                throttled.append((n, max(self._wait(grants[key]) for key in exhausted)))
+                continue
+
+            for key, _ in keys[n.id]:
+                budget[key] -= 1
+            admitted.append(n)
+
+        if throttled:
+            await self.__repo.refund(unused=budget)
+            log.info(
+                "rate_limit_throttled",
+                admitted=len(admitted),
+                throttled=len(throttled)
+            )
+
+        return admitted, throttled
+
+    def _wait(self, grant: Grant) -> float:
+        return max(1 - grant.tokens, 0) / grant.rate
@@ -5,6 +5,7 @@ from datetime import timezone, datetime, timedelta
 from app.db.models.user import User
 from app.errors.user_error import UserError
 from app.repositories.user_repository import UserRepository
+from app.services.activity_tracker import ACTIVITY, ActivityTracker
 
 log = structlog.get_logger(__name__)
 
@@ -15,8 +16,10 @@ class UserService:
             self, 
             *, 
             user_repo: UserRepository,
+            activity: ActivityTracker | None = None,
         ):
         self.__repo = user_repo
+        self.__activity = activity or ACTIVITY
 
     async def create_user(self):
         user = User()
@@ -37,9 +40,12 @@ class UserService:
             )
             raise
 
+    def active_since(self) -> datetime:
+        return datetime.now(timezone.utc) - timedelta(weeks=self.DELAY)
+
     async def get_all_active(self) -> list[User]:
 
-        last_active = datetime.now(timezone.utc) - timedelta(weeks=self.DELAY)
+        last_active = self.active_since()
 
         try:
             return await self.__repo.get_active_users(last_active=last_active)
@@ -51,13 +57,24 @@ class UserService:
             raise
 
     async def update_last_active(self, *, user_id: uuid.UUID):
+        # Coalesced in memory and written by the periodic activity flush;
+        # the request itself does not touch "Users".
+        self.__activity.record(user_id)
+
+    async def touch_many(self, *, user_ids: list[uuid.UUID]) -> set[uuid.UUID]:
+        """Returns the ids that exist and records activity for them."""
         try:
-            await self.__repo.update_last_active(user_id=user_id)
-            
+            known = await self.__repo.existing_ids(user_ids=list(set(user_ids)))
+
+            for user_id in known:
+                self.__activity.record(user_id)
+
+            return known
+
         except UserError:
             log.exception(
-                "user_update_last_active_failed",
-                user_id=user_id
+                "user_touch_many_failed",
+                count=len(user_ids)
             )
             raise
 
@@ -0,0 +1,32 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+from app.db.models.enums import NotificationChannel
+
+class DispatchLimits:
+    def __init__(
+            self,
+            *,
+            max_concurrency: int,
+            channel_concurrency: dict[NotificationChannel, int]
+        ):
+        self.__total = asyncio.Semaphore(max_concurrency)
+        self.__channels = {
+            channel: asyncio.Semaphore(limit)
+            for channel, limit in channel_concurrency.items()
+        }
+
+    @asynccontextmanager
+    async def slot(self, channel: NotificationChannel):
+        # The channel slot is taken first so that a saturated channel
+        # queues on its own semaphore without holding process-wide slots.
+        channel_slot = self.__channels.get(channel)
+
+        if channel_slot is None:
+            async with self.__total:
+                yield
+            return
+
+        async with channel_slot:
+            async with self.__total:
+                yield
@@ -0,0 +1,81 @@
+import asyncio
+from collections import defaultdict
+import asyncpg
+import structlog
+from sqlalchemy.engine import make_url
+
+from app.db.models.enums import NotificationChannel
+from app.db.settings import settings
+
+log = structlog.get_logger(__name__)
+
+class PendingListener:
+    RECONNECT_DELAY = 5
+
+    def __init__(self, *, database_url: str, channel: str):
+        self.__dsn = (
+            make_url(database_url)
+            .set(drivername="postgresql")
+            .render_as_string(hide_password=False)
+        )
+        self.__channel = channel
+        self.__wakeups: defaultdict[NotificationChannel, asyncio.Event] = defaultdict(asyncio.Event)
+
+    def subscribe(self, channel: NotificationChannel) -> asyncio.Event:
+        # Taken before the claim query, so a NOTIFY that lands between an
+        # empty claim and the wait still wakes the caller.
+        return self.__wakeups[channel]
+
+    async def wait(self, wakeup: asyncio.Event, *, timeout: float) -> bool:
+        try:
+            await asyncio.wait_for(wakeup.wait(), timeout)
+            return True
+
+        except TimeoutError:
+            return False
+
+    def wake(self, channel: NotificationChannel | None = None):
+        channels = list(self.__wakeups) if channel is None else [channel]
+
+        for c in channels:
+            self.__wakeups.pop(c, asyncio.Event()).set()
+
+    def _on_notify(self, connection, pid, channel, payload):
+        try:
+            self.wake(NotificationChannel(payload))
+
+        except ValueError:
+            self.wake()
+
+    async def run(self):
+        while True:
+            try:
+                connection = await asyncpg.connect(self.__dsn)
+
+            except (OSError, asyncpg.PostgresError):
+                log.exception("worker_listener_connect_failed")
+                await asyncio.sleep(self.RECONNECT_DELAY)
+                continue
+
+            closed = asyncio.Event()
+            connection.add_termination_listener(lambda _: closed.set())
+
+            try:
+                await connection.add_listener(self.__channel, self._on_notify)
+                log.info("worker_listener_started", channel=self.__channel)
+                # Rows may have been inserted while we were not listening.
+                self.wake()
+                await closed.wait()
+                log.warning("worker_listener_disconnected", channel=self.__channel)
+
+            finally:
+                if not connection.is_closed():
+                    await connection.close()
+
+            await asyncio.sleep(self.RECONNECT_DELAY)
+
+def create_listener() -> PendingListener:
+    return PendingListener(
+        database_url=settings.DATABASE_URL,
+        channel=settings.NOTIFY_CHANNEL
+    )
@@ -1,54 +1,204 @@
 import asyncio
+import signal
+import uuid
 import structlog
+from multiprocessing.sharedctypes import Synchronized
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.db.models.enums import NotificationChannel
+from app.db.models.notification import Notification
 from app.repositories.notification_repository import NotificationRepository
+from app.repositories.rate_limit_repository import RateLimitRepository
 from app.repositories.user_repository import UserRepository
-from app.services.notification_service import NotificationService
+from app.senders.registry import start_senders, stop_senders
+from app.services.notification_service import DeliveryOutcome, NotificationService
+from app.services.rate_limit_service import RateLimitService
 from app.db.db import async_session_maker
+from app.db.settings import settings
 from app.services.user_service import UserService
+from app.workers.limits import DispatchLimits
+from app.workers.listener import PendingListener, create_listener
+from app.workers.reaper import run_reaper
+from app.workers.supervisor import Supervisor, WorkerAllocation
 
 log = structlog.get_logger(__name__)
 
-async def run_worker():
-    log.info("worker_pool_started", workers=5)
+class WorkerContext:
+    def __init__(
+            self,
+            *,
+            limits: DispatchLimits,
+            listener: PendingListener,
+            processed: Synchronized | None = None
+        ):
+        self.limits = limits
+        self.listener = listener
+        self.processed = processed
+        self.stopping = asyncio.Event()
 
-    workers = [
-        asyncio.create_task(process_loop(i))
-        for i in range(5)
-    ]
-    await asyncio.gather(*workers)
+    def stop(self):
+        self.stopping.set()
+        self.listener.wake()
 
-async def process_loop(worker_id: int):
-    log.info("worker started", worker_id=worker_id)
-    async with async_session_maker() as session:
-        repo = NotificationRepository(session=session)
-        user_service = UserService(
+    def record_processed(self, count: int = 1):
+        if self.processed is None:
+            return
+
+        with self.processed.get_lock():
+            self.processed.value += count
+
+def channel_allocation() -> WorkerAllocation:
+    return {
+        channel: settings.CHANNEL_WORKERS.get(channel, settings.WORKER_COROUTINES)
+        for channel in NotificationChannel
+    }
+
+async def run_worker(
+        *,
+        workers: WorkerAllocation | None = None,
+        processed: Synchronized | None = None
+    ):
+    workers = workers or channel_allocation()
+
+    log.info(
+        "worker_pool_started",
+        workers={channel.value: count for channel, count in workers.items()}
+    )
+
+    ctx = WorkerContext(
+        limits=DispatchLimits(
+            max_concurrency=settings.WORKER_MAX_CONCURRENCY,
+            channel_concurrency=settings.CHANNEL_CONCURRENCY
+        ),
+        listener=create_listener(),
+        processed=processed
+    )
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, ctx.stop)
+
+    await start_senders()
+
+    listener_task = asyncio.create_task(ctx.listener.run())
+    reaper_task = asyncio.create_task(
+        run_reaper(build_service=build_service, stopping=ctx.stopping)
+    )
+
+    try:
+        await asyncio.gather(*(
+            process_loop(f"{channel.value}-{i}", channel, ctx)
+            for channel, count in workers.items()
+            for i in range(count)
+        ))
+
+    finally:
+        # Also reached when a loop crashed: stop the remaining loops and the
+        # reaper so the process exits and the supervisor restarts it.
+        ctx.stop()
+        listener_task.cancel()
+        await reaper_task
+        await stop_senders()
+        log.info("worker_pool_drained")
+
+def build_service(session: AsyncSession) -> NotificationService:
+    return NotificationService(
+        notification_repo=NotificationRepository(session=session),
+        user_service=UserService(
             user_repo=UserRepository(session=session)
         )
-        service = NotificationService(
-            notification_repo=repo,
-            user_service=user_service
-        )
+    )
+
+def build_rate_limiter(session: AsyncSession) -> RateLimitService:
+    return RateLimitService(
+        rate_limit_repo=RateLimitRepository(session=session)
+    )
+
+async def process_loop(
+        worker_id: str,
+        channel: NotificationChannel,
+        ctx: WorkerContext
+    ):
+    log.info("worker started", worker_id=worker_id, channel=channel)
+    async with async_session_maker() as session:
+        service = build_service(session)
+        rate_limiter = build_rate_limiter(session)
+
+        while not ctx.stopping.is_set():
+            await process_one(session, service, rate_limiter, worker_id, channel, ctx)
 
-        while True: 
-            await process_one(session, service, worker_id)
+    log.info("worker stopped", worker_id=worker_id, channel=channel)
 
 async def process_one(
         session: AsyncSession,
         service: NotificationService,
-        worker_id: int
+        rate_limiter: RateLimitService,
+        worker_id: str,
+        channel: NotificationChannel,
+        ctx: WorkerContext
     ):
-    async with session.begin():
-        notifications = await service.get_processing(limit=10)
+    retry_in = service.channel_retry_in(channel=channel)
+    if retry_in:
+        # Don't claim rows we can't send: leave them pending and give the
+        # connections and concurrency slots to the healthy channels.
+        log.debug(
+            "worker_channel_unavailable",
+            worker_id=worker_id,
+            retry_in=retry_in
+        )
+        try:
+            await asyncio.wait_for(ctx.stopping.wait(), retry_in)
+        except TimeoutError:
+            pass
+        return
+
+    wakeup = ctx.listener.subscribe(channel)
+    batch_size = settings.CHANNEL_BATCH_SIZE.get(channel, settings.WORKER_BATCH_SIZE)
+
+    lease_owner = uuid.uuid4()
+
+    try:
+        async with session.begin():
+            notifications = await service.get_processing(
+                channel=channel,
+                limit=batch_size,
+                lease_owner=lease_owner
+            )
+
+            if notifications:
+                notifications = await service.coalesce(
+                    notifications=notifications,
+                    lease_owner=lease_owner
+                )
+
+            if not notifications:
+                timeout = await service.next_due_in(
+                    channel=channel,
+                    default=settings.WORKER_IDLE_POLL_INTERVAL
+                )
+
+    except Exception:
+        # The claim rolled back, so nothing is leased; back off and retry
+        # instead of taking the other loops of this process down with it.
+        log.exception(
+            "worker_claim_failed",
+            worker_id=worker_id,
+            retry_in=settings.WORKER_CLAIM_RETRY_DELAY
+        )
+        try:
+            await asyncio.wait_for(ctx.stopping.wait(), settings.WORKER_CLAIM_RETRY_DELAY)
+        except TimeoutError:
+            pass
+        return
 
     if not notifications:
         log.debug(
             "worker_idle",
-            worker_id=worker_id
+            worker_id=worker_id,
+            timeout=timeout
         )
-        await asyncio.sleep(1)
+        await ctx.listener.wait(wakeup, timeout=timeout)
         return
     
     log.info(
@@ -56,32 +206,162 @@ async def process_one(
         worker_id=worker_id,
         batch_size=len(notifications)
     )
-    
-    for n in notifications:
+
+    sent = asyncio.Event()
+    heartbeat_task = asyncio.create_task(heartbeat(lease_owner, sent))
+
+    try:
+        outcomes = await send_batch(
+            notifications, session, service, rate_limiter, worker_id, channel, ctx
+        )
+
+    finally:
+        sent.set()
+        await heartbeat_task
+
+    # Sends finish in any order; their outcomes are written back together,
+    # so a batch costs a fixed number of statements regardless of its size.
+    try:
+        async with session.begin():
+            await service.record_outcomes(outcomes=outcomes, lease_owner=lease_owner)
+
+    except Exception:
+        log.exception(
+            "worker_batch_write_back_failed",
+            worker_id=worker_id,
+            batch_size=len(outcomes)
+        )
+        return
+
+    log.info(
+        "worker_batch_processed",
+        worker_id=worker_id,
+        batch_size=len(outcomes)
+    )
+
+async def send_batch(
+        notifications: list[Notification],
+        session: AsyncSession,
+        service: NotificationService,
+        rate_limiter: RateLimitService,
+        worker_id: str,
+        channel: NotificationChannel,
+        ctx: WorkerContext
+    ) -> list[DeliveryOutcome]:
+    """Sends what the shared rate limits admit, waits for short throttles and
+    defers the rest without spending their attempts."""
+    outcomes: list[DeliveryOutcome] = []
+    remaining = notifications
+
+    while remaining:
+        try:
+            async with session.begin():
+                admitted, throttled = await rate_limiter.admit(notifications=remaining)
+
+        except Exception:
+            # A rate limiter outage must not stall delivery; providers still
+            # push back with TemporaryError if we overshoot.
+            log.exception("worker_rate_limit_failed", worker_id=worker_id)
+            admitted, throttled = remaining, []
+
+        if admitted:
+            if service.sends_in_batches(channel=channel):
+                outcomes += await dispatch_many(admitted, service, worker_id, channel, ctx)
+            else:
+                outcomes += await asyncio.gather(*(
+                    dispatch(n, service, worker_id, ctx)
+                    for n in admitted
+                ))
+
+        if not throttled:
+            break
+
+        retry_in = min(wait for _, wait in throttled)
+
+        if retry_in > settings.RATE_LIMIT_MAX_WAIT or ctx.stopping.is_set():
+            outcomes += [
+                service.defer(notification=n, delay=wait, reason="rate limited")
+                for n, wait in throttled
+            ]
+            break
+
+        await asyncio.sleep(retry_in)
+        remaining = [n for n, _ in throttled]
+
+    return outcomes
+
+async def dispatch(
+        notification: Notification,
+        service: NotificationService,
+        worker_id: str,
+        ctx: WorkerContext
+    ) -> DeliveryOutcome:
+    async with ctx.limits.slot(notification.channel):
         log.info(
             "worker_notification_processing_started",
             worker_id=worker_id,
-            notification_id=n.id
+            notification_id=notification.id
         )
 
         try:
-            async with session.begin():
-                await service.process_sending(notification=n)
-                log.info(
-                "worker_notification_processed",
-                worker_id=worker_id,
-                notification_id=n.id
-            )
-                
+            return await service.deliver(notification=notification)
+
+        finally:
+            ctx.record_processed()
+
+async def dispatch_many(
+        notifications: list[Notification],
+        service: NotificationService,
+        worker_id: str,
+        channel: NotificationChannel,
+        ctx: WorkerContext
+    ) -> list[DeliveryOutcome]:
+    async with ctx.limits.slot(channel):
+        log.info(
+            "worker_batch_sending_started",
+            worker_id=worker_id,
+            batch_size=len(notifications)
+        )
+
+        try:
+            return await service.deliver_many(notifications=notifications)
+
+        finally:
+            ctx.record_processed(len(notifications))
+
+async def heartbeat(lease_owner: uuid.UUID, done: asyncio.Event):
+    """Keeps the batch's leases alive while its sends are in flight, so the
+    reaper only reclaims rows of workers that are actually gone."""
+    interval = settings.WORKER_LEASE_SECONDS / 3
+
+    while True:
+        try:
+            await asyncio.wait_for(done.wait(), interval)
+            return
+
+        except TimeoutError:
+            pass
+
+        try:
+            async with async_session_maker() as session:
+                async with session.begin():
+                    await build_service(session).extend_leases(lease_owner=lease_owner)
+
         except Exception:
             log.exception(
-                "worker_notification_processing_failed",
-                worker_id=worker_id,
-                notification_id=n.id
+                "worker_lease_heartbeat_failed",
+                lease_owner=lease_owner
             )
 
+def run_process(workers: WorkerAllocation, processed: Synchronized):
+    asyncio.run(run_worker(workers=workers, processed=processed))
+
 def main():
-    asyncio.run(run_worker())
+    Supervisor(
+        target=run_process,
+        processes=settings.WORKER_PROCESSES,
+        workers=channel_allocation()
+    ).run()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,48 @@
+import asyncio
+from collections.abc import Callable
+import structlog
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.db import async_session_maker
+from app.db.settings import settings
+from app.services.notification_service import NotificationService
+
+log = structlog.get_logger(__name__)
+
+async def run_reaper(
+        *,
+        build_service: Callable[[AsyncSession], NotificationService],
+        stopping: asyncio.Event
+    ):
+    """Periodically hands notifications whose lease expired (their worker
+    died or hung mid-send) back to the queue. Safe to run in every worker
+    process: expired rows are picked with SKIP LOCKED."""
+    log.info("worker_reaper_started", interval=settings.WORKER_REAPER_INTERVAL)
+
+    while not stopping.is_set():
+        try:
+            await asyncio.wait_for(stopping.wait(), settings.WORKER_REAPER_INTERVAL)
+            break
+
+        except TimeoutError:
+            pass
+
+        try:
+            async with async_session_maker() as session:
+                service = build_service(session)
+
+                # Drain in bounded batches so no statement holds many row locks.
+                while True:
+                    async with session.begin():
+                        reclaimed = await service.reclaim_expired(
+                            limit=settings.WORKER_REAPER_BATCH_SIZE
+                        )
+
+                    if reclaimed < settings.WORKER_REAPER_BATCH_SIZE:
+                        break
+
+        except Exception:
+            log.exception("worker_reaper_failed")
+
+    log.info("worker_reaper_stopped")
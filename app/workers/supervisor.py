@@ -0,0 +1,148 @@
+import multiprocessing
+import signal
+import time
+from collections.abc import Callable
+from multiprocessing.context import ForkProcess
+from multiprocessing.sharedctypes import Synchronized
+
+import structlog
+
+from app.db.models.enums import NotificationChannel
+from app.db.settings import settings
+
+log = structlog.get_logger(__name__)
+
+WorkerAllocation = dict[NotificationChannel, int]
+ProcessTarget = Callable[[WorkerAllocation, Synchronized], None]
+
+class Supervisor:
+    CHECK_INTERVAL = 1
+    RESTART_DELAY = 1
+
+    def __init__(
+            self,
+            *,
+            target: ProcessTarget,
+            processes: int,
+            workers: WorkerAllocation,
+            stats_interval: float = settings.WORKER_STATS_INTERVAL,
+            drain_timeout: float = settings.WORKER_DRAIN_TIMEOUT
+        ):
+        self.__ctx = multiprocessing.get_context("fork")
+        self.__target = target
+        self.__processes = processes
+        self.__workers = workers
+        self.__stats_interval = stats_interval
+        self.__drain_timeout = drain_timeout
+        self.__children: dict[int, ForkProcess] = {}
+        self.__counters: dict[int, Synchronized] = {}
+        self.__stopping = False
+
+    def run(self):
+        signal.signal(signal.SIGTERM, self._on_signal)
+        signal.signal(signal.SIGINT, self._on_signal)
+
+        log.info(
+            "worker_supervisor_started",
+            processes=self.__processes,
+            workers={channel.value: count for channel, count in self.__workers.items()}
+        )
+
+        for index in range(self.__processes):
+            self.__counters[index] = self.__ctx.Value("Q", 0)
+            self._spawn(index)
+
+        last_report = time.monotonic()
+        last_total = 0
+
+        while True:
+            time.sleep(self.CHECK_INTERVAL)
+            if self.__stopping:
+                break
+
+            self._restart_dead()
+
+            now = time.monotonic()
+            if now - last_report >= self.__stats_interval:
+                total = sum(counter.value for counter in self.__counters.values())
+                log.info(
+                    "worker_supervisor_stats",
+                    processes=sum(child.is_alive() for child in self.__children.values()),
+                    processed=total,
+                    per_second=round((total - last_total) / (now - last_report), 2)
+                )
+                last_report, last_total = now, total
+
+        self._drain()
+
+    def _spawn(self, index: int):
+        child = self.__ctx.Process(
+            target=_child_main,
+            args=(self.__target, self.__workers, self.__counters[index]),
+            name=f"notification-worker-{index}",
+        )
+        child.start()
+        self.__children[index] = child
+
+        log.info("worker_process_started", index=index, pid=child.pid)
+
+    def _restart_dead(self):
+        dead = [
+            index
+            for index, child in self.__children.items()
+            if not child.is_alive()
+        ]
+        if not dead:
+            return
+
+        for index in dead:
+            child = self.__children[index]
+            log.warning(
+                "worker_process_exited",
+                index=index,
+                pid=child.pid,
+                exitcode=child.exitcode
+            )
+
+        # A short pause keeps a child that crashes on startup from
+        # turning the supervisor into a fork loop.
+        time.sleep(self.RESTART_DELAY)
+
+        for index in dead:
+            if self.__stopping:
+                return
+            self._spawn(index)
+
+    def _on_signal(self, signum, frame):
+        if self.__stopping:
+            return
+
+        log.info("worker_supervisor_stopping", signal=signal.Signals(signum).name)
+        self.__stopping = True
+
+        for child in self.__children.values():
+            if child.is_alive():
+                child.terminate()
+
+    def _drain(self):
+        deadline = time.monotonic() + self.__drain_timeout
+
+        for index, child in self.__children.items():
+            child.join(max(deadline - time.monotonic(), 0))
+
+            if child.is_alive():
+                log.warning("worker_process_killed", index=index, pid=child.pid)
+                child.kill()
+                child.join()
+
+        log.info(
+            "worker_supervisor_stopped",
+            processed=sum(counter.value for counter in self.__counters.values())
+        )
+
+def _child_main(target: ProcessTarget, workers: WorkerAllocation, processed: Synchronized):
+    # The child inherits the supervisor's handlers across fork; the worker
+    # installs its own drain handlers once its event loop is running.
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    target(workers, processed)
@@ -7,7 +7,7 @@ from app.db.models.user import User
 from app.repositories.notification_repository import NotificationRepository
 from app.repositories.user_repository import UserRepository
 from app.services.notification_service import NotificationService
-from app.db.models.enums import NotificationChannel, NotificationStatus
+from app.db.models.enums import NotificationChannel, NotificationPriority, NotificationStatus
 from unittest.mock import AsyncMock
 from app.db.settings import settings
 from app.services.user_service import UserService
@@ -50,7 +50,7 @@ def repository(session):
 @pytest.fixture
 def service(repository, user_service, sender):
     senders = {
-        NotificationChannel.IN_APP: lambda: sender
+        NotificationChannel.IN_APP: sender
     }
 
     return NotificationService(
@@ -67,12 +67,19 @@ def sender():
 
 @pytest.fixture
 def notification_factory():
-    def factory(*, user_id: uuid.UUID, status: NotificationStatus = NotificationStatus.PENDING):
+    def factory(
+        *,
+        user_id: uuid.UUID,
+        status: NotificationStatus = NotificationStatus.PENDING,
+        channel: NotificationChannel = NotificationChannel.IN_APP,
+        priority: NotificationPriority = NotificationPriority.HIGH
+    ):
         return Notification(
             id=uuid.uuid4(),
             title="test_title",
             user_id=user_id,
-            channel=NotificationChannel.IN_APP,
+            channel=channel,
+            priority=priority,
             status=status,
             attempts=0,
             message="test_message",
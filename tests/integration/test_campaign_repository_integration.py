@@ -0,0 +1,32 @@
+from datetime import datetime, timedelta, timezone
+
+from app.db.models.campaign import Campaign
+from app.db.models.enums import EventCategory, NotificationChannel
+from app.db.models.user import User
+from app.repositories.campaign_repository import CampaignRepository
+
+async def test_campaign_audience_and_read(session):
+    repository = CampaignRepository(session=session)
+
+    now = datetime.now(timezone.utc)
+    active = User(last_active=now, created_at=now - timedelta(days=1))
+    inactive = User(last_active=now - timedelta(weeks=10), created_at=now - timedelta(weeks=20))
+    session.add_all([active, inactive])
+    await session.flush()
+
+    campaign = Campaign(
+        title="title",
+        message="message",
+        channel=NotificationChannel.IN_APP,
+        category=EventCategory.GENERAL,
+        active_since=now - timedelta(weeks=5)
+    )
+    await repository.create(campaign=campaign)
+    await session.commit()
+
+    assert [c.id for c in await repository.list_unread(user_id=active.id)] == [campaign.id]
+    assert await repository.list_unread(user_id=inactive.id) == []
+
+    assert await repository.mark_read(campaign_id=campaign.id, user_id=active.id)
+    assert not await repository.mark_read(campaign_id=campaign.id, user_id=active.id)
+    assert await repository.list_unread(user_id=active.id) == []
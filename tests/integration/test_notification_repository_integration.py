@@ -1,5 +1,8 @@
-from app.db.models.enums import NotificationStatus
+import uuid
+from app.db.models.enums import NotificationChannel, NotificationPriority, NotificationStatus
 from datetime import datetime, timezone, timedelta
+from app.db.models.user import User
+from app.repositories.user_repository import UserRepository
 
 async def test_get_pending(repository, session, notification_factory, user_service):
     
@@ -60,3 +63,253 @@ async def test_mark_status(repository, notification_factory, user_service):
     )
 
     assert result.status == NotificationStatus.READ
+
+async def test_claim_pending(repository, session, notification_factory, user_service):
+
+    user = await user_service.create_user()
+
+    for _ in range(3):
+        await repository.create(
+            notification=notification_factory(user_id=user.id, status=NotificationStatus.PENDING)
+        )
+
+    await repository.create(
+        notification=notification_factory(user_id=user.id, status=NotificationStatus.SENT)
+    )
+
+    await session.commit()
+
+    claimed = await repository.claim_pending(limit=2)
+
+    assert len(claimed) == 2
+    assert all(n.status == NotificationStatus.PROCESSING for n in claimed)
+
+    rest = await repository.claim_pending(limit=10)
+
+    assert len(rest) == 1
+    assert rest[0].id not in {n.id for n in claimed}
+
+async def test_claim_pending_by_channel(repository, session, notification_factory, user_service):
+
+    user = await user_service.create_user()
+
+    for channel in (NotificationChannel.IN_APP, NotificationChannel.EMAIL, NotificationChannel.EMAIL):
+        await repository.create(
+            notification=notification_factory(user_id=user.id, channel=channel)
+        )
+
+    await session.commit()
+
+    claimed = await repository.claim_pending(channel=NotificationChannel.EMAIL, limit=10)
+
+    assert len(claimed) == 2
+    assert all(n.channel == NotificationChannel.EMAIL for n in claimed)
+
+async def test_bulk_transition(repository, session, notification_factory, user_service):
+
+    user = await user_service.create_user()
+
+    processing = [
+        notification_factory(user_id=user.id, status=NotificationStatus.PROCESSING)
+        for _ in range(2)
+    ]
+    sent = notification_factory(user_id=user.id, status=NotificationStatus.SENT)
+
+    for n in [*processing, sent]:
+        await repository.create(notification=n)
+
+    next_attempt_at = [
+        datetime.now(timezone.utc) + timedelta(seconds=s)
+        for s in (10, 20, 30)
+    ]
+
+    updated = await repository.bulk_transition(
+        ids=[n.id for n in [*processing, sent]],
+        status=NotificationStatus.PENDING,
+        next_attempt_at=next_attempt_at
+    )
+
+    assert set(updated) == {n.id for n in processing}
+
+    for n, due in zip(processing, next_attempt_at):
+        saved = await repository.get_by_id(id=n.id)
+        await session.refresh(saved)
+
+        assert saved.status == NotificationStatus.PENDING
+        assert saved.attempts == 1
+        assert saved.next_attempt_at == due
+
+async def test_transition_is_guarded_by_expected_status(repository, notification_factory, user_service):
+
+    user = await user_service.create_user()
+
+    notification = notification_factory(user_id=user.id)
+
+    await repository.create(notification=notification)
+
+    assert await repository.transition(
+        notification_id=notification.id,
+        expected=NotificationStatus.PROCESSING,
+        status=NotificationStatus.SENT
+    ) is None
+
+    result = await repository.transition(
+        notification_id=notification.id,
+        expected=NotificationStatus.PENDING,
+        status=NotificationStatus.PROCESSING
+    )
+
+    assert result.status == NotificationStatus.PROCESSING
+
+async def test_reclaim_expired(repository, session, notification_factory, user_service):
+
+    user = await user_service.create_user()
+
+    expired = notification_factory(user_id=user.id, status=NotificationStatus.PROCESSING)
+    expired.lease_expires_at = datetime.now(timezone.utc) - timedelta(minutes=1)
+
+    exhausted = notification_factory(user_id=user.id, status=NotificationStatus.PROCESSING)
+    exhausted.attempts = 4
+    exhausted.lease_expires_at = datetime.now(timezone.utc) - timedelta(minutes=1)
+
+    leased = notification_factory(user_id=user.id, status=NotificationStatus.PROCESSING)
+    leased.lease_expires_at = datetime.now(timezone.utc) + timedelta(minutes=1)
+
+    for n in (expired, exhausted, leased):
+        await repository.create(notification=n)
+
+    await session.commit()
+
+    assert await repository.reclaim_expired(max_attempts=5) == 2
+
+    for n, status in (
+        (expired, NotificationStatus.PENDING),
+        (exhausted, NotificationStatus.FAILED),
+        (leased, NotificationStatus.PROCESSING),
+    ):
+        saved = await repository.get_by_id(id=n.id)
+        await session.refresh(saved)
+
+        assert saved.status == status
+
+async def test_claim_pending_by_priority(repository, session, notification_factory, user_service):
+
+    user = await user_service.create_user()
+
+    for priority in (NotificationPriority.HIGH, NotificationPriority.LOW, NotificationPriority.LOW):
+        await repository.create(
+            notification=notification_factory(user_id=user.id, priority=priority)
+        )
+
+    await session.commit()
+
+    claimed = await repository.claim_pending(priority=NotificationPriority.LOW, limit=10)
+
+    assert len(claimed) == 2
+    assert all(n.priority == NotificationPriority.LOW for n in claimed)
+
+async def test_lock_expired_and_delete(repository, session, notification_factory, user_service):
+
+    user = await user_service.create_user()
+
+    old = datetime.now(timezone.utc) - timedelta(days=60)
+    expired = []
+    for status in (NotificationStatus.READ, NotificationStatus.FAILED, NotificationStatus.PENDING):
+        n = notification_factory(user_id=user.id, status=status)
+        n.created_at = old
+        expired.append(n)
+        await repository.create(notification=n)
+
+    await repository.create(
+        notification=notification_factory(user_id=user.id, status=NotificationStatus.READ)
+    )
+
+    await session.commit()
+
+    before = datetime.now(timezone.utc) - timedelta(days=30)
+    rows = await repository.lock_expired(
+        statuses=[NotificationStatus.READ, NotificationStatus.FAILED],
+        before=before
+    )
+
+    assert {row["id"] for row in rows} == {n.id for n in expired[:2]}
+
+    deleted = await repository.delete_by_ids(ids=[row["id"] for row in rows], before=before)
+
+    assert deleted == 2
+
+async def test_link_to_digest(repository, session, notification_factory, user_service):
+
+    user = await user_service.create_user()
+    lease_owner = uuid.uuid4()
+
+    originals = [
+        notification_factory(user_id=user.id, status=NotificationStatus.PROCESSING)
+        for _ in range(3)
+    ]
+    for n in originals:
+        n.lease_owner = lease_owner
+        await repository.create(notification=n)
+
+    digest = notification_factory(user_id=user.id, status=NotificationStatus.PROCESSING)
+    digest.digest_size = 2
+    await repository.create(notification=digest)
+
+    linked = await repository.link_to_digest(
+        ids=[n.id for n in originals],
+        digest_ids=[digest.id] * 3,
+        lease_owner=uuid.uuid4()
+    )
+    assert linked == []
+
+    linked = await repository.link_to_digest(
+        ids=[n.id for n in originals[:2]],
+        digest_ids=[digest.id] * 2,
+        lease_owner=lease_owner
+    )
+    assert set(linked) == {n.id for n in originals[:2]}
+
+    items = await repository.list_digest_items(digest_id=digest.id)
+
+    assert {n.id for n in items} == set(linked)
+    for n in items:
+        await session.refresh(n)
+        assert n.status == NotificationStatus.DIGESTED
+        assert n.lease_owner is None
+
+async def test_fan_out(repository, session):
+
+    now = datetime.now(timezone.utc)
+    active = [User(last_active=now) for _ in range(3)]
+    session.add_all([*active, User(last_active=now - timedelta(weeks=10))])
+    await session.commit()
+
+    created = await repository.fan_out(
+        title="title",
+        message="message",
+        channel=NotificationChannel.IN_APP,
+        priority=NotificationPriority.LOW,
+        active_since=now - timedelta(weeks=5)
+    )
+    await session.commit()
+
+    assert created == 3
+
+    claimed = await repository.claim_pending(limit=10)
+
+    assert {n.user_id for n in claimed} == {u.id for u in active}
+    assert all(n.priority == NotificationPriority.LOW for n in claimed)
+
+async def test_bulk_update_last_active_skips_small_changes(session):
+
+    now = datetime.now(timezone.utc)
+    stale, fresh = User(last_active=now - timedelta(hours=1)), User(last_active=now - timedelta(seconds=10))
+    session.add_all([stale, fresh])
+    await session.commit()
+
+    updated = await UserRepository(session=session).bulk_update_last_active(
+        seen={stale.id: now, fresh.id: now},
+        threshold=timedelta(seconds=60)
+    )
+
+    assert updated == 1
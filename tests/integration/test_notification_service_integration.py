@@ -1,6 +1,6 @@
 from app.db.models.enums import NotificationStatus
 
-async def test_process_sending(user_service, service, repository, notification_factory):
+async def test_process_sending(user_service, service, repository, session, notification_factory):
     user = await user_service.create_user()
 
     notification = notification_factory(user_id=user.id)
@@ -9,9 +9,11 @@ async def test_process_sending(user_service, service, repository, notification_f
 
     await service.mark_as_processing(notification_id=notification.id)
 
-    await service.process_sending(notification=notification)
+    outcome = await service.deliver(notification=notification)
+    await service.record_outcomes(outcomes=[outcome])
 
     saved = await repository.get_by_id(id=notification.id)
+    await session.refresh(saved)
 
     assert saved.status == NotificationStatus.SENT
     assert saved.attempts == 1
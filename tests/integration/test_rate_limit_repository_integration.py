@@ -0,0 +1,67 @@
+import asyncio
+from datetime import timedelta
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.db.models.rate_limit_bucket import RateLimitBucket
+from app.db.settings import RateLimit
+from app.repositories.rate_limit_repository import RateLimitRepository
+
+async def test_acquire_caps_at_burst_and_refills(session):
+    repo = RateLimitRepository(session=session)
+    limit = RateLimit(rate=1, burst=3)
+
+    grants = await repo.acquire(requests={"channel:telegram": (10, limit)})
+    await session.commit()
+    assert grants["channel:telegram"].granted == 3
+
+    grants = await repo.acquire(requests={"channel:telegram": (1, limit)})
+    await session.commit()
+    assert grants["channel:telegram"].granted == 0
+
+    await session.execute(
+        update(RateLimitBucket)
+        .where(RateLimitBucket.key == "channel:telegram")
+        .values(updated_at=RateLimitBucket.updated_at - timedelta(seconds=2))
+    )
+    await session.commit()
+
+    grants = await repo.acquire(requests={"channel:telegram": (5, limit)})
+    await session.commit()
+    assert grants["channel:telegram"].granted == 2
+
+async def test_refund_returns_unused_tokens(session):
+    repo = RateLimitRepository(session=session)
+    limit = RateLimit(rate=0.001, burst=5)
+
+    await repo.acquire(requests={"recipient:telegram:1": (4, limit)})
+    await repo.refund(unused={"recipient:telegram:1": 3})
+    await session.commit()
+
+    tokens = await session.scalar(
+        select(RateLimitBucket.tokens).where(RateLimitBucket.key == "recipient:telegram:1")
+    )
+    assert tokens == 4
+
+async def test_concurrent_acquire_shares_buckets(engine):
+    session_maker = async_sessionmaker(engine, expire_on_commit=False)
+    channel, recipient = RateLimit(rate=0.001, burst=10), RateLimit(rate=0.001, burst=3)
+
+    async def acquire(requests):
+        async with session_maker() as session:
+            async with session.begin():
+                return await RateLimitRepository(session=session).acquire(requests=requests)
+
+    # Opposite key order in each caller: rows are locked in key order, so
+    # neither deadlocks.
+    results = await asyncio.gather(*(
+        acquire(dict(pairs))
+        for _ in range(5)
+        for pairs in (
+            [("channel:telegram", (2, channel)), ("recipient:telegram:1", (2, recipient))],
+            [("recipient:telegram:1", (2, recipient)), ("channel:telegram", (2, channel))],
+        )
+    ))
+
+    assert sum(r["channel:telegram"].granted for r in results) == 10
+    assert sum(r["recipient:telegram:1"].granted for r in results) == 3
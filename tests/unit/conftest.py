@@ -3,6 +3,7 @@ import uuid
 from unittest.mock import AsyncMock, Mock
 
 from app.db.models.user import User
+from app.services.circuit_breaker import create_breakers
 from app.services.notification_service import NotificationService
 from app.db.models.notification import Notification
 from app.db.models.enums import NotificationChannel, NotificationStatus
@@ -14,8 +15,20 @@ def repository(notification):
     repo.get_by_id = AsyncMock(return_value=notification)
     repo.update_attempts = AsyncMock()
     repo.get_pending = AsyncMock()
+    repo.claim_pending = AsyncMock()
     repo.mark_status = AsyncMock()
     repo.create = AsyncMock()
+    repo.after_commit = Mock()
+    repo.fan_out = AsyncMock(return_value=10)
+    repo.bulk_transition = AsyncMock(side_effect=lambda *, ids, **kwargs: ids)
+
+    async def transition(*, notification_id, expected, status):
+        if notification.status != expected:
+            return None
+        notification.status = status
+        return notification
+
+    repo.transition = AsyncMock(side_effect=transition)
 
     return repo
 
@@ -41,17 +54,22 @@ def sender():
     return sender
 
 @pytest.fixture()
-def service(repository, user_service, sender):
+def service(repository, user_service, sender, breakers):
     senders = {
-        NotificationChannel.IN_APP: lambda: sender
+        NotificationChannel.IN_APP: sender
     }
 
     return NotificationService(
         notification_repo=repository,
         user_service=user_service,
         senders=senders,
+        breakers=breakers,
     )
 
+@pytest.fixture()
+def breakers():
+    return create_breakers()
+
 @pytest.fixture
 def notification():
     n = Notification(
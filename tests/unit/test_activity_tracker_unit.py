@@ -0,0 +1,45 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.services.activity_tracker import ActivityTracker
+from app.services.user_service import UserService
+
+
+async def test_flush_writes_latest_timestamp_per_user():
+    tracker = ActivityTracker()
+    user_id = uuid.uuid4()
+    now = datetime.now(timezone.utc)
+
+    tracker.record(user_id, now)
+    tracker.record(user_id, now - timedelta(seconds=5))
+    tracker.record(uuid.uuid4(), now)
+
+    write = AsyncMock(return_value=2)
+    assert await tracker.flush(write=write) == 2
+
+    seen = write.await_args.args[0]
+    assert seen[user_id] == now
+    assert len(seen) == 2
+    assert tracker.pending == 0
+
+async def test_failed_flush_keeps_pending_activity():
+    tracker = ActivityTracker()
+    tracker.record(uuid.uuid4())
+
+    with pytest.raises(RuntimeError):
+        await tracker.flush(write=AsyncMock(side_effect=RuntimeError("db down")))
+
+    assert tracker.pending == 1
+
+async def test_update_last_active_does_not_write_users():
+    repo = AsyncMock()
+    tracker = ActivityTracker()
+    service = UserService(user_repo=repo, activity=tracker)
+
+    await service.update_last_active(user_id=uuid.uuid4())
+
+    assert repo.mock_calls == []
+    assert tracker.pending == 1
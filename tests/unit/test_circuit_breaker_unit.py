@@ -0,0 +1,48 @@
+import time
+
+from app.db.settings import BreakerPolicy
+from app.services.circuit_breaker import BreakerState, CircuitBreaker
+
+
+def make_breaker(**kwargs):
+    return CircuitBreaker(name="test", policy=BreakerPolicy(**kwargs))
+
+def test_opens_after_consecutive_failures():
+    breaker = make_breaker(failure_threshold=3)
+
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == BreakerState.CLOSED
+
+    breaker.record_failure()
+    assert breaker.state == BreakerState.OPEN
+    assert not breaker.allow()
+    assert breaker.retry_in > 0
+
+def test_half_open_lets_limited_probes_through():
+    breaker = make_breaker(failure_threshold=1, recovery_timeout=0, half_open_max_calls=1)
+
+    breaker.record_failure()
+    assert breaker.state == BreakerState.HALF_OPEN
+    assert breaker.available()
+
+    assert breaker.allow()
+    assert not breaker.available()
+    assert not breaker.allow()
+
+    breaker.record_success()
+    assert breaker.state == BreakerState.CLOSED
+
+def test_failed_probe_reopens():
+    breaker = make_breaker(failure_threshold=5, recovery_timeout=0.01)
+
+    for _ in range(5):
+        breaker.record_failure()
+    time.sleep(0.02)
+    assert breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.state == BreakerState.OPEN
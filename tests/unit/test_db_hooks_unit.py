@@ -0,0 +1,31 @@
+from unittest.mock import Mock
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.hooks import after_commit
+
+
+async def test_callback_runs_on_commit_only_once():
+    session = AsyncSession()
+    callback = Mock()
+
+    async with session.begin():
+        after_commit(session, callback)
+    callback.assert_called_once()
+
+    async with session.begin():
+        pass
+    callback.assert_called_once()
+
+async def test_callback_is_discarded_on_rollback():
+    session = AsyncSession()
+    dropped, kept = Mock(), Mock()
+
+    await session.begin()
+    after_commit(session, dropped)
+    await session.rollback()
+
+    async with session.begin():
+        after_commit(session, kept)
+
+    dropped.assert_not_called()
+    kept.assert_called_once()
@@ -0,0 +1,53 @@
+import asyncio
+
+from app.db.models.enums import NotificationChannel
+from app.workers.limits import DispatchLimits
+
+async def peak_concurrency(limits: DispatchLimits, channels: list[NotificationChannel]) -> dict:
+    running = {"total": 0, **{c: 0 for c in NotificationChannel}}
+    peak = dict(running)
+
+    async def task(channel):
+        async with limits.slot(channel):
+            running["total"] += 1
+            running[channel] += 1
+            peak["total"] = max(peak["total"], running["total"])
+            peak[channel] = max(peak[channel], running[channel])
+            await asyncio.sleep(0.01)
+            running["total"] -= 1
+            running[channel] -= 1
+
+    await asyncio.gather(*(task(c) for c in channels))
+    return peak
+
+async def test_slots_cap_channel_and_total_concurrency():
+    limits = DispatchLimits(
+        max_concurrency=5,
+        channel_concurrency={NotificationChannel.EMAIL: 2, NotificationChannel.TELEGRAM: 10}
+    )
+
+    peak = await peak_concurrency(
+        limits,
+        [NotificationChannel.EMAIL] * 10
+        + [NotificationChannel.TELEGRAM] * 10
+        + [NotificationChannel.IN_APP] * 10
+    )
+
+    assert peak[NotificationChannel.EMAIL] == 2
+    assert peak["total"] == 5
+
+async def test_saturated_channel_does_not_hold_global_slots():
+    limits = DispatchLimits(
+        max_concurrency=3,
+        channel_concurrency={NotificationChannel.EMAIL: 1}
+    )
+
+    peak = await peak_concurrency(
+        limits,
+        [NotificationChannel.EMAIL] * 5 + [NotificationChannel.TELEGRAM] * 5
+    )
+
+    # Emails queued on their channel slot leave the global slots free.
+    assert peak[NotificationChannel.EMAIL] == 1
+    assert peak[NotificationChannel.TELEGRAM] >= 2
+    assert peak["total"] == 3
@@ -0,0 +1,56 @@
+import asyncio
+import uuid
+
+import pytest
+
+from app.db.models.enums import EventType
+from app.errors.event_error import EventBufferFullError
+from app.services.event_buffer import EventBuffer
+from app.services.event_service import EventResult, SystemEvent
+
+
+def make_event():
+    return SystemEvent(type=EventType.ORDER_PAID, user_id=uuid.uuid4(), payload={"order_id": 1})
+
+def make_buffer(**kwargs):
+    options = dict(maxsize=100, flush_size=10, flush_interval=0.05, put_timeout=0.05, wait_for_commit=True)
+    options.update(kwargs)
+    return EventBuffer(**options)
+
+async def test_events_are_committed_in_groups():
+    flushed = []
+
+    async def flush(events):
+        flushed.append(len(events))
+        return [EventResult(notification_id=uuid.uuid4()) for _ in events]
+
+    buffer = make_buffer(flush_size=3)
+    flusher = asyncio.create_task(buffer.run(flush=flush))
+
+    results = await asyncio.gather(*(buffer.submit(make_event()) for _ in range(7)))
+
+    flusher.cancel()
+
+    assert all(r.notification_id is not None for r in results)
+    assert sum(flushed) == 7
+    assert max(flushed) == 3
+
+async def test_flush_failure_reaches_waiting_requests():
+    async def flush(events):
+        raise RuntimeError("db down")
+
+    buffer = make_buffer()
+    flusher = asyncio.create_task(buffer.run(flush=flush))
+
+    with pytest.raises(RuntimeError):
+        await buffer.submit(make_event())
+
+    flusher.cancel()
+
+async def test_full_buffer_applies_backpressure():
+    buffer = make_buffer(maxsize=1, wait_for_commit=False)
+
+    assert await buffer.submit(make_event()) is None
+
+    with pytest.raises(EventBufferFullError):
+        await buffer.submit(make_event())
@@ -0,0 +1,114 @@
+import uuid
+import pytest
+from unittest.mock import AsyncMock, Mock
+
+from app.db.models.enums import EventType
+from app.db.models.notification import Notification
+from app.errors.event_error import DuplicateEventError
+from app.services.event_service import EventService, SystemEvent
+
+
+async def test_handle_system_events_reports_per_item_status():
+    known, unknown = uuid.uuid4(), uuid.uuid4()
+
+    user_service = Mock()
+    user_service.touch_many = AsyncMock(return_value={known})
+
+    notification_service = Mock()
+    notification_service.create_notifications = AsyncMock(
+        side_effect=lambda *, drafts: [Notification(id=uuid.uuid4(), user_id=d.user_id) for d in drafts]
+    )
+
+    service = EventService(user_service=user_service, notification_service=notification_service)
+
+    results = await service.handle_system_events([
+        SystemEvent(type=EventType.ORDER_PAID, user_id=known, payload={"order_id": 1}),
+        SystemEvent(type=EventType.ORDER_PAID, user_id=known, payload={}),
+        SystemEvent(type=EventType.ORDER_PAID, user_id=unknown, payload={"order_id": 2}),
+        SystemEvent(type=EventType.ORDER_PAID, user_id=known, payload={"order_id": 3}),
+    ])
+
+    assert [r.error is None for r in results] == [True, False, False, True]
+    assert results[2].error == "user not found"
+
+    notification_service.create_notifications.assert_awaited_once()
+    drafts = notification_service.create_notifications.await_args.kwargs["drafts"]
+    assert [d.message for d in drafts] == ["Заказ №1 успешно оплачен", "Заказ №3 успешно оплачен"]
+
+async def test_duplicate_event_is_rejected_before_rendering():
+    user_service = Mock()
+    user_service.update_last_active = AsyncMock()
+    notification_service = Mock()
+    notification_service.create_notification = AsyncMock()
+    idempotency = Mock()
+    idempotency.claim = AsyncMock(return_value=set())
+
+    service = EventService(
+        user_service=user_service,
+        notification_service=notification_service,
+        idempotency=idempotency
+    )
+
+    with pytest.raises(DuplicateEventError):
+        await service.handle_system_event(
+            event_type=EventType.ORDER_PAID,
+            user_id=uuid.uuid4(),
+            payload={},
+            idempotency_key="order-1-paid"
+        )
+
+    user_service.update_last_active.assert_not_awaited()
+    notification_service.create_notification.assert_not_awaited()
+
+async def test_batch_marks_repeated_keys_duplicate():
+    user_id = uuid.uuid4()
+    user_service = Mock()
+    user_service.touch_many = AsyncMock(return_value={user_id})
+    notification_service = Mock()
+    notification_service.create_notifications = AsyncMock(
+        side_effect=lambda *, drafts: [Notification(id=uuid.uuid4()) for _ in drafts]
+    )
+    idempotency = Mock()
+    idempotency.claim = AsyncMock(return_value={"k1"})
+
+    service = EventService(
+        user_service=user_service,
+        notification_service=notification_service,
+        idempotency=idempotency
+    )
+
+    results = await service.handle_system_events([
+        SystemEvent(type=EventType.ORDER_PAID, user_id=user_id, payload={"order_id": 1}, idempotency_key="k1"),
+        SystemEvent(type=EventType.ORDER_PAID, user_id=user_id, payload={"order_id": 1}, idempotency_key="k1"),
+        SystemEvent(type=EventType.ORDER_PAID, user_id=user_id, payload={"order_id": 2}, idempotency_key="k2"),
+    ])
+
+    assert [r.duplicate for r in results] == [False, True, True]
+    assert results[0].notification_id is not None
+
+async def test_batch_releases_keys_of_failed_events():
+    known, unknown = uuid.uuid4(), uuid.uuid4()
+    user_service = Mock()
+    user_service.touch_many = AsyncMock(return_value={known})
+    notification_service = Mock()
+    notification_service.create_notifications = AsyncMock(
+        side_effect=lambda *, drafts: [Notification(id=uuid.uuid4()) for _ in drafts]
+    )
+    idempotency = Mock()
+    idempotency.claim = AsyncMock(side_effect=lambda *, keys: set(keys))
+    idempotency.release = AsyncMock()
+
+    service = EventService(
+        user_service=user_service,
+        notification_service=notification_service,
+        idempotency=idempotency
+    )
+
+    results = await service.handle_system_events([
+        SystemEvent(type=EventType.ORDER_PAID, user_id=known, payload={"order_id": 1}, idempotency_key="ok"),
+        SystemEvent(type=EventType.ORDER_PAID, user_id=known, payload={}, idempotency_key="bad-payload"),
+        SystemEvent(type=EventType.ORDER_PAID, user_id=unknown, payload={"order_id": 2}, idempotency_key="no-user"),
+    ])
+
+    assert [r.error is None for r in results] == [True, False, False]
+    idempotency.release.assert_awaited_once_with(keys=["bad-payload", "no-user"])
@@ -0,0 +1,61 @@
+from unittest.mock import AsyncMock, Mock
+
+from app.services.idempotency_service import IdempotencyService, RecentKeys
+
+
+def make_service(claimed):
+    repo = Mock()
+    repo.claim = AsyncMock(side_effect=lambda *, keys: {k for k in keys if k in claimed})
+    repo.release = AsyncMock()
+    repo.after_commit = Mock()
+    return IdempotencyService(event_key_repo=repo, recent=RecentKeys(maxsize=10)), repo
+
+def commit(repo):
+    for call in repo.after_commit.call_args_list:
+        call.args[0]()
+    repo.after_commit.reset_mock()
+
+async def test_claimed_key_is_cached_after_commit():
+    service, repo = make_service(claimed={"a"})
+
+    assert await service.claim(keys=["a"]) == {"a"}
+    commit(repo)
+
+    assert await service.claim(keys=["a"]) == set()
+    repo.claim.assert_awaited_once()
+
+async def test_uncommitted_key_is_not_cached():
+    service, repo = make_service(claimed={"a"})
+
+    assert await service.claim(keys=["a"]) == {"a"}
+    assert await service.claim(keys=["a"]) == {"a"}
+    assert repo.claim.await_count == 2
+
+async def test_key_taken_elsewhere_is_cached():
+    service, repo = make_service(claimed=set())
+
+    assert await service.claim(keys=["a"]) == set()
+    assert await service.claim(keys=["a"]) == set()
+    repo.claim.assert_awaited_once()
+
+async def test_released_key_is_not_cached():
+    service, repo = make_service(claimed={"a", "b"})
+
+    assert await service.claim(keys=["a", "b"]) == {"a", "b"}
+    await service.release(keys=["a", "c"])
+    commit(repo)
+
+    repo.release.assert_awaited_once_with(keys=["a"])
+    assert await service.claim(keys=["a", "b"]) == {"a"}
+
+def test_recent_keys_evicts_least_recently_used():
+    recent = RecentKeys(maxsize=2)
+    recent.add("a")
+    recent.add("b")
+    assert "a" in recent
+
+    recent.add("c")
+
+    assert "a" in recent
+    assert "b" not in recent
+    assert "c" in recent
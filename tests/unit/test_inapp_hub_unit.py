@@ -0,0 +1,35 @@
+import uuid
+
+from app.db.models.notification import Notification
+from app.services.inapp_hub import InAppHub
+
+
+def test_publish_reaches_only_the_recipients_streams():
+    hub = InAppHub()
+    user_id = uuid.uuid4()
+    first, second = hub.subscribe(user_id), hub.subscribe(user_id)
+    other = hub.subscribe(uuid.uuid4())
+
+    delivered = hub.publish(Notification(id=uuid.uuid4(), user_id=user_id))
+
+    assert delivered == 2
+    assert first.qsize() == second.qsize() == 1
+    assert other.empty()
+
+def test_publish_drops_when_stream_is_full():
+    hub = InAppHub(queue_size=1)
+    user_id = uuid.uuid4()
+    queue = hub.subscribe(user_id)
+
+    assert hub.publish(Notification(id=uuid.uuid4(), user_id=user_id)) == 1
+    assert hub.publish(Notification(id=uuid.uuid4(), user_id=user_id)) == 0
+    assert queue.qsize() == 1
+
+def test_unsubscribe():
+    hub = InAppHub()
+    user_id = uuid.uuid4()
+    queue = hub.subscribe(user_id)
+
+    hub.unsubscribe(user_id, queue)
+
+    assert hub.publish(Notification(id=uuid.uuid4(), user_id=user_id)) == 0
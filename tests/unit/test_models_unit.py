@@ -0,0 +1,22 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+
+from app.db.models.notification import Notification
+from app.db.models.rate_limit_bucket import RateLimitBucket
+from app.db.models.user import User
+
+
+@pytest.mark.parametrize(
+    "column",
+    [
+        Notification.__table__.c.next_attempt_at,
+        Notification.__table__.c.updated_at,
+        RateLimitBucket.__table__.c.updated_at,
+        User.__table__.c.last_active,
+    ]
+)
+def test_timestamp_defaults_are_taken_per_row(column):
+    assert column.default.is_callable
+
+    value = column.default.arg(None)
+    assert datetime.now(timezone.utc) - value < timedelta(seconds=1)
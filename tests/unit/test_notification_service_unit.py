@@ -1,17 +1,25 @@
+import asyncio
 import uuid
 import pytest
-from unittest.mock import AsyncMock
-from app.db.models.enums import NotificationChannel, NotificationStatus
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, Mock
+from app.db.models.enums import EventCategory, NotificationChannel, NotificationPriority, NotificationStatus
+from app.db.models.campaign import Campaign
+from app.db.models.notification import Notification
+from app.db.settings import BackoffPolicy, BreakerPolicy
 from app.errors.notification_error import FatalError, TemporaryError
+from app.services.circuit_breaker import BreakerState, CircuitBreaker, create_breakers
+from app.services.inapp_hub import InAppHub
+from app.services.notification_service import DeliveryOutcome, NotificationService
 
 
 @pytest.mark.parametrize(
-    "initial_attempts, sender_error, expected_status, expected_attempts",
+    "initial_attempts, sender_error, expected_status",
     [
-        (0, None, NotificationStatus.SENT, 1),
-        (0, TemporaryError("temp"), NotificationStatus.PENDING, 1),
-        (4, TemporaryError("temp"), NotificationStatus.FAILED, 5),
-        (0, FatalError("fatal"), NotificationStatus.FAILED, 1),
+        (0, None, NotificationStatus.SENT),
+        (0, TemporaryError("temp"), NotificationStatus.PENDING),
+        (4, TemporaryError("temp"), NotificationStatus.FAILED),
+        (0, FatalError("fatal"), NotificationStatus.FAILED),
     ]
 )
 async def test_process_sending(
@@ -22,57 +30,57 @@ async def test_process_sending(
     initial_attempts,
     sender_error,
     expected_status,
-    expected_attempts,
 ):
     notification.attempts = initial_attempts
     notification.status = NotificationStatus.PROCESSING
+    sender.send = AsyncMock(side_effect=sender_error)
 
-    if sender_error:
-        sender.send = AsyncMock(side_effect=sender_error)
-    else:
-        sender.send = AsyncMock(return_value=None)
+    lease_owner = uuid.uuid4()
 
-    await service.process_sending(notification=notification)
+    outcome = await service.deliver(notification=notification)
+    await service.record_outcomes(outcomes=[outcome], lease_owner=lease_owner)
 
-    repository.update_attempts.assert_awaited_once()
+    repository.bulk_transition.assert_awaited_once()
 
-    if expected_status == NotificationStatus.SENT:
-        repository.mark_status.assert_awaited_with(
-            notification_id=notification.id,
-            status=NotificationStatus.SENT
-        )
-    elif expected_status == NotificationStatus.PENDING:
-        repository.mark_status.assert_awaited_with(
-            notification_id=notification.id,
-            status=NotificationStatus.PENDING
-        )
-    else:
-        repository.mark_status.assert_awaited_with(
-            notification_id=notification.id,
-            status=NotificationStatus.FAILED
-        )
+    kwargs = repository.bulk_transition.await_args.kwargs
+    assert kwargs["ids"] == [notification.id]
+    assert kwargs["status"] == expected_status
+    assert kwargs["lease_owner"] == lease_owner
+    assert kwargs["count_attempt"] is True
+    assert (kwargs["next_attempt_at"] is not None) == (expected_status == NotificationStatus.PENDING)
 
-    assert notification.attempts + 1 == expected_attempts
+    repository.update_attempts.assert_not_awaited()
+    repository.transition.assert_not_awaited()
 
 async def test_get_processing(
     service,
     repository,
     notifications
 ):
-    repository.get_pending = AsyncMock(return_value=notifications)
+    repository.claim_pending = AsyncMock(side_effect=[notifications[:9], notifications[9:]])
 
     service.mark_as_processing = AsyncMock()
 
-    await service.get_processing(limit=10)
+    lease_owner = uuid.uuid4()
 
-    repository.get_pending.assert_awaited_once_with(limit=10)
-
-    assert service.mark_as_processing.await_count == len(notifications)
+    result = await service.get_processing(
+        channel=NotificationChannel.IN_APP,
+        limit=10,
+        lease_owner=lease_owner
+    )
 
-    service.mark_as_processing.assert_any_await(
-        notification_id=notifications[0].id
+    repository.claim_pending.assert_any_await(
+        channel=NotificationChannel.IN_APP,
+        priority=NotificationPriority.HIGH,
+        limit=9,
+        lease_owner=lease_owner
     )
 
+    assert result == notifications
+
+    service.mark_as_processing.assert_not_awaited()
+    repository.get_by_id.assert_not_awaited()
+
 @pytest.mark.parametrize(
     "initial_status, expect_error", 
     [
@@ -93,17 +101,20 @@ async def test_mark_as_processing(
         with pytest.raises(ValueError):
             await service.mark_as_processing(notification_id=notification.id)
 
-        repository.mark_status.assert_not_awaited()
+        assert notification.status == initial_status
 
     else:
         await service.mark_as_processing(notification_id=notification.id)
 
-        repository.get_by_id.assert_awaited_once_with(id=notification.id)
+        assert notification.status == NotificationStatus.PROCESSING
 
-        repository.mark_status.assert_awaited_once_with(
-            notification_id=notification.id,
-            status=NotificationStatus.PROCESSING
-        )
+    repository.get_by_id.assert_not_awaited()
+    repository.mark_status.assert_not_awaited()
+    repository.transition.assert_awaited_once_with(
+        notification_id=notification.id,
+        expected=NotificationStatus.PENDING,
+        status=NotificationStatus.PROCESSING
+    )
 
 @pytest.mark.parametrize(
     "initial_status, expect_error", 
@@ -125,17 +136,20 @@ async def test_mark_as_sent(
         with pytest.raises(ValueError):
             await service.mark_as_sent(notification_id=notification.id)
 
-        repository.mark_status.assert_not_awaited()
+        assert notification.status == initial_status
 
     else:
         await service.mark_as_sent(notification_id=notification.id)
 
-        repository.get_by_id.assert_awaited_once_with(id=notification.id)
+        assert notification.status == NotificationStatus.SENT
 
-        repository.mark_status.assert_awaited_once_with(
-            notification_id=notification.id,
-            status=NotificationStatus.SENT
-        )
+    repository.get_by_id.assert_not_awaited()
+    repository.mark_status.assert_not_awaited()
+    repository.transition.assert_awaited_once_with(
+        notification_id=notification.id,
+        expected=NotificationStatus.PROCESSING,
+        status=NotificationStatus.SENT
+    )
 
 @pytest.mark.parametrize(
     "initial_status, expect_error", 
@@ -157,17 +171,20 @@ async def test_mark_as_failed(
         with pytest.raises(ValueError):
             await service.mark_as_failed(notification_id=notification.id)
 
-        repository.mark_status.assert_not_awaited()
+        assert notification.status == initial_status
 
     else:
         await service.mark_as_failed(notification_id=notification.id)
 
-        repository.get_by_id.assert_awaited_once_with(id=notification.id)
+        assert notification.status == NotificationStatus.FAILED
 
-        repository.mark_status.assert_awaited_once_with(
-            notification_id=notification.id,
-            status=NotificationStatus.FAILED
-        )
+    repository.get_by_id.assert_not_awaited()
+    repository.mark_status.assert_not_awaited()
+    repository.transition.assert_awaited_once_with(
+        notification_id=notification.id,
+        expected=NotificationStatus.PROCESSING,
+        status=NotificationStatus.FAILED
+    )
 
 @pytest.mark.parametrize(
     "initial_status, expect_error", 
@@ -189,17 +206,20 @@ async def test_mark_as_pending(
         with pytest.raises(ValueError):
             await service.mark_as_pending(notification_id=notification.id)
 
-        repository.mark_status.assert_not_awaited()
+        assert notification.status == initial_status
 
     else:
         await service.mark_as_pending(notification_id=notification.id)
 
-        repository.get_by_id.assert_awaited_once_with(id=notification.id)
+        assert notification.status == NotificationStatus.PENDING
 
-        repository.mark_status.assert_awaited_once_with(
-            notification_id=notification.id,
-            status=NotificationStatus.PENDING
-        )
+    repository.get_by_id.assert_not_awaited()
+    repository.mark_status.assert_not_awaited()
+    repository.transition.assert_awaited_once_with(
+        notification_id=notification.id,
+        expected=NotificationStatus.PROCESSING,
+        status=NotificationStatus.PENDING
+    )
 
 @pytest.mark.parametrize(
     "initial_status, expected_error", 
@@ -250,3 +270,401 @@ async def test_create_notification(service, repository):
 
 
     
+
+async def test_retry_after_postpones_next_attempt(service, repository, sender, notification):
+    notification.status = NotificationStatus.PROCESSING
+    sender.send = AsyncMock(side_effect=TemporaryError("temp", retry_after=3600))
+
+    outcome = await service.deliver(notification=notification)
+    await service.record_outcomes(outcomes=[outcome])
+
+    [next_attempt_at] = repository.bulk_transition.await_args.kwargs["next_attempt_at"]
+    assert next_attempt_at - datetime.now(timezone.utc) > timedelta(minutes=59)
+
+def test_backoff_policy_grows_and_caps():
+    policy = BackoffPolicy(base_delay=1, multiplier=2, max_delay=10, jitter=0)
+
+    assert [policy.delay(a) for a in range(1, 6)] == [1, 2, 4, 8, 10]
+
+@pytest.mark.parametrize(
+    "due_in, expected",
+    [
+        (None, 30),
+        (timedelta(seconds=-5), 0),
+        (timedelta(hours=1), 30),
+    ]
+)
+async def test_next_due_in(service, repository, due_in, expected):
+    due = None if due_in is None else datetime.now(timezone.utc) + due_in
+    repository.next_attempt_due = AsyncMock(return_value=due)
+
+    assert await service.next_due_in(default=30) == expected
+
+@pytest.mark.parametrize(
+    "initial_attempts, sender_error, expected_status",
+    [
+        (0, None, NotificationStatus.SENT),
+        (0, TemporaryError("temp"), NotificationStatus.PENDING),
+        (4, TemporaryError("temp"), NotificationStatus.FAILED),
+        (0, FatalError("fatal"), NotificationStatus.FAILED),
+        (0, RuntimeError("boom"), NotificationStatus.PENDING),
+    ]
+)
+async def test_deliver(
+    service,
+    repository,
+    sender,
+    notification,
+    initial_attempts,
+    sender_error,
+    expected_status
+):
+    notification.attempts = initial_attempts
+    sender.send = AsyncMock(side_effect=sender_error)
+
+    outcome = await service.deliver(notification=notification)
+
+    assert outcome.status == expected_status
+    assert (outcome.next_attempt_at is not None) == (expected_status == NotificationStatus.PENDING)
+    repository.update_attempts.assert_not_awaited()
+    repository.mark_status.assert_not_awaited()
+
+async def test_record_outcomes_one_update_per_status(service, repository):
+    def make(status, next_attempt_at=None):
+        n = Notification(id=uuid.uuid4(), channel=NotificationChannel.IN_APP, attempts=0, message="m")
+        return DeliveryOutcome(n, status, next_attempt_at=next_attempt_at)
+
+    due = datetime.now(timezone.utc)
+    outcomes = [
+        make(NotificationStatus.SENT),
+        make(NotificationStatus.SENT),
+        make(NotificationStatus.PENDING, due),
+        make(NotificationStatus.FAILED),
+    ]
+
+    await service.record_outcomes(outcomes=outcomes)
+
+    assert repository.bulk_transition.await_count == 3
+
+    calls = {c.kwargs["status"]: c.kwargs for c in repository.bulk_transition.await_args_list}
+    assert calls[NotificationStatus.SENT]["ids"] == [o.notification.id for o in outcomes[:2]]
+    assert calls[NotificationStatus.SENT]["next_attempt_at"] is None
+    assert calls[NotificationStatus.PENDING]["next_attempt_at"] == [due]
+
+async def test_deliver_many_maps_per_item_results(repository, user_service):
+    class BatchSender:
+        async def startup(self): ...
+        async def shutdown(self): ...
+        async def send(self, notification): ...
+        async def send_many(self, notifications):
+            return [None, TemporaryError("temp"), FatalError("fatal")]
+
+    service = NotificationService(
+        notification_repo=repository,
+        user_service=user_service,
+        senders={NotificationChannel.EMAIL: BatchSender()},
+        breakers=create_breakers(),
+    )
+    notifications = [
+        Notification(id=uuid.uuid4(), channel=NotificationChannel.EMAIL, attempts=0, message="m")
+        for _ in range(3)
+    ]
+
+    assert service.sends_in_batches(channel=NotificationChannel.EMAIL)
+
+    outcomes = await service.deliver_many(notifications=notifications)
+
+    assert [o.notification for o in outcomes] == notifications
+    assert [o.status for o in outcomes] == [
+        NotificationStatus.SENT,
+        NotificationStatus.PENDING,
+        NotificationStatus.FAILED,
+    ]
+
+async def test_record_outcomes_deferred_keeps_attempt(service, repository, notification):
+    outcome = service.defer(notification=notification, delay=10, reason="rate limited")
+
+    await service.record_outcomes(outcomes=[outcome])
+
+    repository.bulk_transition.assert_awaited_once()
+    kwargs = repository.bulk_transition.await_args.kwargs
+    assert kwargs["status"] == NotificationStatus.PENDING
+    assert kwargs["count_attempt"] is False
+    assert kwargs["next_attempt_at"] == [outcome.next_attempt_at]
+
+async def test_deliver_defers_when_circuit_open(service, sender, notification, breakers):
+    breaker = breakers[NotificationChannel.IN_APP]
+    for _ in range(5):
+        breaker.record_failure()
+
+    outcome = await service.deliver(notification=notification)
+
+    sender.send.assert_not_awaited()
+    assert outcome.status == NotificationStatus.PENDING
+    assert outcome.spend_attempt is False
+    assert service.channel_retry_in(channel=NotificationChannel.IN_APP) > 0
+
+async def test_cancelled_probe_releases_half_open_slot(repository, user_service, sender, notification):
+    breakers = {
+        NotificationChannel.IN_APP: CircuitBreaker(
+            name="in_app",
+            policy=BreakerPolicy(failure_threshold=1, recovery_timeout=0.05)
+        )
+    }
+    service = NotificationService(
+        notification_repo=repository,
+        user_service=user_service,
+        senders={NotificationChannel.IN_APP: sender},
+        breakers=breakers
+    )
+    breaker = breakers[NotificationChannel.IN_APP]
+    breaker.record_failure()
+    await asyncio.sleep(0.06)
+
+    sender.send = AsyncMock(side_effect=asyncio.CancelledError)
+    with pytest.raises(asyncio.CancelledError):
+        await service.deliver(notification=notification)
+
+    assert breaker.state == BreakerState.OPEN
+    await asyncio.sleep(0.06)
+    assert service.channel_retry_in(channel=NotificationChannel.IN_APP) == 0
+
+async def test_deliver_send_deadline(repository, user_service, notification):
+    class SlowSender:
+        async def send(self, notification):
+            await asyncio.sleep(1)
+
+    service = NotificationService(
+        notification_repo=repository,
+        user_service=user_service,
+        senders={NotificationChannel.IN_APP: SlowSender()},
+        breakers=create_breakers(),
+        send_timeouts={NotificationChannel.IN_APP: 0.01},
+    )
+
+    outcome = await service.deliver(notification=notification)
+
+    assert outcome.status == NotificationStatus.PENDING
+    assert outcome.reason == "send deadline exceeded"
+
+@pytest.mark.parametrize(
+    "pending_high, pending_low, expected_high, expected_low",
+    [
+        (20, 20, 9, 1),
+        (20, 0, 10, 0),
+        (3, 20, 3, 7),
+    ]
+)
+async def test_get_processing_reserves_low_priority_share(
+    service,
+    repository,
+    pending_high,
+    pending_low,
+    expected_high,
+    expected_low
+):
+    pending = {
+        NotificationPriority.HIGH: [
+            Notification(id=uuid.uuid4(), priority=NotificationPriority.HIGH) for _ in range(pending_high)
+        ],
+        NotificationPriority.LOW: [
+            Notification(id=uuid.uuid4(), priority=NotificationPriority.LOW) for _ in range(pending_low)
+        ],
+    }
+
+    async def claim_pending(*, channel, priority, limit, lease_owner):
+        claimed, pending[priority] = pending[priority][:limit], pending[priority][limit:]
+        return claimed
+
+    repository.claim_pending = AsyncMock(side_effect=claim_pending)
+
+    result = await service.get_processing(channel=NotificationChannel.IN_APP, limit=10)
+
+    priorities = [n.priority for n in result]
+    assert priorities.count(NotificationPriority.HIGH) == expected_high
+    assert priorities.count(NotificationPriority.LOW) == expected_low
+
+@pytest.mark.parametrize(
+    "channel, expected_status",
+    [
+        (NotificationChannel.IN_APP, NotificationStatus.SENT),
+        (NotificationChannel.EMAIL, NotificationStatus.PENDING),
+    ]
+)
+async def test_create_notification_inapp_fast_path(repository, user_service, channel, expected_status):
+    hub = InAppHub()
+    user_id = uuid.uuid4()
+    pushed = hub.subscribe(user_id)
+
+    service = NotificationService(
+        notification_repo=repository,
+        user_service=user_service,
+        senders={},
+        inapp_hub=hub,
+        inapp_fast_path=True,
+    )
+
+    notification = await service.create_notification(
+        user_id=user_id,
+        message="test_message",
+        channel=channel,
+    )
+
+    assert notification.status == expected_status
+    assert pushed.empty()
+
+    for call in repository.after_commit.call_args_list:
+        call.args[0]()
+
+    assert pushed.qsize() == (1 if expected_status == NotificationStatus.SENT else 0)
+
+async def test_create_for_category_fans_out_in_database(service, repository, user_service):
+    await service.create_for_category(
+        title="title",
+        message="message",
+        category=EventCategory.GENERAL,
+        channel=NotificationChannel.IN_APP,
+    )
+
+    repository.fan_out.assert_awaited_once()
+    assert repository.fan_out.await_args.kwargs["priority"] == NotificationPriority.LOW
+    user_service.get_all_active.assert_not_awaited()
+    repository.bulk_create.assert_not_called()
+
+@pytest.fixture
+def campaign_repo():
+    repo = Mock()
+    repo.create = AsyncMock()
+    repo.list_unread = AsyncMock(return_value=[])
+    repo.get_visible = AsyncMock(return_value=None)
+    repo.mark_read = AsyncMock(return_value=True)
+    return repo
+
+@pytest.fixture
+def campaign_service(repository, user_service, campaign_repo):
+    return NotificationService(
+        notification_repo=repository,
+        user_service=user_service,
+        senders={},
+        campaign_repo=campaign_repo,
+    )
+
+async def test_inapp_broadcast_creates_one_campaign(campaign_service, repository, campaign_repo):
+    await campaign_service.create_for_category(
+        title="title",
+        message="message",
+        category=EventCategory.GENERAL,
+        channel=NotificationChannel.IN_APP,
+    )
+
+    campaign_repo.create.assert_awaited_once()
+    repository.fan_out.assert_not_awaited()
+
+async def test_get_sent_merges_campaigns(campaign_service, repository, campaign_repo):
+    user_id = uuid.uuid4()
+    now = datetime.now(timezone.utc)
+    direct = Notification(id=uuid.uuid4(), user_id=user_id, status=NotificationStatus.SENT, created_at=now - timedelta(minutes=2))
+    campaign = Campaign(id=uuid.uuid4(), title="t", message="m", channel=NotificationChannel.IN_APP, created_at=now)
+
+    repository.list_by_user = AsyncMock(return_value=[direct])
+    campaign_repo.list_unread = AsyncMock(return_value=[campaign])
+
+    inbox = await campaign_service.get_sent(user_id=user_id)
+
+    assert [n.id for n in inbox] == [campaign.id, direct.id]
+    assert inbox[0].user_id == user_id
+    assert inbox[0].status == NotificationStatus.SENT
+
+async def test_mark_campaign_read(campaign_service, repository, campaign_repo):
+    user_id = uuid.uuid4()
+    campaign = Campaign(id=uuid.uuid4())
+    campaign_repo.get_visible = AsyncMock(return_value=campaign)
+
+    await campaign_service.mark_as_read(notification_id=campaign.id, user_id=user_id)
+
+    campaign_repo.mark_read.assert_awaited_once_with(campaign_id=campaign.id, user_id=user_id)
+    repository.get_by_id.assert_not_awaited()
+
+async def test_coalesce_merges_burst_into_digest(repository, user_service):
+    repository.bulk_create = AsyncMock()
+    repository.link_to_digest = AsyncMock(side_effect=lambda *, ids, **kwargs: ids)
+    service = NotificationService(
+        notification_repo=repository,
+        user_service=user_service,
+        digest_windows={NotificationChannel.EMAIL: 60}
+    )
+
+    busy, quiet = uuid.uuid4(), uuid.uuid4()
+    start = datetime.now(timezone.utc)
+
+    def claimed(user_id, seconds, attempts=0, channel=NotificationChannel.EMAIL):
+        return Notification(
+            id=uuid.uuid4(),
+            user_id=user_id,
+            channel=channel,
+            priority=NotificationPriority.LOW,
+            message=f"message {seconds}",
+            attempts=attempts,
+            created_at=start + timedelta(seconds=seconds)
+        )
+
+    burst = [claimed(busy, 0), claimed(busy, 10), claimed(busy, 30)]
+    late = claimed(busy, 120)
+    retried = claimed(busy, 5, attempts=1)
+    single = claimed(quiet, 0)
+    inapp = claimed(busy, 1, channel=NotificationChannel.IN_APP)
+    lease_owner = uuid.uuid4()
+
+    result = await service.coalesce(
+        notifications=[*burst, late, retried, single, inapp],
+        lease_owner=lease_owner
+    )
+
+    digest = result[0]
+    assert result[1:] == [late, retried, single, inapp]
+    assert digest.digest_size == 3
+    assert digest.message == "message 0\nmessage 10\nmessage 30"
+    assert digest.status == NotificationStatus.PROCESSING
+    assert digest.lease_owner == lease_owner
+
+    repository.bulk_create.assert_awaited_once_with(notifications=[digest])
+    repository.link_to_digest.assert_awaited_once_with(
+        ids=[n.id for n in burst],
+        digest_ids=[digest.id] * 3,
+        lease_owner=lease_owner
+    )
+
+async def test_coalesce_skips_originals_it_could_not_link(repository, user_service):
+    repository.bulk_create = AsyncMock()
+    service = NotificationService(
+        notification_repo=repository,
+        user_service=user_service,
+        digest_windows={NotificationChannel.EMAIL: 60}
+    )
+    user_id = uuid.uuid4()
+    claimed = [
+        Notification(
+            id=uuid.uuid4(),
+            user_id=user_id,
+            channel=NotificationChannel.EMAIL,
+            message=f"message {i}",
+            attempts=0,
+            created_at=datetime.now(timezone.utc)
+        )
+        for i in range(3)
+    ]
+    repository.link_to_digest = AsyncMock(return_value=[claimed[0].id, claimed[2].id])
+
+    result = await service.coalesce(notifications=claimed, lease_owner=uuid.uuid4())
+
+    assert len(result) == 1
+    assert result[0].digest_size == 2
+    assert result[0].message == "message 0\nmessage 2"
+
+async def test_coalesce_without_window_is_a_no_op(service, repository, notifications):
+    repository.bulk_create = AsyncMock()
+
+    result = await service.coalesce(notifications=notifications, lease_owner=uuid.uuid4())
+
+    assert result == notifications
+    repository.bulk_create.assert_not_awaited()
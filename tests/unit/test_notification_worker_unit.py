@@ -0,0 +1,60 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, Mock
+
+from app.db.models.enums import NotificationChannel
+from app.workers import notification_worker
+from app.workers.limits import DispatchLimits
+from app.workers.notification_worker import WorkerContext, process_one, run_worker
+
+class FakeListener:
+    def subscribe(self, channel):
+        return asyncio.Event()
+
+    async def wait(self, wakeup, *, timeout):
+        return False
+
+    def wake(self, channel=None):
+        pass
+
+    async def run(self):
+        await asyncio.Event().wait()
+
+def make_ctx() -> WorkerContext:
+    return WorkerContext(
+        limits=DispatchLimits(max_concurrency=1, channel_concurrency={}),
+        listener=FakeListener()
+    )
+
+class FailingBegin:
+    async def __aenter__(self):
+        raise ConnectionError("db down")
+
+    async def __aexit__(self, *exc):
+        return False
+
+async def test_claim_failure_backs_off_without_raising(monkeypatch):
+    monkeypatch.setattr(notification_worker.settings, "WORKER_CLAIM_RETRY_DELAY", 0.01)
+    session = Mock()
+    session.begin = Mock(return_value=FailingBegin())
+    service = Mock()
+    service.channel_retry_in = Mock(return_value=0)
+
+    await process_one(session, service, Mock(), "email-0", NotificationChannel.EMAIL, make_ctx())
+
+    session.begin.assert_called_once()
+
+async def test_crashed_loop_stops_the_worker(monkeypatch):
+    async def crash(worker_id, channel, ctx):
+        raise ConnectionError("db down")
+
+    monkeypatch.setattr(notification_worker, "process_loop", crash)
+    monkeypatch.setattr(notification_worker, "create_listener", FakeListener)
+    monkeypatch.setattr(notification_worker, "start_senders", AsyncMock())
+    monkeypatch.setattr(notification_worker, "stop_senders", AsyncMock())
+
+    with pytest.raises(ConnectionError):
+        await asyncio.wait_for(
+            run_worker(workers={NotificationChannel.EMAIL: 1}),
+            timeout=1
+        )
@@ -0,0 +1,95 @@
+from contextlib import asynccontextmanager
+from datetime import date
+
+import pytest
+
+from app.maintenance import partitions
+from app.maintenance.partitions import month_start
+from app.repositories.partition_repository import DEFAULT_PARTITION, partition_name
+
+
+@pytest.mark.parametrize(
+    "day, offset, expected",
+    [
+        (date(2026, 10, 18), 0, date(2026, 10, 1)),
+        (date(2026, 12, 31), 1, date(2027, 1, 1)),
+        (date(2026, 1, 15), -1, date(2025, 12, 1)),
+        (date(2026, 10, 18), -12, date(2025, 10, 1)),
+    ]
+)
+def test_month_start(day, offset, expected):
+    assert month_start(day, offset) == expected
+
+def test_partition_names_sort_by_month():
+    names = [partition_name(date(2025, 12, 1)), partition_name(date(2026, 2, 1)), partition_name(date(2026, 10, 1))]
+
+    assert names == sorted(names)
+    assert names[0] == "Notifications_p202512"
+
+class FakeSession:
+    @asynccontextmanager
+    async def begin(self):
+        yield
+
+class FakePartitionRepository:
+    def __init__(self, existing, overflowed=()):
+        self.existing = existing
+        self.overflowed = set(overflowed)
+        self.calls = []
+
+    async def list_partitions(self):
+        return self.existing
+
+    async def default_has_rows(self, *, start, end):
+        return start in self.overflowed
+
+    async def detach_partition(self, *, name, drop=False):
+        self.calls.append(("detach", name))
+
+    async def create_partition(self, *, start, end):
+        self.calls.append(("create", partition_name(start)))
+        return partition_name(start)
+
+    async def move_from_default(self, *, start, end):
+        self.calls.append(("move", partition_name(start)))
+        return 1
+
+    async def attach_default(self):
+        self.calls.append(("attach", DEFAULT_PARTITION))
+
+@pytest.fixture
+def partition_repo(monkeypatch):
+    def setup(existing, overflowed=()):
+        repo = FakePartitionRepository(existing, overflowed)
+
+        @asynccontextmanager
+        async def session_maker():
+            yield FakeSession()
+
+        monkeypatch.setattr(partitions, "async_session_maker", session_maker)
+        monkeypatch.setattr(partitions, "PartitionRepository", lambda *, session: repo)
+        return repo
+
+    return setup
+
+async def test_ensure_partitions_creates_missing_months(partition_repo):
+    repo = partition_repo([DEFAULT_PARTITION, "Notifications_p202610"])
+
+    created = await partitions.ensure_partitions(months_ahead=2, today=date(2026, 10, 18))
+
+    assert created == ["Notifications_p202611", "Notifications_p202612"]
+    assert repo.calls == [("create", name) for name in created]
+
+async def test_ensure_partitions_moves_rows_out_of_default(partition_repo):
+    repo = partition_repo([DEFAULT_PARTITION], overflowed=[date(2026, 10, 1)])
+
+    created = await partitions.ensure_partitions(months_ahead=1, today=date(2026, 10, 18))
+
+    assert created == ["Notifications_p202610", "Notifications_p202611"]
+    assert repo.calls == [
+        ("detach", DEFAULT_PARTITION),
+        ("create", "Notifications_p202610"),
+        ("create", "Notifications_p202611"),
+        ("move", "Notifications_p202610"),
+        ("attach", DEFAULT_PARTITION),
+    ]
@@ -0,0 +1,65 @@
+import uuid
+import pytest
+from unittest.mock import AsyncMock, Mock
+
+from app.db.models.enums import NotificationChannel
+from app.db.models.notification import Notification
+from app.db.settings import RateLimit
+from app.repositories.rate_limit_repository import Grant
+from app.services.rate_limit_service import RateLimitService
+
+@pytest.fixture
+def rate_limit_repo():
+    repo = Mock()
+    repo.acquire = AsyncMock(return_value={})
+    repo.refund = AsyncMock(return_value=0)
+    return repo
+
+def make_notification(*, user_id: uuid.UUID, channel=NotificationChannel.TELEGRAM):
+    return Notification(id=uuid.uuid4(), user_id=user_id, channel=channel, message="m")
+
+async def test_admit_unlimited_channel_skips_db(rate_limit_repo):
+    service = RateLimitService(
+        rate_limit_repo=rate_limit_repo,
+        channel_limits={},
+        recipient_limits={}
+    )
+    notifications = [make_notification(user_id=uuid.uuid4()) for _ in range(3)]
+
+    admitted, throttled = await service.admit(notifications=notifications)
+
+    assert admitted == notifications
+    assert throttled == []
+    rate_limit_repo.acquire.assert_not_awaited()
+
+async def test_admit_splits_by_channel_and_recipient_grants(rate_limit_repo):
+    user, other = uuid.uuid4(), uuid.uuid4()
+    service = RateLimitService(
+        rate_limit_repo=rate_limit_repo,
+        channel_limits={NotificationChannel.TELEGRAM: RateLimit(rate=10, burst=10)},
+        recipient_limits={NotificationChannel.TELEGRAM: RateLimit(rate=1, burst=1)}
+    )
+    notifications = [
+        make_notification(user_id=user),
+        make_notification(user_id=user),
+        make_notification(user_id=other),
+    ]
+    rate_limit_repo.acquire = AsyncMock(return_value={
+        "channel:telegram": Grant(granted=3, tokens=7, rate=10),
+        f"recipient:telegram:{user}": Grant(granted=1, tokens=0, rate=1),
+        f"recipient:telegram:{other}": Grant(granted=1, tokens=0, rate=1),
+    })
+
+    admitted, throttled = await service.admit(notifications=notifications)
+
+    requests = rate_limit_repo.acquire.await_args.kwargs["requests"]
+    assert requests["channel:telegram"][0] == 3
+    assert requests[f"recipient:telegram:{user}"][0] == 2
+
+    assert admitted == [notifications[0], notifications[2]]
+    assert throttled == [(notifications[1], 1.0)]
+    rate_limit_repo.refund.assert_awaited_once_with(unused={
+        "channel:telegram": 1,
+        f"recipient:telegram:{user}": 0,
+        f"recipient:telegram:{other}": 0,
+    })
@@ -0,0 +1,89 @@
+import gzip
+import json
+import uuid
+from contextlib import asynccontextmanager
+from datetime import timedelta
+
+import pytest
+
+from app.db.models.notification import Notification
+from app.maintenance import retention
+
+
+class FakeSession:
+    def __init__(self):
+        self.transactions = 0
+
+    @asynccontextmanager
+    async def begin(self):
+        self.transactions += 1
+        yield
+
+class FakeRepository:
+    def __init__(self, rows):
+        self.rows = rows
+        self.locks = 0
+
+    async def lock_expired(self, *, statuses, before, limit):
+        self.locks += 1
+        return self.rows[:limit]
+
+    async def delete_by_ids(self, *, ids, before):
+        self.rows = [r for r in self.rows if r["id"] not in ids]
+        return len(ids)
+
+@pytest.fixture
+def purge(monkeypatch):
+    def setup(rows):
+        session = FakeSession()
+        repo = FakeRepository(rows)
+
+        @asynccontextmanager
+        async def session_maker():
+            yield session
+
+        monkeypatch.setattr(retention, "async_session_maker", session_maker)
+        monkeypatch.setattr(retention, "NotificationRepository", lambda *, session: repo)
+        return session, repo
+
+    return setup
+
+@pytest.mark.parametrize("count, batches", [(5, 3), (4, 3), (1, 1)])
+async def test_purge_terminal_batches(purge, tmp_path, count, batches):
+    rows = [{"id": uuid.uuid4(), "message": f"m{i}"} for i in range(count)]
+    session, repo = purge(list(rows))
+
+    total = await retention.purge_terminal(
+        older_than=timedelta(days=30),
+        batch_size=2,
+        archive_dir=tmp_path
+    )
+
+    assert total == count
+    assert repo.rows == []
+    assert repo.locks == session.transactions == batches
+
+    [archive] = tmp_path.iterdir()
+    with gzip.open(archive, "rt", encoding="utf-8") as f:
+        archived = [json.loads(line) for line in f]
+
+    assert [a["id"] for a in archived] == [str(r["id"]) for r in rows]
+
+async def test_purge_terminal_without_rows_leaves_no_archive(purge, tmp_path):
+    purge([])
+
+    total = await retention.purge_terminal(
+        older_than=timedelta(days=30),
+        batch_size=2,
+        archive_dir=tmp_path
+    )
+
+    assert total == 0
+    assert list(tmp_path.iterdir()) == []
+
+def test_terminal_index_matches_retention_statuses():
+    [index] = [i for i in Notification.__table__.indexes if i.name == "ix_Notifications_terminal_created_at"]
+    predicate = str(index.dialect_options["postgresql"]["where"])
+
+    for status in retention.TERMINAL_STATUSES:
+        assert f"'{status.value}'" in predicate
@@ -0,0 +1,165 @@
+import signal
+import pytest
+from structlog.testing import capture_logs
+
+from app.db.models.enums import NotificationChannel
+from app.workers import supervisor as supervisor_module
+from app.workers.supervisor import Supervisor, _child_main
+
+class FakeValue:
+    def __init__(self, typecode, value):
+        self.value = value
+
+class FakeProcess:
+    pids = iter(range(1000, 2000))
+
+    def __init__(self, *, target, args, name):
+        self.target = target
+        self.args = args
+        self.name = name
+        self.pid = None
+        self.exitcode = None
+        self.alive = False
+        self.stubborn = False
+        self.terminated = False
+        self.killed = False
+        self.joins = []
+
+    def start(self):
+        self.pid = next(self.pids)
+        self.alive = True
+
+    def is_alive(self):
+        return self.alive
+
+    def terminate(self):
+        self.terminated = True
+        if not self.stubborn:
+            self.die(-signal.SIGTERM)
+
+    def kill(self):
+        self.killed = True
+        self.die(-signal.SIGKILL)
+
+    def join(self, timeout=None):
+        self.joins.append(timeout)
+
+    def die(self, exitcode):
+        self.alive = False
+        self.exitcode = exitcode
+
+class FakeContext:
+    def __init__(self):
+        self.processes: list[FakeProcess] = []
+
+    def Process(self, **kwargs):
+        process = FakeProcess(**kwargs)
+        self.processes.append(process)
+        return process
+
+    def Value(self, typecode, value):
+        return FakeValue(typecode, value)
+
+@pytest.fixture
+def ctx(monkeypatch):
+    ctx = FakeContext()
+    monkeypatch.setattr(supervisor_module.multiprocessing, "get_context", lambda method: ctx)
+    return ctx
+
+@pytest.fixture
+def handlers(monkeypatch):
+    handlers = {}
+    monkeypatch.setattr(
+        supervisor_module.signal,
+        "signal",
+        lambda signum, handler: handlers.__setitem__(signum, handler)
+    )
+    return handlers
+
+def run_scripted(monkeypatch, supervisor, script):
+    """Runs the supervisor loop, calling ``script(tick)`` on every sleep."""
+    ticks = iter(range(1000))
+    monkeypatch.setattr(supervisor_module.time, "sleep", lambda seconds: script(next(ticks)))
+    supervisor.run()
+
+def make_supervisor(**kwargs):
+    return Supervisor(
+        target=lambda workers, processed: None,
+        processes=2,
+        workers={NotificationChannel.EMAIL: 1},
+        stats_interval=0,
+        **kwargs
+    )
+
+def test_restarts_dead_children_and_stops_on_signal(monkeypatch, ctx, handlers):
+    supervisor = make_supervisor(drain_timeout=5)
+
+    def script(tick):
+        if tick == 1:
+            ctx.processes[0].die(1)
+        if tick == 4:
+            handlers[signal.SIGTERM](signal.SIGTERM, None)
+
+    run_scripted(monkeypatch, supervisor, script)
+
+    assert set(handlers) == {signal.SIGTERM, signal.SIGINT}
+    assert [p.name for p in ctx.processes] == [
+        "notification-worker-0",
+        "notification-worker-1",
+        "notification-worker-0",
+    ]
+    # The replacement shares the dead child's counter.
+    assert ctx.processes[2].args[2] is ctx.processes[0].args[2]
+    assert all(p.terminated for p in ctx.processes[1:])
+    assert not any(p.killed for p in ctx.processes)
+
+def test_second_signal_is_ignored(ctx, handlers):
+    supervisor = make_supervisor()
+    supervisor._on_signal(signal.SIGINT, None)
+    supervisor._on_signal(signal.SIGTERM, None)
+
+    with capture_logs() as logs:
+        supervisor._on_signal(signal.SIGTERM, None)
+
+    assert logs == []
+
+def test_drain_kills_children_past_the_timeout(monkeypatch, ctx, handlers):
+    supervisor = make_supervisor(drain_timeout=0)
+
+    def script(tick):
+        if tick == 0:
+            ctx.processes[1].stubborn = True
+            handlers[signal.SIGINT](signal.SIGINT, None)
+
+    run_scripted(monkeypatch, supervisor, script)
+
+    assert not ctx.processes[0].killed
+    assert ctx.processes[1].killed
+    assert ctx.processes[1].joins == [0, None]
+
+def test_reports_processed_from_shared_counters(monkeypatch, ctx, handlers):
+    supervisor = make_supervisor(drain_timeout=0)
+
+    def script(tick):
+        for i, process in enumerate(ctx.processes):
+            process.args[2].value += i + 1
+        if tick == 1:
+            handlers[signal.SIGTERM](signal.SIGTERM, None)
+
+    with capture_logs() as logs:
+        run_scripted(monkeypatch, supervisor, script)
+
+    stats = [e for e in logs if e["event"] == "worker_supervisor_stats"]
+    stopped = [e for e in logs if e["event"] == "worker_supervisor_stopped"]
+
+    assert stats[0]["processed"] == 3
+    assert stopped[0]["processed"] == 6
+
+def test_child_resets_signal_handlers_and_runs_target(handlers):
+    calls = []
+    counter = FakeValue("Q", 0)
+
+    _child_main(lambda workers, processed: calls.append((workers, processed)), {}, counter)
+
+    assert handlers == {signal.SIGTERM: signal.SIG_DFL, signal.SIGINT: signal.SIG_DFL}
+    assert calls == [({}, counter)]
@@ -0,0 +1,28 @@
+import uuid
+import pytest
+
+from app.db.models.enums import NotificationChannel
+from app.db.models.notification import Notification
+from app.errors.notification_error import TemporaryError
+from app.senders.telegram_sender import TelegramSender
+
+def make_notification():
+    return Notification(
+        id=uuid.uuid4(),
+        user_id=uuid.uuid4(),
+        channel=NotificationChannel.TELEGRAM,
+        message="hello"
+    )
+
+async def test_send_requires_startup():
+    sender = TelegramSender()
+
+    with pytest.raises(TemporaryError):
+        await sender.send(make_notification())
+
+    await sender.startup()
+    await sender.send(make_notification())
+    await sender.shutdown()
+
+    with pytest.raises(TemporaryError):
+        await sender.send(make_notification())
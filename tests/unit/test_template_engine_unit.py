@@ -0,0 +1,82 @@
+import json
+import pytest
+
+from app.errors.template_error import MissingPayloadKeysError, TemplateError, TemplateNotFoundError
+from app.notification_templates.engine import TemplateEngine
+from app.db.models.enums import NotificationChannel
+from app.db.settings import settings
+from app.notification_templates.registry import load_templates, notification_templates
+
+TEMPLATES = {
+    "order_paid": {
+        "required": ["order_id"],
+        "locales": {
+            "ru": "Заказ №{order_id} успешно оплачен",
+            "en": "Order #{order_id} has been paid"
+        }
+    }
+}
+
+def test_render_uses_locale_and_falls_back_to_default():
+    engine = TemplateEngine(templates=TEMPLATES, default_locale="ru")
+
+    assert engine.render("order_paid", {"order_id": 7}, "en") == "Order #7 has been paid"
+    assert engine.render("order_paid", {"order_id": 7}, "de") == "Заказ №7 успешно оплачен"
+    assert engine.render("order_paid", {"order_id": 7}) == "Заказ №7 успешно оплачен"
+
+def test_render_rejects_missing_keys_and_unknown_templates():
+    engine = TemplateEngine(templates=TEMPLATES, default_locale="ru")
+
+    with pytest.raises(MissingPayloadKeysError):
+        engine.render("order_paid", {})
+
+    with pytest.raises(TemplateNotFoundError):
+        engine.render("order_shipped", {})
+
+def test_render_many_returns_errors_in_place():
+    engine = TemplateEngine(templates=TEMPLATES, default_locale="ru")
+
+    results = engine.render_many("order_paid", [{"order_id": 1}, None, {"order_id": 2}])
+
+    assert results[0] == "Заказ №1 успешно оплачен"
+    assert isinstance(results[1], MissingPayloadKeysError)
+    assert results[2] == "Заказ №2 успешно оплачен"
+
+@pytest.mark.parametrize("source", [
+    "Заказ №{order_id!r}",
+    "Заказ №{order_id:>10}",
+    "Заказ №{order.id}",
+    "Заказ №{user_id}",
+    "Заказ №{order_id",
+])
+def test_invalid_templates_fail_at_load(source):
+    with pytest.raises(TemplateError):
+        TemplateEngine(
+            templates={"order_paid": {"required": ["order_id"], "locales": {"ru": source}}},
+            default_locale="ru"
+        )
+
+def test_default_locale_is_required():
+    with pytest.raises(TemplateError):
+        TemplateEngine(
+            templates={"order_paid": {"required": ["order_id"], "locales": {"en": "{order_id}"}}},
+            default_locale="ru"
+        )
+
+def test_shipped_templates_cover_every_event_type():
+    assert notification_templates.render("order_cancelled", {"order_id": 3}).startswith("Заказ №3 завершен")
+
+def test_digest_template_is_required_when_digests_are_enabled(tmp_path, monkeypatch):
+    path = tmp_path / "templates.json"
+    path.write_text(json.dumps({
+        event_type: {"locales": {"ru": "event"}}
+        for event_type in ("user_registered", "order_paid", "order_cancelled")
+    }))
+    monkeypatch.setattr(settings, "TEMPLATES_PATH", str(path))
+
+    monkeypatch.setattr(settings, "DIGEST_WINDOW", {})
+    assert "notification_digest" not in load_templates()
+
+    monkeypatch.setattr(settings, "DIGEST_WINDOW", {NotificationChannel.EMAIL: 60})
+    with pytest.raises(TemplateError):
+        load_templates()